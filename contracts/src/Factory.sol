@@ -14,10 +14,18 @@ contract Factory {
     mapping(address => address) private s_ownersAndWallets;
 
     /**
-     * @notice Emitted when a wallet is deployed.
+     * @notice Emitted when a wallet is deployed. It carries the wallet's whole setup, so a fleet can be discovered from the factory's logs alone.
      * @param walletAddress The deployed wallet's address.
+     * @param walletIndex The number of wallets the factory deployed before this one.
+     * @param requiredApprovals The minimum number of approvals required for the wallet's transactions to be authorized.
+     * @param owners The owners of the wallet.
      */
-    event WalletDeployed(address walletAddress);
+    event WalletDeployed(
+        address indexed walletAddress,
+        uint256 indexed walletIndex,
+        uint256 indexed requiredApprovals,
+        address[] owners
+    );
 
     /**
      * @notice Initialises the number of wallets to 0.
@@ -36,13 +44,18 @@ contract Factory {
         address[] memory owners,
         uint256 requiredApprovals
     ) external returns (address) {
-        ++s_numberOfWallets;
+        uint256 walletIndex = s_numberOfWallets++;
         MultiSigWallet multiSigWallet = new MultiSigWallet(
             owners,
             requiredApprovals
         );
 
-        emit WalletDeployed(address(multiSigWallet));
+        emit WalletDeployed(
+            address(multiSigWallet),
+            walletIndex,
+            requiredApprovals,
+            owners
+        );
 
         uint256 numberOfOwners = owners.length;
         for (uint256 count = 0; count < numberOfOwners; ++count) {
@@ -3,6 +3,7 @@
 pragma solidity ^0.8.20;
 
 import {IERC20} from "@openzeppelin/contracts/interfaces/IERC20.sol";
+import {IERC20Permit} from "@openzeppelin/contracts/token/ERC20/extensions/IERC20Permit.sol";
 import {IERC721Receiver} from "@openzeppelin/contracts/token/ERC721/IERC721Receiver.sol";
 import {IERC721} from "@openzeppelin/contracts/interfaces/IERC721.sol";
 
@@ -52,20 +53,22 @@ contract MultiSigWallet is IERC721Receiver {
     uint256 private immutable i_requiredApprovals;
 
     EthTxn[] private s_ethTxns;
-    uint256 private s_ethTxnCount;
     // ETH txn array index --> owner --> approval given?
     mapping(uint256 => mapping(address => bool)) private s_ethTxnApprovals;
 
     TokenTxn[] private s_tokenTxns;
-    uint256 private s_tokenTxnCount;
     // token txn array index --> owner --> approval given?
     mapping(uint256 => mapping(address => bool)) private s_tokenTxnApprovals;
 
     NftTxn[] private s_nftTxns;
-    uint256 private s_nftTxnCount;
     // NFT txn array index --> owner --> approval given?
     mapping(uint256 => mapping(address => bool)) private s_nftTxnApprovals;
 
+    // asset index --> token or NFT contract address, for packed issue calls
+    address[] private s_assets;
+    // token or NFT contract address --> asset index + 1, 0 if not registered
+    mapping(address => uint256) private s_assetIndexes;
+
     /**
      * @notice Emitted each time the wallet receives ETH.
      * @param amount The amount of ETH received.
@@ -73,27 +76,46 @@ contract MultiSigWallet is IERC721Receiver {
     event ETHReceived(uint256 indexed amount);
 
     /**
-     * @notice Emitted each time a new transaction is issued by one of the owners.
+     * @notice Emitted each time an asset contract is given an index for packed issue calls.
+     * @param asset The token's or NFT's contract address.
+     * @param assetIndex The index packed transaction records refer to the asset by.
+     */
+    event AssetRegistered(address indexed asset, uint256 indexed assetIndex);
+
+    /**
+     * @notice Emitted each time a new transaction is issued by one of the owners. It carries the whole transaction request, so indexers can rebuild the queue from events alone.
      * @param txnType The type of transaction (ETH, token, or NFT).
      * @param txnIndex The array index at which the transaction request details are stored for the given transaction type.
      * @param by The address of the owner who issued the transaction.
+     * @param action The type of transaction request (transfer, transfer from, or approve). Always transfer for ETH transactions.
+     * @param to The recipient of the ETH, tokens, or NFT.
+     * @param amountOrTokenId The amount of ETH or tokens, or the NFT's tokenId.
+     * @param allowanceProvider The allowance provider, or the zero address if there is none.
+     * @param assetAddress The token's or NFT's contract address, or the zero address for ETH transactions.
      */
     event TxnIssued(
         TxnType indexed txnType,
         uint256 indexed txnIndex,
-        address indexed by
+        address indexed by,
+        TxnAction action,
+        address to,
+        uint256 amountOrTokenId,
+        address allowanceProvider,
+        address assetAddress
     );
 
     /**
      * @notice Emitted each time a transaction is approved by one of the owners.
      * @param txnType The type of transaction (ETH, token, or NFT).
      * @param txnIndex The array index at which the transaction request details are stored for the given transaction type.
-     * @param by The address of the owner who issued the transaction.
+     * @param by The address of the owner who approved the transaction.
+     * @param approvals The number of approvals the transaction has, including this one.
      */
     event TxnApproved(
         TxnType indexed txnType,
         uint256 indexed txnIndex,
-        address indexed by
+        address indexed by,
+        uint256 approvals
     );
 
     /**
@@ -122,6 +144,10 @@ contract MultiSigWallet is IERC721Receiver {
     error MultiSigWallet__NftNotApproved();
     error MultiSigWallet__NotOwnerOfNft(uint256 tokenId);
     error MultiSigWallet__TransactionFailed();
+    error MultiSigWallet__NotATransferFromTxn();
+    error MultiSigWallet__InvalidPackedTxn(uint256 offset);
+    error MultiSigWallet__UnknownAssetIndex(uint256 assetIndex);
+    error MultiSigWallet__TooManyAssets();
 
     modifier onlyOneOfTheOwners() {
         if (!s_owners[msg.sender]) revert MultiSigWallet__NotOneOfTheOwners();
@@ -130,13 +156,13 @@ contract MultiSigWallet is IERC721Receiver {
 
     modifier onlyValidTxnIndex(TxnType txnType, uint256 txnIndex) {
         if (txnType == TxnType.ETH) {
-            if (txnIndex > s_ethTxns.length)
+            if (txnIndex >= s_ethTxns.length)
                 revert MultiSigWallet__InvalidIndex();
         } else if (txnType == TxnType.Token) {
-            if (txnIndex > s_tokenTxns.length)
+            if (txnIndex >= s_tokenTxns.length)
                 revert MultiSigWallet__InvalidIndex();
         } else if (txnType == TxnType.NFT) {
-            if (txnIndex > s_nftTxns.length)
+            if (txnIndex >= s_nftTxns.length)
                 revert MultiSigWallet__InvalidIndex();
         }
         _;
@@ -157,9 +183,6 @@ contract MultiSigWallet is IERC721Receiver {
         }
 
         i_requiredApprovals = requiredApprovals;
-        s_ethTxnCount = 0;
-        s_tokenTxnCount = 0;
-        s_nftTxnCount = 0;
     }
 
     /**
@@ -190,16 +213,7 @@ contract MultiSigWallet is IERC721Receiver {
         address to,
         uint256 amount
     ) external onlyOneOfTheOwners {
-        ++s_ethTxnCount;
-
-        EthTxn memory newTxn = EthTxn({
-            to: to,
-            amount: amount,
-            txnDetails: TxnDetails({approvals: 0, executed: false})
-        });
-        s_ethTxns.push(newTxn);
-
-        emit TxnIssued(TxnType.ETH, s_ethTxnCount - 1, msg.sender);
+        issueEthTxnHelper(to, amount);
     }
 
     /**
@@ -326,6 +340,44 @@ contract MultiSigWallet is IERC721Receiver {
         );
     }
 
+    /**
+     * @notice Gives token and NFT contracts a short index, which packed issue calls refer to them by. Assets that already have an index are skipped.
+     * @param assets The token and NFT contract addresses to register.
+     */
+    function registerAssets(
+        address[] calldata assets
+    ) external onlyOneOfTheOwners {
+        uint256 numberOfAssets = assets.length;
+        for (uint256 count = 0; count < numberOfAssets; ++count) {
+            address asset = assets[count];
+            if (s_assetIndexes[asset] != 0) continue;
+
+            uint256 assetIndex = s_assets.length;
+            if (assetIndex > type(uint16).max)
+                revert MultiSigWallet__TooManyAssets();
+            s_assets.push(asset);
+            s_assetIndexes[asset] = assetIndex + 1;
+
+            emit AssetRegistered(asset, assetIndex);
+        }
+    }
+
+    /**
+     * @notice Issues any number of transactions from tightly packed records, which take a fraction of the calldata of the ABI encoded issue functions. Each record is laid out as
+     * kind (1 byte: txn type << 4 | action), recipient (20 bytes), amount or tokenId length (1 byte), amount or tokenId (big-endian, 0 to 32 bytes),
+     * followed, for token and NFT transactions, by the asset index (2 bytes), and, for transfer from transactions, by the allowance provider (20 bytes).
+     * @param records The concatenated transaction records.
+     */
+    function issuePackedTxns(
+        bytes calldata records
+    ) external onlyOneOfTheOwners {
+        uint256 offset = 0;
+        uint256 recordsLength = records.length;
+        while (offset < recordsLength) {
+            offset = issuePackedTxn(records, offset);
+        }
+    }
+
     /**
      * @notice Allows owners to approve transactions.
      * @param txnType The type of transaction to approve (ETH, toke, or NFT).
@@ -342,9 +394,9 @@ contract MultiSigWallet is IERC721Receiver {
                 revert MultiSigWallet__TxnAlreadyExecuted();
 
             s_ethTxnApprovals[txnIndex][msg.sender] = true;
-            ++s_ethTxns[txnIndex].txnDetails.approvals;
+            uint256 approvals = ++s_ethTxns[txnIndex].txnDetails.approvals;
 
-            emit TxnApproved(TxnType.ETH, txnIndex, msg.sender);
+            emit TxnApproved(TxnType.ETH, txnIndex, msg.sender, approvals);
         } else if (txnType == TxnType.Token) {
             if (s_tokenTxnApprovals[txnIndex][msg.sender])
                 revert MultiSigWallet__TxnAlreadyApproved();
@@ -352,9 +404,9 @@ contract MultiSigWallet is IERC721Receiver {
                 revert MultiSigWallet__TxnAlreadyExecuted();
 
             s_tokenTxnApprovals[txnIndex][msg.sender] = true;
-            ++s_tokenTxns[txnIndex].txnDetails.approvals;
+            uint256 approvals = ++s_tokenTxns[txnIndex].txnDetails.approvals;
 
-            emit TxnApproved(TxnType.Token, txnIndex, msg.sender);
+            emit TxnApproved(TxnType.Token, txnIndex, msg.sender, approvals);
         } else if (txnType == TxnType.NFT) {
             if (s_nftTxnApprovals[txnIndex][msg.sender])
                 revert MultiSigWallet__TxnAlreadyApproved();
@@ -362,9 +414,9 @@ contract MultiSigWallet is IERC721Receiver {
                 revert MultiSigWallet__TxnAlreadyExecuted();
 
             s_nftTxnApprovals[txnIndex][msg.sender] = true;
-            ++s_nftTxns[txnIndex].txnDetails.approvals;
+            uint256 approvals = ++s_nftTxns[txnIndex].txnDetails.approvals;
 
-            emit TxnApproved(TxnType.NFT, txnIndex, msg.sender);
+            emit TxnApproved(TxnType.NFT, txnIndex, msg.sender, approvals);
         }
     }
 
@@ -386,6 +438,57 @@ contract MultiSigWallet is IERC721Receiver {
         }
     }
 
+    /**
+     * @notice Executes a token transfer from transaction with the allowance provider's EIP-2612 permit, so the provider does not need to send an approve transaction first.
+     * @dev The permit is allowed to fail, since anyone who saw it in the mempool can submit it first. transferFrom() reverts if the allowance is still too low.
+     * @param txnIndex The array index where the token transaction request details are stored.
+     * @param deadline The timestamp after which the permit can no longer be used.
+     * @param v The recovery id of the allowance provider's permit signature.
+     * @param r The r value of the permit signature.
+     * @param s The s value of the permit signature.
+     */
+    function executeTokenTransferFromWithPermit(
+        uint256 txnIndex,
+        uint256 deadline,
+        uint8 v,
+        bytes32 r,
+        bytes32 s
+    ) external onlyOneOfTheOwners onlyValidTxnIndex(TxnType.Token, txnIndex) {
+        TokenTxn storage tokenTxn = s_tokenTxns[txnIndex];
+
+        if (tokenTxn.action != TxnAction.TransferFrom)
+            revert MultiSigWallet__NotATransferFromTxn();
+        if (tokenTxn.txnDetails.approvals < i_requiredApprovals)
+            revert MultiSigWallet__NotEnoughApprovalsGiven(
+                tokenTxn.txnDetails.approvals
+            );
+        else if (tokenTxn.txnDetails.executed)
+            revert MultiSigWallet__TxnAlreadyExecuted();
+
+        tokenTxn.txnDetails.executed = true;
+
+        emit TxnExecuted(TxnType.Token, txnIndex, msg.sender);
+
+        try
+            IERC20Permit(tokenTxn.tokenContractAddress).permit(
+                tokenTxn.allowanceProvider,
+                address(this),
+                tokenTxn.amount,
+                deadline,
+                v,
+                r,
+                s
+            )
+        {} catch {}
+
+        bool success = IERC20(tokenTxn.tokenContractAddress).transferFrom(
+            tokenTxn.allowanceProvider,
+            tokenTxn.to,
+            tokenTxn.amount
+        );
+        if (!success) revert MultiSigWallet__TransactionFailed();
+    }
+
     /**
      * @notice Returns a boolean value indicating whether the account is an owner of this wallet or not.
      * @param account The account whose ownership you want to check.
@@ -402,106 +505,185 @@ contract MultiSigWallet is IERC721Receiver {
     }
 
     /**
-     * @notice Returns the amount of ETH held by this wallet.
+     * @notice Returns the number of ETH, token, and NFT transactions issued. Richer views are served by the WalletLens contract.
      */
-    function getWalletEthBalance() external view returns (uint256) {
-        return address(this).balance;
+    function getTxnCounts()
+        external
+        view
+        returns (
+            uint256 ethTxnCount,
+            uint256 tokenTxnCount,
+            uint256 nftTxnCount
+        )
+    {
+        return (s_ethTxns.length, s_tokenTxns.length, s_nftTxns.length);
     }
 
     /**
-     * @notice Returns the number of NFT tokens held by this wallet.
+     * @notice Returns the registered asset contracts, in asset index order.
      */
-    function getWalletNftBalance(
-        address nftContractAddress
-    ) external view returns (uint256) {
-        return IERC721(nftContractAddress).balanceOf(address(this));
+    function getAssets() external view returns (address[] memory) {
+        return s_assets;
     }
 
     /**
-     * @notice Checks if the NFT tokenId is held by this wallet.
+     * @notice Returns the raw fields of a transaction of any type. ETH transactions report the transfer action, and no allowance provider or asset. Richer views are served by the WalletLens contract.
+     * @param txnType The type of transaction (ETH, token, or NFT).
+     * @param txnIndex The array index at which the transaction request details are stored.
      */
-    function isOwnerOfNft(
-        uint256 tokenId,
-        address nftContractAddress
-    ) external view returns (bool) {
-        if (IERC721(nftContractAddress).ownerOf(tokenId) != address(this))
-            return false;
-        return true;
+    function getTxn(
+        TxnType txnType,
+        uint256 txnIndex
+    )
+        external
+        view
+        onlyValidTxnIndex(txnType, txnIndex)
+        returns (
+            TxnAction action,
+            address to,
+            uint256 amountOrTokenId,
+            address allowanceProvider,
+            address assetAddress,
+            TxnDetails memory txnDetails
+        )
+    {
+        if (txnType == TxnType.ETH) {
+            EthTxn storage ethTxn = s_ethTxns[txnIndex];
+            return (
+                TxnAction.Transfer,
+                ethTxn.to,
+                ethTxn.amount,
+                address(0),
+                address(0),
+                ethTxn.txnDetails
+            );
+        } else if (txnType == TxnType.Token) {
+            TokenTxn storage tokenTxn = s_tokenTxns[txnIndex];
+            return (
+                tokenTxn.action,
+                tokenTxn.to,
+                tokenTxn.amount,
+                tokenTxn.allowanceProvider,
+                tokenTxn.tokenContractAddress,
+                tokenTxn.txnDetails
+            );
+        } else {
+            NftTxn storage nftTxn = s_nftTxns[txnIndex];
+            return (
+                nftTxn.action,
+                nftTxn.to,
+                nftTxn.tokenId,
+                nftTxn.allowanceProvider,
+                nftTxn.nftContractAddress,
+                nftTxn.txnDetails
+            );
+        }
     }
 
     /**
-     * @notice Returns the amount of tokens held by this wallet.
+     * @notice Decodes and issues the packed transaction record at the given offset.
+     * @param records The concatenated transaction records.
+     * @param offset The offset of the record.
+     * @return The offset of the next record.
      */
-    function getWalletTokenBalance(
-        address tokenContractAddress
-    ) external view returns (uint256) {
-        return IERC20(tokenContractAddress).balanceOf(address(this));
-    }
+    function issuePackedTxn(
+        bytes calldata records,
+        uint256 offset
+    ) internal returns (uint256) {
+        TxnType txnType;
+        TxnAction action;
+        {
+            uint256 kind = readPacked(records, offset, 1);
+            if (
+                (kind >> 4) > uint256(TxnType.NFT) ||
+                (kind & 0x0f) > uint256(TxnAction.Approve)
+            ) revert MultiSigWallet__InvalidPackedTxn(offset);
+            txnType = TxnType(kind >> 4);
+            action = TxnAction(kind & 0x0f);
+        }
+        address to = address(uint160(readPacked(records, offset + 1, 20)));
+        uint256 amount;
+        uint256 next;
+        {
+            uint256 amountLength = readPacked(records, offset + 21, 1);
+            if (amountLength > 32)
+                revert MultiSigWallet__InvalidPackedTxn(offset);
+            amount = readPacked(records, offset + 22, amountLength);
+            next = offset + 22 + amountLength;
+        }
 
-    /**
-     * @notice Returns the total number of ETH transactions issued.
-     */
-    function getEthTxnCount() external view returns (uint256) {
-        return s_ethTxnCount;
-    }
+        if (txnType == TxnType.ETH) {
+            if (action != TxnAction.Transfer)
+                revert MultiSigWallet__InvalidPackedTxn(offset);
+            issueEthTxnHelper(to, amount);
+            return next;
+        }
 
-    /**
-     * @notice Returns the total number of token transactions issued.
-     */
-    function getTokenTxnCount() external view returns (uint256) {
-        return s_tokenTxnCount;
-    }
+        address asset;
+        {
+            uint256 assetIndex = readPacked(records, next, 2);
+            if (assetIndex >= s_assets.length)
+                revert MultiSigWallet__UnknownAssetIndex(assetIndex);
+            asset = s_assets[assetIndex];
+            next += 2;
+        }
 
-    /**
-     * @notice Returns the total number of NFT transactions issued.
-     */
-    function getNftTxnCount() external view returns (uint256) {
-        return s_nftTxnCount;
-    }
+        address allowanceProvider = address(0);
+        if (action == TxnAction.TransferFrom) {
+            allowanceProvider = address(uint160(readPacked(records, next, 20)));
+            next += 20;
+        }
 
-    /**
-     * @notice Returns a struct consisting of the ETH transaction request details.
-     * @param txnIndex The array index at which the transaction request details are stored.
-     */
-    function getEthTxnDetails(
-        uint256 txnIndex
-    )
-        external
-        view
-        onlyValidTxnIndex(TxnType.ETH, txnIndex)
-        returns (EthTxn memory)
-    {
-        return s_ethTxns[txnIndex];
+        if (txnType == TxnType.Token) {
+            issueTokenTxnHelper(action, to, amount, allowanceProvider, asset);
+        } else {
+            issueNftTxnHelper(action, to, amount, allowanceProvider, asset);
+        }
+        return next;
     }
 
     /**
-     * @notice Returns a struct consisting of the token transaction request details.
-     * @param txnIndex The array index at which the transaction request details are stored.
+     * @notice Reads a big-endian unsigned integer out of packed records.
+     * @param records The concatenated transaction records.
+     * @param offset The offset of the integer's first byte.
+     * @param length The integer's length in bytes, at most 32.
      */
-    function getTokenTxnDetails(
-        uint256 txnIndex
-    )
-        external
-        view
-        onlyValidTxnIndex(TxnType.Token, txnIndex)
-        returns (TokenTxn memory)
-    {
-        return s_tokenTxns[txnIndex];
+    function readPacked(
+        bytes calldata records,
+        uint256 offset,
+        uint256 length
+    ) internal pure returns (uint256) {
+        if (offset + length > records.length)
+            revert MultiSigWallet__InvalidPackedTxn(offset);
+        // slices shorter than 32 bytes are padded on the right
+        return
+            uint256(bytes32(records[offset:offset + length])) >>
+            (256 - 8 * length);
     }
 
     /**
-     * @notice Returns a struct consisting of the NFT transaction request details.
-     * @param txnIndex The array index at which the transaction request details are stored.
+     * @notice All ETH transaction issual requests are directed here.
+     * @param to The recipient of ETH.
+     * @param amount The amount of ETH to send.
      */
-    function getNftTxnDetails(
-        uint256 txnIndex
-    )
-        external
-        view
-        onlyValidTxnIndex(TxnType.NFT, txnIndex)
-        returns (NftTxn memory)
-    {
-        return s_nftTxns[txnIndex];
+    function issueEthTxnHelper(address to, uint256 amount) internal {
+        EthTxn memory newTxn = EthTxn({
+            to: to,
+            amount: amount,
+            txnDetails: TxnDetails({approvals: 0, executed: false})
+        });
+        s_ethTxns.push(newTxn);
+
+        emit TxnIssued(
+            TxnType.ETH,
+            s_ethTxns.length - 1,
+            msg.sender,
+            TxnAction.Transfer,
+            to,
+            amount,
+            address(0),
+            address(0)
+        );
     }
 
     /**
@@ -519,8 +701,6 @@ contract MultiSigWallet is IERC721Receiver {
         address allowanceProvider,
         address tokenContractAddress
     ) internal {
-        ++s_tokenTxnCount;
-
         TokenTxn memory newTxn = TokenTxn({
             action: action,
             to: to,
@@ -531,7 +711,16 @@ contract MultiSigWallet is IERC721Receiver {
         });
         s_tokenTxns.push(newTxn);
 
-        emit TxnIssued(TxnType.Token, s_tokenTxnCount - 1, msg.sender);
+        emit TxnIssued(
+            TxnType.Token,
+            s_tokenTxns.length - 1,
+            msg.sender,
+            action,
+            to,
+            amount,
+            allowanceProvider,
+            tokenContractAddress
+        );
     }
 
     /**
@@ -549,8 +738,6 @@ contract MultiSigWallet is IERC721Receiver {
         address allowanceProvider,
         address nftContractAddress
     ) internal {
-        ++s_nftTxnCount;
-
         NftTxn memory newTxn = NftTxn({
             action: action,
             to: to,
@@ -561,7 +748,16 @@ contract MultiSigWallet is IERC721Receiver {
         });
         s_nftTxns.push(newTxn);
 
-        emit TxnIssued(TxnType.NFT, s_nftTxnCount - 1, msg.sender);
+        emit TxnIssued(
+            TxnType.NFT,
+            s_nftTxns.length - 1,
+            msg.sender,
+            action,
+            to,
+            tokenId,
+            allowanceProvider,
+            nftContractAddress
+        );
     }
 
     /**
@@ -0,0 +1,233 @@
+// SPDX-License-Identifier: MIT
+
+pragma solidity ^0.8.20;
+
+import {IERC20} from "@openzeppelin/contracts/interfaces/IERC20.sol";
+import {IERC721} from "@openzeppelin/contracts/interfaces/IERC721.sol";
+import {MultiSigWallet} from "./MultiSigWallet.sol";
+
+/**
+ * @title WalletLens
+ * @author Sahil Gujrati
+ * @notice A single shared contract serving the rich and cross-wallet views of multi-sig wallets. Wallets only expose minimal raw getters, which keeps their bytecode, and thus the deployment cost of each wallet, small.
+ */
+contract WalletLens {
+    // re-declared so that invalid index reverts bubbling up from wallets decode against this contract's ABI
+    error MultiSigWallet__InvalidIndex();
+
+    /**
+     * @notice Returns the amount of ETH held by the wallet.
+     * @param wallet The wallet's address.
+     */
+    function getWalletEthBalance(
+        address wallet
+    ) external view returns (uint256) {
+        return wallet.balance;
+    }
+
+    /**
+     * @notice Returns the amount of tokens held by the wallet.
+     * @param wallet The wallet's address.
+     * @param tokenContractAddress The token's contract address.
+     */
+    function getWalletTokenBalance(
+        address wallet,
+        address tokenContractAddress
+    ) external view returns (uint256) {
+        return IERC20(tokenContractAddress).balanceOf(wallet);
+    }
+
+    /**
+     * @notice Returns the number of NFT tokens held by the wallet.
+     * @param wallet The wallet's address.
+     * @param nftContractAddress The NFT's contract address.
+     */
+    function getWalletNftBalance(
+        address wallet,
+        address nftContractAddress
+    ) external view returns (uint256) {
+        return IERC721(nftContractAddress).balanceOf(wallet);
+    }
+
+    /**
+     * @notice Checks if the NFT tokenId is held by the wallet.
+     * @param wallet The wallet's address.
+     * @param tokenId The NFT's tokenId.
+     * @param nftContractAddress The NFT's contract address.
+     */
+    function isOwnerOfNft(
+        address wallet,
+        uint256 tokenId,
+        address nftContractAddress
+    ) external view returns (bool) {
+        return IERC721(nftContractAddress).ownerOf(tokenId) == wallet;
+    }
+
+    /**
+     * @notice Returns the ETH balance of each wallet, and the balance each wallet holds of each asset, in one call. Token and NFT contracts can be mixed, since both answer balanceOf().
+     * @param wallets The wallets' addresses.
+     * @param assets The token and NFT contract addresses.
+     * @return ethBalances The ETH balance of each wallet.
+     * @return assetBalances The balance of assets[j] held by wallets[i], at [i][j].
+     */
+    function getBalances(
+        address[] calldata wallets,
+        address[] calldata assets
+    )
+        external
+        view
+        returns (uint256[] memory ethBalances, uint256[][] memory assetBalances)
+    {
+        uint256 numberOfWallets = wallets.length;
+        uint256 numberOfAssets = assets.length;
+        ethBalances = new uint256[](numberOfWallets);
+        assetBalances = new uint256[][](numberOfWallets);
+
+        for (uint256 i = 0; i < numberOfWallets; ++i) {
+            ethBalances[i] = wallets[i].balance;
+            assetBalances[i] = new uint256[](numberOfAssets);
+            for (uint256 j = 0; j < numberOfAssets; ++j) {
+                assetBalances[i][j] = IERC20(assets[j]).balanceOf(wallets[i]);
+            }
+        }
+    }
+
+    /**
+     * @notice Returns the total number of ETH transactions issued by the wallet.
+     * @param wallet The wallet's address.
+     */
+    function getEthTxnCount(address wallet) external view returns (uint256) {
+        (uint256 ethTxnCount, , ) = walletAt(wallet).getTxnCounts();
+        return ethTxnCount;
+    }
+
+    /**
+     * @notice Returns the total number of token transactions issued by the wallet.
+     * @param wallet The wallet's address.
+     */
+    function getTokenTxnCount(address wallet) external view returns (uint256) {
+        (, uint256 tokenTxnCount, ) = walletAt(wallet).getTxnCounts();
+        return tokenTxnCount;
+    }
+
+    /**
+     * @notice Returns the total number of NFT transactions issued by the wallet.
+     * @param wallet The wallet's address.
+     */
+    function getNftTxnCount(address wallet) external view returns (uint256) {
+        (, , uint256 nftTxnCount) = walletAt(wallet).getTxnCounts();
+        return nftTxnCount;
+    }
+
+    /**
+     * @notice Returns the ETH, token, and NFT transaction counts of each wallet in one call.
+     * @param wallets The wallets' addresses.
+     * @return txnCounts The counts of wallets[i], at [i][uint256(txnType)].
+     */
+    function getTxnCounts(
+        address[] calldata wallets
+    ) external view returns (uint256[3][] memory txnCounts) {
+        uint256 numberOfWallets = wallets.length;
+        txnCounts = new uint256[3][](numberOfWallets);
+
+        for (uint256 i = 0; i < numberOfWallets; ++i) {
+            (
+                txnCounts[i][0],
+                txnCounts[i][1],
+                txnCounts[i][2]
+            ) = walletAt(wallets[i]).getTxnCounts();
+        }
+    }
+
+    /**
+     * @notice Returns a struct consisting of the ETH transaction request details.
+     * @param wallet The wallet's address.
+     * @param txnIndex The array index at which the transaction request details are stored.
+     */
+    function getEthTxnDetails(
+        address wallet,
+        uint256 txnIndex
+    ) external view returns (MultiSigWallet.EthTxn memory) {
+        (
+            ,
+            address to,
+            uint256 amount,
+            ,
+            ,
+            MultiSigWallet.TxnDetails memory txnDetails
+        ) = walletAt(wallet).getTxn(MultiSigWallet.TxnType.ETH, txnIndex);
+
+        return
+            MultiSigWallet.EthTxn({
+                to: to,
+                amount: amount,
+                txnDetails: txnDetails
+            });
+    }
+
+    /**
+     * @notice Returns a struct consisting of the token transaction request details.
+     * @param wallet The wallet's address.
+     * @param txnIndex The array index at which the transaction request details are stored.
+     */
+    function getTokenTxnDetails(
+        address wallet,
+        uint256 txnIndex
+    ) external view returns (MultiSigWallet.TokenTxn memory) {
+        (
+            MultiSigWallet.TxnAction action,
+            address to,
+            uint256 amount,
+            address allowanceProvider,
+            address tokenContractAddress,
+            MultiSigWallet.TxnDetails memory txnDetails
+        ) = walletAt(wallet).getTxn(MultiSigWallet.TxnType.Token, txnIndex);
+
+        return
+            MultiSigWallet.TokenTxn({
+                action: action,
+                to: to,
+                amount: amount,
+                allowanceProvider: allowanceProvider,
+                tokenContractAddress: tokenContractAddress,
+                txnDetails: txnDetails
+            });
+    }
+
+    /**
+     * @notice Returns a struct consisting of the NFT transaction request details.
+     * @param wallet The wallet's address.
+     * @param txnIndex The array index at which the transaction request details are stored.
+     */
+    function getNftTxnDetails(
+        address wallet,
+        uint256 txnIndex
+    ) external view returns (MultiSigWallet.NftTxn memory) {
+        (
+            MultiSigWallet.TxnAction action,
+            address to,
+            uint256 tokenId,
+            address allowanceProvider,
+            address nftContractAddress,
+            MultiSigWallet.TxnDetails memory txnDetails
+        ) = walletAt(wallet).getTxn(MultiSigWallet.TxnType.NFT, txnIndex);
+
+        return
+            MultiSigWallet.NftTxn({
+                action: action,
+                to: to,
+                tokenId: tokenId,
+                allowanceProvider: allowanceProvider,
+                nftContractAddress: nftContractAddress,
+                txnDetails: txnDetails
+            });
+    }
+
+    /**
+     * @notice Casts an address to the wallet contract type.
+     * @param wallet The wallet's address.
+     */
+    function walletAt(address wallet) internal pure returns (MultiSigWallet) {
+        return MultiSigWallet(payable(wallet));
+    }
+}
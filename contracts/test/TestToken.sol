@@ -3,9 +3,12 @@
 pragma solidity ^0.8.20;
 
 import {ERC20} from "@openzeppelin/contracts/token/ERC20/ERC20.sol";
+import {ERC20Permit} from "@openzeppelin/contracts/token/ERC20/extensions/ERC20Permit.sol";
 
-contract TestToken is ERC20 {
-    constructor(uint256 initialSupply) ERC20("TestToken", "TT") {
+contract TestToken is ERC20, ERC20Permit {
+    constructor(
+        uint256 initialSupply
+    ) ERC20("TestToken", "TT") ERC20Permit("TestToken") {
         _mint(msg.sender, initialSupply);
     }
 }
@@ -0,0 +1,5 @@
+"""
+Python tooling for the multi-sig wallet contracts. Nothing in
+here imports ape, so the modules can be used from tests,
+scripts, and standalone services alike.
+"""
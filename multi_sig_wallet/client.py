@@ -0,0 +1,226 @@
+"""
+A lightweight client for deployed wallets, factories, and lenses.
+
+Reads only need the JSON-RPC transport and `eth_abi`. Signing pulls
+in `eth_account` the first time a transaction is sent, so read-only
+tools such as cron jobs and CLI checks start in a fraction of a
+second, without ape or web3.
+"""
+
+import time
+
+from multi_sig_wallet.contracts import ContractAbi
+from multi_sig_wallet.rpc import HttpRpc, RpcError
+
+
+class ContractRevert(Exception):
+    """
+    Raised when a call or gas estimate reverts. `error` holds the
+    custom error name or the revert string, if it could be decoded
+    """
+
+    def __init__(self, error, error_args=(), data=None):
+        super().__init__(error, *error_args)
+        self.error = error
+        self.error_args = tuple(error_args)
+        self.data = data
+
+
+class ContractClient:
+    """
+    Calls and transacts with one deployed contract.
+
+    :param rpc: A transport with a `request(method, params)` method, such as `HttpRpc`.
+    :param address: The contract's address.
+    :param contract_name: The name of the contract's ABI artifact.
+    :param gas_model: A `multi_sig_wallet.gas_limits.GasLimitModel` to take gas limits from instead of estimating them, and to teach with the receipts waited for.
+    """
+
+    def __init__(self, rpc, address, contract_name, gas_model=None):
+        self.rpc = rpc
+        self.address = address
+        self.abi = ContractAbi.named(contract_name)
+        self.gas_model = gas_model
+        self._chain_id = None
+        # txn hash --> (call shape, gas limit), for the gas model
+        self._sent = {}
+
+    def call(self, function_name, *args, block="latest"):
+        """Calls a function with eth_call and returns its decoded result."""
+
+        txn = {"to": self.address, "data": self._calldata(function_name, *args)}
+        result = self._request("eth_call", [txn, block])
+        return self.abi.decode_output(function_name, bytes.fromhex(result[2:]))
+
+    def build_txn(self, function_name, *args, sender, value=0):
+        """Returns the unsigned transaction fields for a function call."""
+
+        return {
+            "from": sender,
+            "to": self.address,
+            "data": self._calldata(function_name, *args),
+            "value": hex(value),
+        }
+
+    def estimate_gas(self, txn):
+        """Estimates the gas of a transaction built with `build_txn()`."""
+
+        return int(self._request("eth_estimateGas", [txn]), 16)
+
+    def transact(
+        self,
+        function_name,
+        *args,
+        private_key,
+        value=0,
+        gas=None,
+        fees=None,
+        nonce=None,
+        shape=None,
+    ):
+        """
+        Signs and sends a function call and returns its transaction
+        hash. Gas, fees, and nonce are fetched from the node unless
+        given. With a gas model, the gas limit of a known call shape
+        is taken from the model instead.
+
+        :param private_key: The sender's private key.
+        :param fees: An object with an `as_txn_params()` method, such as `multi_sig_wallet.fees.Fees`.
+        :param shape: The call's `CallShape`, for the gas model. Inferred from the function and its arguments by default, with unknown warmth. Executions are only learned with a shape that carries their action.
+        """
+
+        # signing is the slowest import, so it is only paid for when sending
+        from eth_account import Account  # pylint: disable=import-outside-toplevel
+
+        sender = Account.from_key(private_key).address
+        txn = self.build_txn(function_name, *args, sender=sender, value=value)
+        # calls whose gas limit is left to the model are tracked until their receipt
+        track = gas is None and self.gas_model is not None
+        if track:
+            if shape is None:
+                # pylint: disable=import-outside-toplevel
+                from multi_sig_wallet.gas_limits import call_shape
+
+                shape = call_shape(function_name, args)
+            gas = self.gas_model.limit(shape)
+        if gas is None:
+            gas = self.estimate_gas(txn)
+        if nonce is None:
+            nonce = int(
+                self.rpc.request("eth_getTransactionCount", [sender, "pending"]), 16
+            )
+        fee_params = fees.as_txn_params() if fees is not None else self._default_fees()
+
+        signed = Account.sign_transaction(
+            {
+                "type": 2,
+                "chainId": self.chain_id,
+                "nonce": nonce,
+                "to": self.address,
+                "data": txn["data"],
+                "value": value,
+                "gas": gas,
+                **fee_params,
+            },
+            private_key,
+        )
+        raw_txn = "0x" + bytes(signed.rawTransaction).hex()
+        txn_hash = self.rpc.request("eth_sendRawTransaction", [raw_txn])
+        if track:
+            self._sent[txn_hash] = (shape, gas)
+        return txn_hash
+
+    def wait_for_receipt(self, txn_hash, timeout=120, poll_interval=0.5):
+        """
+        Polls for a transaction's receipt until it is included. The
+        receipts of calls sent with a gas model are fed back to it, so
+        a call that ran out of gas with a learned limit is estimated
+        live the next time.
+        """
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            receipt = self.rpc.request("eth_getTransactionReceipt", [txn_hash])
+            if receipt is not None:
+                if txn_hash in self._sent:
+                    shape, gas = self._sent.pop(txn_hash)
+                    self.gas_model.record_receipt(shape, receipt, gas)
+                return receipt
+            time.sleep(poll_interval)
+        raise TimeoutError(f"Transaction {txn_hash} was not included in {timeout}s")
+
+    @property
+    def chain_id(self):
+        """The chain id of the node, fetched once."""
+
+        if self._chain_id is None:
+            self._chain_id = int(self.rpc.request("eth_chainId"), 16)
+        return self._chain_id
+
+    def _calldata(self, function_name, *args):
+        return "0x" + self.abi.encode_call(function_name, *args).hex()
+
+    def _default_fees(self):
+        priority_fee = int(self.rpc.request("eth_maxPriorityFeePerGas"), 16)
+        block = self.rpc.request("eth_getBlockByNumber", ["latest", False])
+        base_fee = int(block["baseFeePerGas"], 16)
+        return {
+            "maxFeePerGas": 2 * base_fee + priority_fee,
+            "maxPriorityFeePerGas": priority_fee,
+        }
+
+    def _request(self, method, params):
+        try:
+            return self.rpc.request(method, params)
+        except RpcError as error:
+            raise self._revert_from(error) from error
+
+    def _revert_from(self, error):
+        data = error.data
+        # some nodes nest the revert data one level deeper
+        if isinstance(data, dict):
+            data = data.get("data")
+        if not isinstance(data, str) or not data.startswith("0x") or len(data) < 10:
+            return error
+
+        decoded = self.abi.decode_error(bytes.fromhex(data[2:]))
+        if decoded is None:
+            return ContractRevert(None, data=data)
+        return ContractRevert(decoded[0], decoded[1], data=data)
+
+
+def connect(url, timeout=10):
+    """Returns an HTTP transport for the node at the given URL."""
+
+    return HttpRpc(url, timeout=timeout)
+
+
+def wallet_at(rpc, address, gas_model=None):
+    """
+    Returns a client for the MultiSigWallet deployed at `address`.
+
+    :param gas_model: A `multi_sig_wallet.gas_limits.GasLimitModel`, to skip gas estimates of known call shapes.
+    """
+
+    return ContractClient(rpc, address, "MultiSigWallet", gas_model)
+
+
+def factory_at(rpc, address):
+    """Returns a client for the Factory deployed at `address`."""
+
+    return ContractClient(rpc, address, "Factory")
+
+
+def lens_at(rpc, address):
+    """Returns a client for the WalletLens deployed at `address`."""
+
+    return ContractClient(rpc, address, "WalletLens")
+
+
+def token_at(rpc, address):
+    """
+    Returns a client for an ERC-20 token at `address`. The TestToken
+    ABI covers ERC-20 and EIP-2612 permits
+    """
+
+    return ContractClient(rpc, address, "TestToken")
@@ -0,0 +1,176 @@
+"""
+Precompiled ABIs of the wallet contracts, and the encoding and
+decoding of calls, return values, and custom errors against them.
+
+The ABIs ship as JSON artifacts inside the package. Regenerate them
+with `ape run export_abis` whenever a contract's interface changes.
+"""
+
+import functools
+import json
+from pathlib import Path
+
+from eth_abi import decode, encode
+from eth_hash.auto import keccak
+
+ARTIFACTS_DIR = Path(__file__).parent / "artifacts"
+# TestToken stands in for any ERC-20 token with EIP-2612 permits
+CONTRACT_NAMES = ("MultiSigWallet", "Factory", "WalletLens", "TestToken")
+# the events that describe a wallet's transaction queue
+WALLET_EVENTS = ("TxnIssued", "TxnApproved", "TxnExecuted")
+# the selector of the built-in Error(string) revert
+ERROR_STRING_SELECTOR = bytes.fromhex("08c379a0")
+
+
+def canonical_type(param):
+    """Returns the canonical ABI type of a parameter, expanding tuples."""
+
+    abi_type = param["type"]
+    if abi_type.startswith("tuple"):
+        components = ",".join(canonical_type(c) for c in param["components"])
+        return f"({components}){abi_type[len('tuple'):]}"
+    return abi_type
+
+
+def signature(entry):
+    """Returns the canonical signature of a function, event, or error."""
+
+    types = ",".join(canonical_type(param) for param in entry["inputs"])
+    return f"{entry['name']}({types})"
+
+
+@functools.lru_cache(maxsize=None)
+def load_abi(contract_name):
+    """Loads the ABI of one of the wallet contracts from its artifact."""
+
+    with open(ARTIFACTS_DIR / f"{contract_name}.json", encoding="utf-8") as artifact:
+        return json.load(artifact)
+
+
+class ContractAbi:
+    """
+    Indexes an ABI by function, event, and error, and encodes and
+    decodes data against it. None of the wallet contracts overload
+    function names, so functions are looked up by name alone.
+    """
+
+    def __init__(self, abi):
+        self.abi = abi
+        self.functions = {
+            entry["name"]: entry for entry in abi if entry["type"] == "function"
+        }
+        self.events = {
+            entry["name"]: entry for entry in abi if entry["type"] == "event"
+        }
+        self._events_by_topic = {
+            keccak(signature(entry).encode()): entry
+            for entry in abi
+            if entry["type"] == "event"
+        }
+        self.errors = {
+            keccak(signature(entry).encode())[:4]: entry
+            for entry in abi
+            if entry["type"] == "error"
+        }
+
+    @classmethod
+    def named(cls, contract_name):
+        """Returns the ABI of one of the wallet contracts."""
+
+        return _contract_abi(contract_name)
+
+    def selector(self, function_name):
+        """Returns the 4-byte selector of a function."""
+
+        return keccak(signature(self.functions[function_name]).encode())[:4]
+
+    def encode_call(self, function_name, *args):
+        """Returns the calldata for a function call."""
+
+        entry = self.functions[function_name]
+        types = [canonical_type(param) for param in entry["inputs"]]
+        return self.selector(function_name) + encode(types, list(args))
+
+    def decode_output(self, function_name, data):
+        """
+        Decodes a function's return data. Single values are
+        unwrapped, multiple values come back as a tuple
+        """
+
+        entry = self.functions[function_name]
+        values = decode([canonical_type(param) for param in entry["outputs"]], data)
+        return values[0] if len(values) == 1 else values
+
+    def event_topic(self, event_name):
+        """Returns the topic0 hash of an event."""
+
+        return keccak(signature(self.events[event_name]).encode())
+
+    def encode_log(self, event_name, args):
+        """
+        Encodes an event into the topics and data of a log, the
+        inverse of `decode_log()`. Handy for fakes of a node
+
+        :param args: A dict of the event's arguments by name.
+        :return: The hex encoded topics, and the hex encoded data.
+        """
+
+        inputs = self.events[event_name]["inputs"]
+        topics = [self.event_topic(event_name)] + [
+            encode([canonical_type(param)], [args[param["name"]]])
+            for param in inputs
+            if param["indexed"]
+        ]
+        not_indexed = [param for param in inputs if not param["indexed"]]
+        data = encode(
+            [canonical_type(param) for param in not_indexed],
+            [args[param["name"]] for param in not_indexed],
+        )
+        return ["0x" + topic.hex() for topic in topics], "0x" + data.hex()
+
+    def decode_log(self, log):
+        """
+        Decodes a JSON-RPC log into the event name and a dict of its
+        arguments, or returns None if the log is not one of this
+        contract's events
+        """
+
+        topics = [bytes.fromhex(topic[2:]) for topic in log["topics"]]
+        entry = self._events_by_topic.get(topics[0]) if topics else None
+        if entry is None:
+            return None
+
+        indexed = [param for param in entry["inputs"] if param["indexed"]]
+        not_indexed = [param for param in entry["inputs"] if not param["indexed"]]
+        args = {
+            param["name"]: decode([canonical_type(param)], topic)[0]
+            for param, topic in zip(indexed, topics[1:])
+        }
+        values = decode(
+            [canonical_type(param) for param in not_indexed],
+            bytes.fromhex(log["data"][2:]),
+        )
+        args.update(zip((param["name"] for param in not_indexed), values))
+        return entry["name"], args
+
+    def decode_error(self, data):
+        """
+        Decodes revert data into the error name and its arguments, or
+        returns None if the data matches neither a custom error of
+        this contract nor a revert string
+        """
+
+        selector, payload = bytes(data[:4]), bytes(data[4:])
+        if selector == ERROR_STRING_SELECTOR:
+            return decode(["string"], payload)[0], ()
+
+        entry = self.errors.get(selector)
+        if entry is None:
+            return None
+        types = [canonical_type(param) for param in entry["inputs"]]
+        return entry["name"], decode(types, payload)
+
+
+@functools.lru_cache(maxsize=None)
+def _contract_abi(contract_name):
+    return ContractAbi(load_abi(contract_name))
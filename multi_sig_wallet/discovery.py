@@ -0,0 +1,219 @@
+"""
+Discovers a fleet of wallets from the factory's logs alone.
+
+`WalletDeployed` carries each wallet's owners, required approvals, and
+index, so a registry of every wallet the factory deployed can be
+built without a single call to the wallets themselves. The block
+range is swept in chunks, several at a time. A chunk the node refuses
+to serve, because it holds too many logs or spans too many blocks, is
+split in half and retried, and any other error fails the sweep.
+Every sweep is checked for completeness: wallet indexes must run
+without gaps, and from 0 for registries swept from the genesis block.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from multi_sig_wallet.contracts import ContractAbi
+from multi_sig_wallet.rpc import RpcError
+
+DEFAULT_CHUNK_SIZE = 5_000
+DEFAULT_WORKERS = 8
+# EIP-1474 "limit exceeded", which most nodes answer a too large log query with
+LIMIT_EXCEEDED = -32005
+# the messages of the nodes that cap log queries with a generic error code
+RANGE_ERROR_MESSAGES = (
+    "range",
+    "more than",
+    "too many",
+    "limited to",
+    "exceed",
+    "response size",
+)
+
+
+class DiscoveryError(Exception):
+    """Raised when the factory's logs cannot be fetched, or are incomplete."""
+
+
+@dataclass(frozen=True)
+class WalletRecord:
+    """A wallet deployed by the factory, as described by its deployment event."""
+
+    address: str
+    index: int
+    owners: tuple
+    required_approvals: int
+    block_number: int
+
+
+@dataclass
+class FleetRegistry:
+    """The wallets deployed by one factory, keyed by lowercase address."""
+
+    factory: str
+    wallets: dict = field(default_factory=dict)
+    # lowercase owner address --> lowercase addresses of the owner's wallets
+    by_owner: dict = field(default_factory=dict)
+    # the first and last blocks swept, None and -1 before the first sweep
+    first_block: int = None
+    synced_block: int = -1
+
+    def __len__(self):
+        return len(self.wallets)
+
+    def __contains__(self, address):
+        return address.lower() in self.wallets
+
+    def add(self, record):
+        """Registers a wallet, and indexes it by owner."""
+
+        self.wallets[record.address] = record
+        for owner in record.owners:
+            self.by_owner.setdefault(owner, set()).add(record.address)
+
+    def wallet(self, address):
+        """Returns a wallet's `WalletRecord`, or None if the factory did not deploy it."""
+
+        return self.wallets.get(address.lower())
+
+    def wallets_of(self, owner):
+        """Returns the records of the wallets the account is an owner of, by index."""
+
+        return sorted(
+            (self.wallets[address] for address in self.by_owner.get(owner.lower(), ())),
+            key=lambda record: record.index,
+        )
+
+    def owners_by_wallet(self):
+        """
+        Returns every wallet's owners keyed by wallet address, the
+        input `multi_sig_wallet.snapshots.load_fleet()` takes
+        """
+
+        return {
+            address: list(record.owners) for address, record in self.wallets.items()
+        }
+
+    def missing_indexes(self):
+        """
+        Returns the wallet indexes that have no record, up to the
+        highest one seen. Registries swept from a later block than
+        genesis are only checked from the lowest index seen
+        """
+
+        seen = {record.index for record in self.wallets.values()}
+        if not seen:
+            return []
+        lowest = 0 if self.first_block == 0 else min(seen)
+        return sorted(set(range(lowest, max(seen) + 1)) - seen)
+
+
+def _range_too_large(error):
+    message = (error.message or "").lower()
+    return error.code == LIMIT_EXCEEDED or any(
+        part in message for part in RANGE_ERROR_MESSAGES
+    )
+
+
+def fetch_deployment_logs(rpc, factory, from_block, to_block):
+    """
+    Fetches the `WalletDeployed` logs of a block range, splitting it
+    in halves for as long as the node refuses to serve it.
+
+    :param rpc: A transport with a `request(method, params)` method, such as `multi_sig_wallet.rpc.HttpRpc`.
+    :raises DiscoveryError: If the node refuses to serve a single block, or fails for another reason than the size of the range.
+    """
+
+    topic = "0x" + ContractAbi.named("Factory").event_topic("WalletDeployed").hex()
+    try:
+        return rpc.request(
+            "eth_getLogs",
+            [
+                {
+                    "address": factory,
+                    "topics": [topic],
+                    "fromBlock": hex(from_block),
+                    "toBlock": hex(to_block),
+                }
+            ],
+        )
+    except RpcError as error:
+        # nodes cap the logs or the blocks of one query, each with its own error
+        if not _range_too_large(error):
+            raise DiscoveryError(
+                f"The node failed the logs of blocks {from_block}-{to_block}: "
+                f"{error.message}"
+            ) from error
+        if from_block == to_block:
+            raise DiscoveryError(
+                f"The node refused the logs of block {from_block}: {error.message}"
+            ) from error
+    middle = (from_block + to_block) // 2
+    return fetch_deployment_logs(
+        rpc, factory, from_block, middle
+    ) + fetch_deployment_logs(rpc, factory, middle + 1, to_block)
+
+
+def discover(
+    rpc,
+    factory,
+    from_block=0,
+    to_block=None,
+    registry=None,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    workers=DEFAULT_WORKERS,
+):
+    """
+    Sweeps the factory's logs for deployed wallets.
+
+    :param rpc: A transport with a `request(method, params)` method. It is called from several threads at once.
+    :param factory: The factory's address.
+    :param from_block: The first block to sweep. Ignored when extending a registry, which resumes after its last block.
+    :param to_block: The last block to sweep. Defaults to the latest block.
+    :param registry: A `FleetRegistry` from an earlier sweep, to extend with newer wallets.
+    :param chunk_size: The number of blocks per eth_getLogs request.
+    :param workers: The number of requests in flight at once.
+    :raises DiscoveryError: If the registry has gaps after the sweep, which means logs went missing. The registry stays synced to its earlier block, so extending it again sweeps the range again.
+    :return: The `FleetRegistry`.
+    """
+
+    if registry is None:
+        registry = FleetRegistry(factory.lower(), first_block=from_block)
+    else:
+        from_block = registry.synced_block + 1
+    if to_block is None:
+        to_block = int(rpc.request("eth_blockNumber"), 16)
+
+    chunks = [
+        (start, min(start + chunk_size - 1, to_block))
+        for start in range(from_block, to_block + 1, chunk_size)
+    ]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        chunk_logs = pool.map(
+            lambda chunk: fetch_deployment_logs(rpc, factory, *chunk), chunks
+        )
+        abi = ContractAbi.named("Factory")
+        for logs in chunk_logs:
+            for log in logs:
+                if log.get("removed"):
+                    continue
+                _, args = abi.decode_log(log)
+                registry.add(
+                    WalletRecord(
+                        address=args["walletAddress"],
+                        index=args["walletIndex"],
+                        owners=tuple(args["owners"]),
+                        required_approvals=args["requiredApprovals"],
+                        block_number=int(log["blockNumber"], 16),
+                    )
+                )
+
+    missing = registry.missing_indexes()
+    if missing:
+        raise DiscoveryError(
+            f"{len(missing)} wallets are missing from the logs, "
+            f"starting with wallet {missing[0]}"
+        )
+    registry.synced_block = max(registry.synced_block, to_block)
+    return registry
@@ -0,0 +1,263 @@
+"""
+An EIP-1559 fee strategy for transactions sent to the wallet.
+
+Fees are derived from `eth_feeHistory`: the priority fee is the
+median, over recent non-empty blocks, of the reward percentile that
+matches the urgency of the call, and the max fee leaves room for the
+base fee to keep rising for a number of blocks. Transactions that are
+not included in time are re-sent with the same nonce and bumped fees.
+"""
+
+import math
+import statistics
+import time
+from dataclasses import dataclass
+from enum import Enum
+
+# the base fee can rise by at most 12.5% per block
+BASE_FEE_MAX_CHANGE = 1.125
+# nodes only accept a replacement transaction if both fees go up by at least 10%
+MIN_REPLACEMENT_BUMP = 1.1
+# the wallet functions that execute an approved transaction
+EXECUTION_FUNCTIONS = {"executeTxn", "executeTokenTransferFromWithPermit"}
+
+
+class Urgency(Enum):
+    """
+    How quickly a transaction should be included. Each value is the
+    fee history reward percentile used to price its priority fee
+    """
+
+    ECONOMY = 10
+    NORMAL = 50
+    URGENT = 90
+
+
+# the number of blocks of full base fee increases the max fee can absorb
+BLOCKS_OF_HEADROOM = {Urgency.ECONOMY: 1, Urgency.NORMAL: 3, Urgency.URGENT: 6}
+
+
+@dataclass(frozen=True)
+class Fees:
+    """The EIP-1559 fee parameters of a transaction."""
+
+    max_fee_per_gas: int
+    max_priority_fee_per_gas: int
+
+    def as_txn_params(self):
+        """Returns the fees as web3 transaction parameters."""
+
+        return {
+            "maxFeePerGas": self.max_fee_per_gas,
+            "maxPriorityFeePerGas": self.max_priority_fee_per_gas,
+        }
+
+
+@dataclass(frozen=True)
+class InclusionReport:
+    """How long a submission took to be included, and what it cost."""
+
+    urgency: Urgency
+    txn_hash: str
+    bumps: int
+    seconds: float
+    gas_used: int
+    effective_gas_price: int
+
+    @property
+    def spend(self):
+        """The fee paid for the transaction, in wei."""
+
+        return self.gas_used * self.effective_gas_price
+
+
+def urgency_for(function_name, approvals=0, required_approvals=0):
+    """
+    Picks the urgency of a wallet call. Executions, and the approval
+    that completes the quorum, hold up the payment pipeline and are
+    urgent, other approvals are normal, and issuals can wait.
+
+    :param function_name: The wallet function being called.
+    :param approvals: The approvals the transaction has before this call.
+    :param required_approvals: The wallet's required approvals.
+    """
+
+    if function_name in EXECUTION_FUNCTIONS:
+        return Urgency.URGENT
+    if function_name == "approveTxn":
+        if approvals + 1 >= required_approvals:
+            return Urgency.URGENT
+        return Urgency.NORMAL
+    return Urgency.ECONOMY
+
+
+def bump(fees, suggestion=None, factor=BASE_FEE_MAX_CHANGE):
+    """
+    Returns the fees for a replacement transaction: at least `factor`
+    times the previous ones, and never below a fresh suggestion.
+    """
+
+    if factor < MIN_REPLACEMENT_BUMP:
+        raise ValueError(f"Replacements need a bump of at least {MIN_REPLACEMENT_BUMP}")
+
+    priority_fee = math.ceil(fees.max_priority_fee_per_gas * factor)
+    max_fee = math.ceil(fees.max_fee_per_gas * factor)
+    if suggestion is not None:
+        priority_fee = max(priority_fee, suggestion.max_priority_fee_per_gas)
+        max_fee = max(max_fee, suggestion.max_fee_per_gas)
+
+    return Fees(max(max_fee, priority_fee), priority_fee)
+
+
+class FeeEngine:
+    """
+    Suggests fees from the node's fee history, and submits
+    transactions, bumping them until they are included.
+
+    :param web3: A connected web3 instance.
+    :param blocks: The number of recent blocks to look at.
+    :param min_priority_fee: The lowest priority fee to ever suggest, in wei.
+    """
+
+    def __init__(self, web3, blocks=20, min_priority_fee=0):
+        self.web3 = web3
+        self.blocks = blocks
+        self.min_priority_fee = min_priority_fee
+
+    def suggest_all(self):
+        """Returns the suggested fees for every urgency, from one fee history call."""
+
+        percentiles = [urgency.value for urgency in Urgency]
+        history = self.web3.eth.fee_history(self.blocks, "latest", percentiles)
+        # the last entry is the base fee of the next block
+        next_base_fee = history["baseFeePerGas"][-1]
+        rewards = [
+            reward
+            for reward, gas_used_ratio in zip(
+                history.get("reward") or [], history["gasUsedRatio"]
+            )
+            if gas_used_ratio > 0
+        ]
+
+        suggestions = {}
+        for column, urgency in enumerate(Urgency):
+            priority_fee = self.min_priority_fee
+            if rewards:
+                priority_fee = max(
+                    priority_fee,
+                    int(statistics.median(reward[column] for reward in rewards)),
+                )
+            headroom = BASE_FEE_MAX_CHANGE ** BLOCKS_OF_HEADROOM[urgency]
+            max_fee = math.ceil(next_base_fee * headroom) + priority_fee
+            suggestions[urgency] = Fees(max_fee, priority_fee)
+
+        return suggestions
+
+    def suggest(self, urgency):
+        """Returns the suggested fees for the given urgency."""
+
+        return self.suggest_all()[urgency]
+
+    def submit(
+        self,
+        send,
+        urgency,
+        nonce,
+        stuck_after=30,
+        max_bumps=5,
+        poll_interval=0.5,
+    ):
+        """
+        Sends a transaction and keeps replacing it with bumped fees
+        until one of the versions sent is included.
+
+        :param send: A callable taking `(fees, nonce)` that signs and broadcasts the transaction, and returns its hash.
+        :param urgency: The urgency to price the transaction with.
+        :param nonce: The nonce shared by the original and every replacement.
+        :param stuck_after: Seconds to wait for inclusion before bumping.
+        :param max_bumps: The number of replacements to send before giving up.
+        :param poll_interval: Seconds between receipt checks.
+        :return: An `InclusionReport` for the version that got included.
+        """
+
+        fees = self.suggest(urgency)
+        started = time.monotonic()
+        txn_hashes = []
+
+        for bumps in range(max_bumps + 1):
+            if bumps:
+                fees = bump(fees, self.suggest(urgency))
+            try:
+                txn_hashes.append(send(fees, nonce))
+            except ValueError:
+                # the node rejects a replacement whose nonce was just used up
+                if not txn_hashes or self._find_receipt(txn_hashes) is None:
+                    raise
+
+            deadline = time.monotonic() + stuck_after
+            while time.monotonic() < deadline:
+                receipt = self._find_receipt(txn_hashes)
+                if receipt is not None:
+                    return InclusionReport(
+                        urgency=urgency,
+                        txn_hash=receipt["transactionHash"].hex(),
+                        bumps=bumps,
+                        seconds=time.monotonic() - started,
+                        gas_used=receipt["gasUsed"],
+                        effective_gas_price=receipt["effectiveGasPrice"],
+                    )
+                time.sleep(poll_interval)
+
+        raise TimeoutError(
+            f"Transaction with nonce {nonce} not included after {max_bumps} bumps"
+        )
+
+    def _find_receipt(self, txn_hashes):
+        # imported here so that the fee types can be used without web3
+        from web3.exceptions import (  # pylint: disable=import-outside-toplevel
+            TransactionNotFound,
+        )
+
+        # an earlier version can still be included after it was replaced
+        for txn_hash in txn_hashes:
+            try:
+                return self.web3.eth.get_transaction_receipt(txn_hash)
+            except TransactionNotFound:
+                continue
+        return None
+
+
+def signed_sender(web3, private_key, txn):
+    """
+    Returns a `send` callable for `FeeEngine.submit()` that signs the
+    transaction locally with the given key and broadcasts it.
+
+    :param txn: The transaction fields other than the fees and the nonce.
+    """
+
+    def send(fees, nonce):
+        signed = web3.eth.account.sign_transaction(
+            {"type": 2, **txn, **fees.as_txn_params(), "nonce": nonce}, private_key
+        )
+        return web3.eth.send_raw_transaction(signed.rawTransaction)
+
+    return send
+
+
+def summarize(reports):
+    """
+    Groups inclusion reports by urgency and returns, for each one,
+    the number of transactions, the mean seconds to inclusion, and
+    the mean spend in wei
+    """
+
+    summary = {}
+    for urgency in Urgency:
+        selected = [report for report in reports if report.urgency == urgency]
+        if selected:
+            summary[urgency] = (
+                len(selected),
+                statistics.mean(report.seconds for report in selected),
+                statistics.mean(report.spend for report in selected),
+            )
+    return summary
@@ -0,0 +1,224 @@
+"""
+Learned gas limits, so wallet calls can skip `eth_estimateGas`.
+
+The gas a wallet call uses barely varies between calls of the same
+shape: the function, the transaction type and action it works on,
+and whether the storage it writes is still cold. A `GasLimitModel`
+records the gas used by every receipt of a shape, and hands out the
+largest one seen plus a safety margin, which saves an RPC round trip
+per submission. Calls whose warmth is not known may be cold, so they
+get the cost of a cold write on top of any sample that was not taken
+from a cold call. Shapes that were never seen are estimated live, and
+a shape whose limit ran out of gas is forgotten, so it is estimated
+live again until new receipts come in.
+"""
+
+import json
+import math
+import os
+import threading
+from pathlib import Path
+from typing import NamedTuple
+
+from multi_sig_wallet.model import TxnAction, TxnType
+
+# issue function --> the (txn type, txn action) it issues
+ISSUE_SHAPES = {
+    "issueEthTxn": (TxnType.ETH, TxnAction.TRANSFER),
+    "issueTokenTransferTxn": (TxnType.TOKEN, TxnAction.TRANSFER),
+    "issueTokenTransferFromTxn": (TxnType.TOKEN, TxnAction.TRANSFER_FROM),
+    "issueTokenApprovalTxn": (TxnType.TOKEN, TxnAction.APPROVE),
+    "issueNftTransferTxn": (TxnType.NFT, TxnAction.TRANSFER),
+    "issueNftTransferFromTxn": (TxnType.NFT, TxnAction.TRANSFER_FROM),
+    "issueNftApprovalTxn": (TxnType.NFT, TxnAction.APPROVE),
+}
+# functions whose gas grows with their arguments, so they are always estimated live
+VARIABLE_GAS_FUNCTIONS = {"issuePackedTxns", "registerAssets"}
+# a call that runs out of gas in a subcall keeps 1/64 of its gas, and reverts with the rest used up
+OUT_OF_GAS_FRACTION = 63 / 64
+# a zero to nonzero SSTORE costs 20,000 gas, a nonzero to nonzero one 2,900
+COLD_WRITE_SURCHARGE = 20_000 - 2_900
+
+
+class CallShape(NamedTuple):
+    """The features of a wallet call its gas use depends on."""
+
+    function_name: str
+    txn_type: TxnType = None
+    action: TxnAction = None
+    # whether the storage the call writes already holds a nonzero value, None if not known
+    warm: bool = None
+
+    def key(self):
+        """Returns the shape as a string, for the persisted model."""
+
+        return ":".join(
+            [
+                self.function_name,
+                "" if self.txn_type is None else self.txn_type.name,
+                "" if self.action is None else self.action.name,
+                {True: "warm", False: "cold", None: "unknown"}[self.warm],
+            ]
+        )
+
+    @classmethod
+    def from_key(cls, key):
+        """The inverse of `key()`."""
+
+        function_name, txn_type, action, warm = key.split(":")
+        return cls(
+            function_name,
+            TxnType[txn_type] if txn_type else None,
+            TxnAction[action] if action else None,
+            {"warm": True, "cold": False, "unknown": None}[warm],
+        )
+
+
+def call_shape(function_name, args=(), action=None, warm=None):
+    """
+    Returns the shape of a wallet call, or None if its gas cannot be
+    learned. Issue functions imply their transaction type and action.
+    Approvals and executions take the type from their first argument.
+    Approvals cost the same for every action, so their shape has none.
+    Executions take the action, which only the wallet's storage knows,
+    from the caller, and cannot be learned without it.
+
+    :param action: For executions, the `TxnAction` of the transaction.
+    :param warm: For issuals, whether the wallet already has a transaction of the type. For approvals, whether the transaction already has an approval. None if not known, in which case the limit allows for a cold write.
+    """
+
+    if function_name in VARIABLE_GAS_FUNCTIONS:
+        return None
+    if function_name in ISSUE_SHAPES:
+        txn_type, action = ISSUE_SHAPES[function_name]
+        return CallShape(function_name, txn_type, action, warm)
+    if function_name == "approveTxn":
+        return CallShape(function_name, TxnType(args[0]), warm=warm)
+    if function_name == "executeTxn":
+        if action is None:
+            return None
+        return CallShape(function_name, TxnType(args[0]), TxnAction(action), warm)
+    return CallShape(function_name, warm=warm)
+
+
+def _bounds(shape):
+    """
+    Returns the (shape, surcharge) pairs whose samples bound the gas
+    of a call of the shape. Calls of known warmth only trust samples
+    of the same warmth, calls of unknown warmth trust every sample,
+    with a cold write added to those that may have been warm
+    """
+
+    if shape.warm is not None:
+        return [(shape, 0)]
+    return [
+        (shape._replace(warm=False), 0),
+        (shape._replace(warm=True), COLD_WRITE_SURCHARGE),
+        (shape, COLD_WRITE_SURCHARGE),
+    ]
+
+
+def ran_out_of_gas(receipt, gas_limit):
+    """Checks whether a JSON-RPC receipt is a revert caused by running out of gas."""
+
+    failed = int(receipt["status"], 16) == 0
+    return failed and int(receipt["gasUsed"], 16) >= gas_limit * OUT_OF_GAS_FRACTION
+
+
+class GasLimitModel:
+    """
+    Learns gas limits per call shape from receipts, and persists them.
+
+    :param path: The JSON file the model is loaded from and saved to after each change, if any.
+    :param margin: The fraction of the largest gas used that is added on top of it.
+    :param min_samples: The number of receipts of a shape needed before its limit is trusted.
+    """
+
+    def __init__(self, path=None, margin=0.2, min_samples=1):
+        self.path = None if path is None else Path(path)
+        self.margin = margin
+        self.min_samples = min_samples
+        # shape --> [receipts seen, largest gas used]
+        self.shapes = {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if self.path is not None and self.path.exists():
+            self._load()
+
+    def limit(self, shape):
+        """Returns the gas limit of a shape, or None if it has to be estimated live."""
+
+        with self._lock:
+            bounds = [] if shape is None else _bounds(shape)
+            largest = [
+                learned[1] + surcharge
+                for learned, surcharge in (
+                    (self.shapes.get(bound), surcharge) for bound, surcharge in bounds
+                )
+                if learned is not None and learned[0] >= self.min_samples
+            ]
+            if not largest:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return math.ceil(max(largest) * (1 + self.margin))
+
+    def observe(self, shape, gas_used):
+        """Records the gas used by a successful call of the shape."""
+
+        if shape is None:
+            return
+        with self._lock:
+            samples, largest = self.shapes.get(shape, (0, 0))
+            self.shapes[shape] = [samples + 1, max(largest, gas_used)]
+            self._save()
+
+    def forget(self, shape):
+        """
+        Drops a shape whose limit proved too low, and the samples its
+        limit was taken from, so it is estimated live again
+        """
+
+        if shape is None:
+            return
+        with self._lock:
+            dropped = [self.shapes.pop(bound, None) for bound, _ in _bounds(shape)]
+            if any(learned is not None for learned in dropped):
+                self._save()
+
+    def record_receipt(self, shape, receipt, gas_limit):
+        """
+        Learns from a JSON-RPC receipt of a call sent with the given
+        gas limit. Successful calls are observed, and calls that ran
+        out of gas make the model forget their shape.
+
+        :return: True if the call ran out of gas.
+        """
+
+        if ran_out_of_gas(receipt, gas_limit):
+            self.forget(shape)
+            return True
+        if int(receipt["status"], 16) == 1:
+            self.observe(shape, int(receipt["gasUsed"], 16))
+        return False
+
+    def _load(self):
+        with open(self.path, encoding="utf-8") as model_file:
+            learned = json.load(model_file)
+        self.shapes = {
+            CallShape.from_key(key): list(value) for key, value in learned.items()
+        }
+
+    def _save(self):
+        if self.path is None:
+            return
+        partial = self.path.with_name(self.path.name + ".partial")
+        with open(partial, "w", encoding="utf-8") as model_file:
+            json.dump(
+                {shape.key(): value for shape, value in self.shapes.items()},
+                model_file,
+                indent=2,
+                sort_keys=True,
+            )
+        os.replace(partial, self.path)
@@ -0,0 +1,505 @@
+"""
+A pure-Python reference model of the MultiSigWallet contract.
+
+The model follows the issue, approve, and execute rules of
+`contracts/src/MultiSigWallet.sol` check for check, including the
+order in which the contract reverts. Since it runs in-process, it
+can be driven through a huge number of operation sequences in
+the time a handful of EVM round trips would take, and sampled
+sequences can then be replayed against a deployed wallet to make
+sure both agree.
+
+Assets the wallet touches during execution (ETH, ERC20 balances
+and allowances, and ERC721 ownership) are tracked by a `Ledger`,
+which mirrors the OpenZeppelin 4.9 token behaviour the contract
+relies on. Recipients are assumed to be externally owned accounts.
+"""
+
+import random
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import NamedTuple
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+MAX_UINT256 = 2**256 - 1
+
+
+class TxnType(IntEnum):
+    """Mirrors the contract's TxnType enum."""
+
+    ETH = 0
+    TOKEN = 1
+    NFT = 2
+
+
+class TxnAction(IntEnum):
+    """Mirrors the contract's TxnAction enum."""
+
+    TRANSFER = 0
+    TRANSFER_FROM = 1
+    APPROVE = 2
+
+
+class WalletRevert(Exception):
+    """
+    Raised whenever the contract would revert. `error` holds the
+    custom error name (or the revert string for token reverts),
+    and `error_args` the values the error carries
+    """
+
+    def __init__(self, error, *error_args):
+        super().__init__(error, *error_args)
+        self.error = error
+        self.error_args = error_args
+
+
+@dataclass
+class Txn:
+    """
+    A queued wallet transaction. For NFT transactions `amount`
+    holds the tokenId, and ETH transactions always use the
+    transfer action with no asset
+    """
+
+    action: TxnAction
+    to: str
+    amount: int
+    allowance_provider: str = ZERO_ADDRESS
+    asset: str = ZERO_ADDRESS
+    approvals: int = 0
+    executed: bool = False
+
+    def as_view(self, txn_type):
+        """
+        Returns the transaction in the same layout as the
+        get*TxnDetails() view functions
+        """
+
+        details = (self.approvals, self.executed)
+        if txn_type == TxnType.ETH:
+            return (self.to, self.amount, details)
+        return (
+            int(self.action),
+            self.to,
+            self.amount,
+            self.allowance_provider,
+            self.asset,
+            details,
+        )
+
+
+@dataclass
+class Ledger:
+    """
+    The external state consulted and changed during execution:
+    the wallet's ETH, ERC20 balances and allowances, and ERC721
+    owners and approvals
+    """
+
+    eth_balance: int = 0
+    # (token, holder) --> balance
+    token_balances: dict = field(default_factory=dict)
+    # (token, owner, spender) --> allowance
+    token_allowances: dict = field(default_factory=dict)
+    # (nft, tokenId) --> owner
+    nft_owners: dict = field(default_factory=dict)
+    # (nft, tokenId) --> approved address
+    nft_approvals: dict = field(default_factory=dict)
+
+    def token_balance(self, token, holder):
+        """Returns the ERC20 balance of the holder."""
+
+        return self.token_balances.get((token, holder), 0)
+
+    def token_allowance(self, token, owner, spender):
+        """Returns the ERC20 allowance given by owner to spender."""
+
+        return self.token_allowances.get((token, owner, spender), 0)
+
+    def transfer_tokens(self, token, sender, to, amount):
+        """Moves tokens the way ERC20._transfer() does."""
+
+        balance = self.token_balance(token, sender)
+        if balance < amount:
+            raise WalletRevert("ERC20: transfer amount exceeds balance")
+
+        self.token_balances[(token, sender)] = balance - amount
+        self.token_balances[(token, to)] = self.token_balance(token, to) + amount
+
+    def spend_allowance(self, token, owner, spender, amount):
+        """Consumes an allowance the way ERC20._spendAllowance() does."""
+
+        allowance = self.token_allowance(token, owner, spender)
+        if allowance == MAX_UINT256:
+            return
+        if allowance < amount:
+            raise WalletRevert("ERC20: insufficient allowance")
+
+        self.token_allowances[(token, owner, spender)] = allowance - amount
+
+    def nft_owner(self, nft, token_id):
+        """Returns the owner of the NFT, reverting like ERC721.ownerOf()."""
+
+        owner = self.nft_owners.get((nft, token_id))
+        if owner is None:
+            raise WalletRevert("ERC721: invalid token ID")
+        return owner
+
+    def nft_approved(self, nft, token_id):
+        """Returns the approved address, reverting like ERC721.getApproved()."""
+
+        self.nft_owner(nft, token_id)
+        return self.nft_approvals.get((nft, token_id), ZERO_ADDRESS)
+
+    def transfer_nft(self, nft, sender, to, token_id):
+        """Moves an NFT the way ERC721._transfer() does."""
+
+        if self.nft_owner(nft, token_id) != sender:
+            raise WalletRevert("ERC721: transfer from incorrect owner")
+
+        self.nft_approvals.pop((nft, token_id), None)
+        self.nft_owners[(nft, token_id)] = to
+
+
+class WalletModel:
+    """
+    In-process stand-in for a deployed MultiSigWallet. Every public
+    method mirrors the contract function of the same purpose, and
+    raises `WalletRevert` exactly when the contract would revert
+    """
+
+    def __init__(self, owners, required_approvals, address="0xWallet", ledger=None):
+        if required_approvals > len(owners):
+            raise WalletRevert("MultiSigWallet__InvalidRequiredApprovals")
+
+        self.address = address
+        self.owners = frozenset(owners)
+        self.required_approvals = required_approvals
+        self.ledger = ledger if ledger is not None else Ledger()
+        self.txns = {txn_type: [] for txn_type in TxnType}
+        # (txn type, txn index) --> owners who have approved
+        self.approvers = {}
+
+    def _only_owner(self, sender):
+        if sender not in self.owners:
+            raise WalletRevert("MultiSigWallet__NotOneOfTheOwners")
+
+    def _valid_txn(self, txn_type, txn_index):
+        txn_type = TxnType(txn_type)
+        if txn_index >= len(self.txns[txn_type]):
+            raise WalletRevert("MultiSigWallet__InvalidIndex")
+        return self.txns[txn_type][txn_index]
+
+    def issue_eth_txn(self, sender, to, amount):
+        """Mirrors issueEthTxn(). Returns the new transaction's index."""
+
+        self._only_owner(sender)
+        return self._issue(TxnType.ETH, Txn(TxnAction.TRANSFER, to, amount))
+
+    def issue_token_txn(self, sender, action, to, amount, allowance_provider, token):
+        """
+        Mirrors the issueToken*Txn() functions. Returns the new
+        transaction's index
+        """
+
+        self._only_owner(sender)
+        action = TxnAction(action)
+        if action != TxnAction.TRANSFER_FROM:
+            allowance_provider = ZERO_ADDRESS
+        return self._issue(
+            TxnType.TOKEN, Txn(action, to, amount, allowance_provider, token)
+        )
+
+    def issue_nft_txn(self, sender, action, to, token_id, allowance_provider, nft):
+        """
+        Mirrors the issueNft*Txn() functions. Returns the new
+        transaction's index
+        """
+
+        self._only_owner(sender)
+        action = TxnAction(action)
+        if action != TxnAction.TRANSFER_FROM:
+            allowance_provider = ZERO_ADDRESS
+        return self._issue(
+            TxnType.NFT, Txn(action, to, token_id, allowance_provider, nft)
+        )
+
+    def _issue(self, txn_type, txn):
+        self.txns[txn_type].append(txn)
+        return len(self.txns[txn_type]) - 1
+
+    def approve_txn(self, sender, txn_type, txn_index):
+        """Mirrors approveTxn()."""
+
+        self._only_owner(sender)
+        txn = self._valid_txn(txn_type, txn_index)
+        approvers = self.approvers.setdefault((TxnType(txn_type), txn_index), set())
+
+        if sender in approvers:
+            raise WalletRevert("MultiSigWallet__TxnAlreadyApproved")
+        if txn.executed:
+            raise WalletRevert("MultiSigWallet__TxnAlreadyExecuted")
+
+        approvers.add(sender)
+        txn.approvals += 1
+
+    def execute_txn(self, sender, txn_type, txn_index):
+        """Mirrors executeTxn()."""
+
+        self._only_owner(sender)
+        txn = self._valid_txn(txn_type, txn_index)
+
+        if txn.approvals < self.required_approvals:
+            raise WalletRevert("MultiSigWallet__NotEnoughApprovalsGiven", txn.approvals)
+        if txn.executed:
+            raise WalletRevert("MultiSigWallet__TxnAlreadyExecuted")
+
+        txn_type = TxnType(txn_type)
+        if txn_type == TxnType.ETH:
+            self._execute_eth_txn(txn)
+        elif txn_type == TxnType.TOKEN:
+            self._execute_token_txn(txn)
+        else:
+            self._execute_nft_txn(txn)
+        txn.executed = True
+
+    def _execute_eth_txn(self, txn):
+        ledger = self.ledger
+        if ledger.eth_balance < txn.amount:
+            raise WalletRevert("MultiSigWallet__NotEnoughEtH", ledger.eth_balance)
+
+        ledger.eth_balance -= txn.amount
+
+    def _execute_token_txn(self, txn):
+        ledger = self.ledger
+        if txn.action == TxnAction.TRANSFER_FROM:
+            allowance = ledger.token_allowance(
+                txn.asset, txn.allowance_provider, self.address
+            )
+            if allowance < txn.amount:
+                raise WalletRevert("MultiSigWallet__NotEnoughAllowance", allowance)
+
+            ledger.spend_allowance(
+                txn.asset, txn.allowance_provider, self.address, txn.amount
+            )
+            ledger.transfer_tokens(
+                txn.asset, txn.allowance_provider, txn.to, txn.amount
+            )
+            return
+
+        balance = ledger.token_balance(txn.asset, self.address)
+        if balance < txn.amount:
+            raise WalletRevert("MultiSigWallet__NotEnoughTokens", balance)
+
+        if txn.action == TxnAction.TRANSFER:
+            ledger.transfer_tokens(txn.asset, self.address, txn.to, txn.amount)
+        else:
+            ledger.token_allowances[(txn.asset, self.address, txn.to)] = txn.amount
+
+    def _execute_nft_txn(self, txn):
+        ledger = self.ledger
+        key = (txn.asset, txn.amount)
+        if txn.action == TxnAction.TRANSFER:
+            if ledger.nft_owner(*key) != self.address:
+                raise WalletRevert("MultiSigWallet__TokenIdNotOwned")
+
+            ledger.transfer_nft(txn.asset, self.address, txn.to, txn.amount)
+        elif txn.action == TxnAction.TRANSFER_FROM:
+            if ledger.nft_approved(*key) != self.address:
+                raise WalletRevert("MultiSigWallet__NftNotApproved")
+
+            ledger.transfer_nft(txn.asset, txn.allowance_provider, txn.to, txn.amount)
+        else:
+            if ledger.nft_owner(*key) != self.address:
+                raise WalletRevert("MultiSigWallet__NotOwnerOfNft", txn.amount)
+            if txn.to == self.address:
+                raise WalletRevert("ERC721: approval to current owner")
+
+            ledger.nft_approvals[key] = txn.to
+
+    def deposit_eth(self, sender, amount):
+        """Mirrors sending ETH to the wallet's receive() function."""
+
+        del sender
+        self.ledger.eth_balance += amount
+
+    def deposit_tokens(self, sender, token, amount):
+        """Mirrors an ERC20 transfer from the sender into the wallet."""
+
+        self.ledger.transfer_tokens(token, sender, self.address, amount)
+
+    def approve_tokens(self, sender, token, amount):
+        """Mirrors the sender giving the wallet an ERC20 allowance."""
+
+        self.ledger.token_allowances[(token, sender, self.address)] = amount
+
+    def has_approved(self, txn_type, txn_index, owner):
+        """Returns whether the owner has approved the transaction."""
+
+        return owner in self.approvers.get((TxnType(txn_type), txn_index), ())
+
+    def get_txn_count(self, txn_type):
+        """Mirrors the get*TxnCount() view functions."""
+
+        return len(self.txns[TxnType(txn_type)])
+
+    def get_txn_details(self, txn_type, txn_index):
+        """Mirrors the get*TxnDetails() view functions."""
+
+        return self._valid_txn(txn_type, txn_index).as_view(TxnType(txn_type))
+
+    def apply(self, operation):
+        """
+        Applies an `Operation` and returns the name of the error it
+        reverted with, or None if it went through
+        """
+
+        try:
+            getattr(self, operation.name)(operation.sender, *operation.args)
+        except WalletRevert as revert:
+            return revert.error
+        return None
+
+
+class Operation(NamedTuple):
+    """
+    A single call against the wallet: the name of the `WalletModel`
+    method, the account sending it, and the remaining arguments
+    """
+
+    name: str
+    sender: str
+    args: tuple = ()
+
+
+def run_sequence(model, operations):
+    """
+    Applies the operations in order and returns the outcome of each
+    one (None, or the name of the error it reverted with)
+    """
+
+    return [model.apply(operation) for operation in operations]
+
+
+def random_operations(
+    rng,
+    owners,
+    outsiders,
+    length,
+    tokens=(),
+    nfts=(),
+    max_amount=10,
+    txn_types=tuple(TxnType),
+):
+    """
+    Generates a random, replayable operation sequence. Indices are
+    biased towards existing transactions, with the occasional one
+    just past the end of the queue to exercise index validation.
+
+    :param rng: A `random.Random` instance, so sequences can be reproduced from a seed.
+    :param owners: The wallet owners.
+    :param outsiders: Accounts that do not own the wallet. They also receive the transfers.
+    :param length: The number of operations to generate.
+    :param tokens: ERC20 addresses token transactions can refer to.
+    :param nfts: ERC721 addresses NFT transactions can refer to.
+    :param max_amount: The upper bound for amounts and tokenIds.
+    :param txn_types: The transaction types to issue.
+    """
+
+    senders = list(owners) + list(outsiders)
+    issued = {txn_type: 0 for txn_type in TxnType}
+    txn_types = [
+        txn_type
+        for txn_type in txn_types
+        if txn_type == TxnType.ETH
+        or (txn_type == TxnType.TOKEN and tokens)
+        or (txn_type == TxnType.NFT and nfts)
+    ]
+    operations = []
+
+    for _ in range(length):
+        # mostly owners, so that most operations get past the owner check
+        sender = rng.choice(owners) if rng.random() < 0.9 else rng.choice(senders)
+        txn_type = rng.choice(txn_types)
+        roll = rng.random()
+
+        if roll < 0.2 or (issued[txn_type] == 0 and roll < 0.5):
+            operation = _random_issual(
+                rng, sender, txn_type, owners, outsiders, tokens, nfts, max_amount
+            )
+            if sender in owners:
+                issued[txn_type] += 1
+        elif roll < 0.85:
+            name = "approve_txn" if roll < 0.6 else "execute_txn"
+            if issued[txn_type] == 0 or rng.random() < 0.1:
+                txn_index = issued[txn_type]
+            else:
+                txn_index = rng.randrange(issued[txn_type])
+            operation = Operation(name, sender, (txn_type, txn_index))
+        elif roll < 0.95 or not tokens:
+            operation = Operation("deposit_eth", sender, (rng.randint(1, max_amount),))
+        else:
+            operation = Operation(
+                "deposit_tokens",
+                rng.choice(owners),
+                (rng.choice(tokens), rng.randint(1, max_amount)),
+            )
+
+        operations.append(operation)
+
+    return operations
+
+
+def _random_issual(rng, sender, txn_type, owners, outsiders, tokens, nfts, max_amount):
+    to = rng.choice(outsiders)
+    amount = rng.randint(1, max_amount)
+
+    if txn_type == TxnType.ETH:
+        return Operation("issue_eth_txn", sender, (to, amount))
+
+    action = rng.choice(list(TxnAction))
+    allowance_provider = rng.choice(owners)
+    if txn_type == TxnType.TOKEN:
+        return Operation(
+            "issue_token_txn",
+            sender,
+            (action, to, amount, allowance_provider, rng.choice(tokens)),
+        )
+    return Operation(
+        "issue_nft_txn",
+        sender,
+        (action, to, amount, allowance_provider, rng.choice(nfts)),
+    )
+
+
+def fuzz(
+    owners,
+    required_approvals,
+    outsiders,
+    sequences,
+    length,
+    seed=0,
+    check=None,
+    **kwargs,
+):
+    """
+    Runs many random operation sequences through fresh models and
+    calls `check(model, operations, outcomes)` after each one.
+    Returns the number of operations applied.
+
+    Extra keyword arguments are passed on to `random_operations()`.
+    """
+
+    rng = random.Random(seed)
+    applied = 0
+
+    for _ in range(sequences):
+        model = WalletModel(owners, required_approvals)
+        operations = random_operations(rng, owners, outsiders, length, **kwargs)
+        outcomes = run_sequence(model, operations)
+        applied += len(operations)
+
+        if check is not None:
+            check(model, operations, outcomes)
+
+    return applied
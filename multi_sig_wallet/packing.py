@@ -0,0 +1,157 @@
+"""
+Tightly packed transaction records for `issuePackedTxns()`.
+
+On rollups most of a transaction's fee pays for its calldata, and the
+ABI encoded issue functions spend a 32-byte word on every address and
+amount. A packed record spends one byte on the transaction type and
+action, 20 on the recipient, one plus the significant bytes on the
+amount or tokenId, two on the asset, which the wallet knows by its
+index in `getAssets()`, and 20 on the allowance provider of transfer
+from transactions. Any number of records fit in one call.
+"""
+
+from multi_sig_wallet.model import ZERO_ADDRESS, Txn, TxnAction, TxnType
+
+# the asset index is packed into two bytes
+MAX_ASSETS = 2**16
+
+
+class PackingError(ValueError):
+    """Raised when a transaction cannot be packed, or packed records are malformed."""
+
+
+def _address_bytes(address):
+    return bytes.fromhex(address[2:])
+
+
+def _address_str(raw):
+    return "0x" + raw.hex()
+
+
+def encode_txn(txn_type, txn, asset_indexes):
+    """
+    Packs one transaction.
+
+    :param txn_type: The `TxnType`.
+    :param txn: The `Txn` to issue. Approvals and execution are ignored.
+    :param asset_indexes: The wallet's asset indexes, keyed by lowercase asset address.
+    :return: The packed record.
+    """
+
+    txn_type, action = TxnType(txn_type), TxnAction(txn.action)
+    if txn_type == TxnType.ETH and action != TxnAction.TRANSFER:
+        raise PackingError("ETH transactions can only transfer")
+    if not 0 <= txn.amount < 2**256:
+        raise PackingError(f"{txn.amount} does not fit in a uint256")
+
+    amount = txn.amount.to_bytes(32, "big").lstrip(b"\0")
+    record = (
+        bytes([txn_type << 4 | action])
+        + _address_bytes(txn.to)
+        + bytes([len(amount)])
+        + amount
+    )
+    if txn_type == TxnType.ETH:
+        return record
+
+    asset_index = asset_indexes.get(txn.asset.lower())
+    if asset_index is None:
+        raise PackingError(f"{txn.asset} has no asset index, register it first")
+    record += asset_index.to_bytes(2, "big")
+    if action == TxnAction.TRANSFER_FROM:
+        record += _address_bytes(txn.allowance_provider)
+    return record
+
+
+def encode_txns(txns, asset_indexes):
+    """
+    Packs transactions into the records of one `issuePackedTxns()` call.
+
+    :param txns: (txn type, `Txn`) pairs, in the order they are issued.
+    :param asset_indexes: The wallet's asset indexes, keyed by lowercase asset address.
+    """
+
+    return b"".join(encode_txn(txn_type, txn, asset_indexes) for txn_type, txn in txns)
+
+
+def decode_txns(records, assets):
+    """
+    Unpacks records the way the contract does, the inverse of `encode_txns()`.
+
+    :param records: The packed records.
+    :param assets: The wallet's assets in asset index order, as returned by `getAssets()`.
+    :return: (txn type, `Txn`) pairs, with lowercase addresses.
+    """
+
+    def read(offset, length, record_offset):
+        if offset + length > len(records):
+            raise PackingError(f"Record at byte {record_offset} is truncated")
+        return records[offset : offset + length]
+
+    txns = []
+    offset = 0
+    while offset < len(records):
+        start = offset
+        kind = read(offset, 1, start)[0]
+        if kind >> 4 > max(TxnType) or kind & 0x0F > max(TxnAction):
+            raise PackingError(f"Record at byte {start} has an invalid kind {kind:#x}")
+        txn_type, action = TxnType(kind >> 4), TxnAction(kind & 0x0F)
+        to = _address_str(read(offset + 1, 20, start))
+        amount_length = read(offset + 21, 1, start)[0]
+        if amount_length > 32:
+            raise PackingError(
+                f"Record at byte {start} has a {amount_length} byte amount"
+            )
+        amount = int.from_bytes(read(offset + 22, amount_length, start), "big")
+        offset += 22 + amount_length
+
+        if txn_type == TxnType.ETH:
+            if action != TxnAction.TRANSFER:
+                raise PackingError(f"Record at byte {start} is an ETH {action.name}")
+            txns.append((txn_type, Txn(action, to, amount)))
+            continue
+
+        asset_index = int.from_bytes(read(offset, 2, start), "big")
+        if asset_index >= len(assets):
+            raise PackingError(
+                f"Record at byte {start} has unknown asset {asset_index}"
+            )
+        offset += 2
+        allowance_provider = ZERO_ADDRESS
+        if action == TxnAction.TRANSFER_FROM:
+            allowance_provider = _address_str(read(offset, 20, start))
+            offset += 20
+        txns.append(
+            (
+                txn_type,
+                Txn(
+                    action, to, amount, allowance_provider, assets[asset_index].lower()
+                ),
+            )
+        )
+    return txns
+
+
+def asset_indexes(assets):
+    """Returns the asset indexes of a wallet's `getAssets()`, keyed by lowercase address."""
+
+    return {asset.lower(): index for index, asset in enumerate(assets)}
+
+
+def unregistered_assets(txns, assets):
+    """
+    Returns the token and NFT contracts of the transactions that the
+    wallet has no index for yet, in first-use order, ready for
+    `registerAssets()`
+    """
+
+    known = {asset.lower() for asset in assets}
+    missing = []
+    for txn_type, txn in txns:
+        asset = txn.asset.lower()
+        if txn_type != TxnType.ETH and asset not in known:
+            known.add(asset)
+            missing.append(txn.asset)
+    if len(known) > MAX_ASSETS:
+        raise PackingError(f"A wallet can index at most {MAX_ASSETS} assets")
+    return missing
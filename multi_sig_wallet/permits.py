@@ -0,0 +1,215 @@
+"""
+EIP-2612 permits for token transfer from transactions.
+
+A permit is an allowance granted with an off-chain signature instead
+of an `approve` transaction. The allowance provider signs a permit
+for the wallet, hands it to the owners, and any owner executes the
+approved transaction with `executeTokenTransferFromWithPermit()`,
+which submits the permit and spends it in the same transaction.
+"""
+
+from dataclasses import dataclass
+
+from eth_abi import encode
+from eth_abi.exceptions import DecodingError
+from eth_hash.auto import keccak
+
+from multi_sig_wallet.client import ContractRevert, token_at, wallet_at
+from multi_sig_wallet.rpc import RpcError
+
+PERMIT_TYPES = {
+    "EIP712Domain": [
+        {"name": "name", "type": "string"},
+        {"name": "version", "type": "string"},
+        {"name": "chainId", "type": "uint256"},
+        {"name": "verifyingContract", "type": "address"},
+    ],
+    "Permit": [
+        {"name": "owner", "type": "address"},
+        {"name": "spender", "type": "address"},
+        {"name": "value", "type": "uint256"},
+        {"name": "nonce", "type": "uint256"},
+        {"name": "deadline", "type": "uint256"},
+    ],
+}
+
+
+def _type_string(type_name):
+    fields = ",".join(
+        f"{field['type']} {field['name']}" for field in PERMIT_TYPES[type_name]
+    )
+    return f"{type_name}({fields})"
+
+
+@dataclass(frozen=True)
+class PermitDomain:
+    """The EIP-712 domain a token verifies its permits against."""
+
+    name: str
+    version: str
+    chain_id: int
+    verifying_contract: str
+
+    @classmethod
+    def fetch(cls, rpc, token_address, version="1"):
+        """
+        Reads a token's domain from its ERC-5267 `eip712Domain()` view.
+        Tokens without it, such as OpenZeppelin's before 4.9, do not
+        expose their domain's version, so it is built from `name()`,
+        the given version, and the node's chain id. Either way, the
+        domain is checked against the token's `DOMAIN_SEPARATOR()`.
+        Tokens whose domain has other fields than the name, version,
+        chain id, and verifying contract are not supported.
+
+        :param rpc: A transport with a `request(method, params)` method, such as `multi_sig_wallet.rpc.HttpRpc`.
+        :param version: The domain's version, for tokens without `eip712Domain()`.
+        :raises ValueError: If the domain does not match the token's `DOMAIN_SEPARATOR()`.
+        """
+
+        token = token_at(rpc, token_address)
+        try:
+            _, name, version, chain_id, verifying_contract, _, _ = token.call(
+                "eip712Domain"
+            )
+            domain = cls(name, version, chain_id, verifying_contract)
+        except (ContractRevert, RpcError, DecodingError):
+            domain = cls(token.call("name"), version, token.chain_id, token_address)
+
+        if domain.separator() != token.call("DOMAIN_SEPARATOR"):
+            raise ValueError(
+                f"The domain of {token_address} does not match its DOMAIN_SEPARATOR(), "
+                f"check the version {domain.version!r}"
+            )
+        return domain
+
+    def separator(self):
+        """Returns the domain's EIP-712 separator, as `DOMAIN_SEPARATOR()` does."""
+
+        return keccak(
+            encode(
+                ["bytes32", "bytes32", "bytes32", "uint256", "address"],
+                [
+                    keccak(_type_string("EIP712Domain").encode()),
+                    keccak(self.name.encode()),
+                    keccak(self.version.encode()),
+                    self.chain_id,
+                    self.verifying_contract,
+                ],
+            )
+        )
+
+    def as_typed_data(self):
+        """Returns the domain in the layout of EIP-712 typed data."""
+
+        return {
+            "name": self.name,
+            "version": self.version,
+            "chainId": self.chain_id,
+            "verifyingContract": self.verifying_contract,
+        }
+
+
+@dataclass(frozen=True)
+class Permit:
+    """A signed permit, and the allowance it grants."""
+
+    owner: str
+    spender: str
+    value: int
+    nonce: int
+    deadline: int
+    v: int
+    r: bytes
+    s: bytes
+
+    def execution_args(self, txn_index):
+        """Returns the arguments of `executeTokenTransferFromWithPermit()`."""
+
+        return (txn_index, self.deadline, self.v, self.r, self.s)
+
+
+def permit_typed_data(domain, owner, spender, value, nonce, deadline):
+    """Returns the EIP-712 typed data an allowance provider signs for a permit."""
+
+    return {
+        "types": PERMIT_TYPES,
+        "primaryType": "Permit",
+        "domain": domain.as_typed_data(),
+        "message": {
+            "owner": owner,
+            "spender": spender,
+            "value": value,
+            "nonce": nonce,
+            "deadline": deadline,
+        },
+    }
+
+
+def sign_permit(private_key, domain, spender, value, nonce, deadline):
+    """
+    Signs a permit with the allowance provider's key.
+
+    :param private_key: The allowance provider's private key.
+    :param domain: The token's `PermitDomain`.
+    :param spender: The wallet that will spend the allowance.
+    :param value: The allowance, which must cover the transaction's amount.
+    :param nonce: The provider's current permit nonce on the token.
+    :param deadline: The timestamp after which the permit can no longer be used.
+    :return: The `Permit`.
+    """
+
+    # signing is the slowest import, so it is only paid for when signing
+    # pylint: disable=import-outside-toplevel
+    from eth_account import Account
+    from eth_account.messages import encode_typed_data
+
+    owner = Account.from_key(private_key).address
+    message = encode_typed_data(
+        full_message=permit_typed_data(domain, owner, spender, value, nonce, deadline)
+    )
+    signed = Account.sign_message(message, private_key)
+    return Permit(
+        owner=owner,
+        spender=spender,
+        value=value,
+        nonce=nonce,
+        deadline=deadline,
+        v=signed.v,
+        r=signed.r.to_bytes(32, "big"),
+        s=signed.s.to_bytes(32, "big"),
+    )
+
+
+def permit_for_txn(rpc, private_key, wallet_address, txn_index, deadline, version="1"):
+    """
+    Signs a permit for exactly the amount of one of a wallet's token
+    transfer from transactions, with the domain and nonce read from
+    the token.
+
+    :param private_key: The private key of the transaction's allowance provider.
+    :param wallet_address: The wallet the transaction was issued in.
+    :param txn_index: The index of the token transaction.
+    :param deadline: The timestamp after which the permit can no longer be used.
+    :param version: The token's domain version, for tokens without `eip712Domain()`.
+    :raises ValueError: If the key is not the allowance provider's, or the token's domain cannot be matched.
+    :return: The `Permit`.
+    """
+
+    _, _, amount, allowance_provider, token_address, _ = wallet_at(
+        rpc, wallet_address
+    ).call("getTxn", 1, txn_index)
+    nonce = token_at(rpc, token_address).call("nonces", allowance_provider)
+    permit = sign_permit(
+        private_key,
+        PermitDomain.fetch(rpc, token_address, version),
+        wallet_address,
+        amount,
+        nonce,
+        deadline,
+    )
+    if permit.owner.lower() != allowance_provider.lower():
+        raise ValueError(
+            f"Token txn {txn_index} spends the allowance of {allowance_provider}, "
+            f"not of {permit.owner}"
+        )
+    return permit
@@ -0,0 +1,507 @@
+"""
+Opcode and source line gas profiles of wallet transactions.
+
+Transactions are replayed with `debug_traceTransaction`, and the gas
+of every executed opcode is attributed, through the compiler's source
+maps, to the source line and function it was generated from. The gas
+a CALL forwards is charged to the callee, so an external `balanceOf`
+or `ownerOf` check shows up under the token or NFT contract instead of
+the wallet line that made the call. Profiles are printed as tables,
+and exported as folded stacks that flamegraph tools can render.
+"""
+
+import bisect
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from evm_trace import create_trace_frames
+
+# PUSH1 to PUSH32 carry 1 to 32 bytes of immediate data
+PUSH1, PUSH32 = 0x60, 0x7F
+CREATE_OPCODES = {"CREATE", "CREATE2"}
+# gas that no source line can be blamed for
+GENERATED = "<compiler generated>"
+UNKNOWN_CODE = "<unknown code>"
+# opcode traces without the storage and memory snapshots, which a profile does not use
+TRACE_OPTIONS = {"disableStorage": True, "enableMemory": False}
+# the compiler output a profile needs, on top of the caller's settings
+OUTPUT_SELECTION = {
+    "": ["ast"],
+    "*": [
+        "evm.bytecode.object",
+        "evm.bytecode.sourceMap",
+        "evm.deployedBytecode.object",
+        "evm.deployedBytecode.sourceMap",
+        "evm.deployedBytecode.immutableReferences",
+    ],
+}
+
+
+@dataclass(frozen=True)
+class SourceMapEntry:
+    """The source range and jump type of one instruction."""
+
+    start: int
+    length: int
+    file_index: int
+    # "i" jumps into a function, "o" returns from one, "-" is a regular jump
+    jump: str
+
+
+def decode_source_map(source_map):
+    """
+    Decodes a compressed solc source map into one `SourceMapEntry`
+    per instruction. Empty fields repeat the previous instruction's.
+    """
+
+    entries = []
+    current = [0, 0, -1, "-"]
+    for item in source_map.split(";") if source_map else ():
+        for position, value in enumerate(item.split(":")[:4]):
+            if value:
+                current[position] = value if position == 3 else int(value)
+        entries.append(SourceMapEntry(*current))
+    return entries
+
+
+def instruction_indexes(bytecode):
+    """
+    Maps the program counter of every instruction in the bytecode to
+    its instruction index, which is what source maps are indexed by.
+    """
+
+    indexes = {}
+    pc = 0
+    while pc < len(bytecode):
+        indexes[pc] = len(indexes)
+        opcode = bytecode[pc]
+        pc += 1 + (opcode - PUSH1 + 1 if PUSH1 <= opcode <= PUSH32 else 0)
+    return indexes
+
+
+class SourceFile:
+    """
+    A compiled source file, with the functions and modifiers of its
+    contracts. Source map offsets are byte offsets into its text.
+    """
+
+    def __init__(self, path, text, ast=None):
+        self.path = path
+        self.name = Path(path).name
+        self.text = text.encode()
+        self.line_starts = [0] + [
+            offset + 1 for offset, byte in enumerate(self.text) if byte == ord("\n")
+        ]
+        # (start, end, qualified name) of every function and modifier
+        self.functions = sorted(_functions_in(ast) if ast else ())
+        self._function_at = {}
+
+    def line_of(self, offset):
+        """Returns the 1-based line number of a byte offset."""
+
+        return bisect.bisect_right(self.line_starts, offset)
+
+    def line_text(self, line):
+        """Returns the text of a line, without surrounding whitespace."""
+
+        start = self.line_starts[line - 1]
+        end = self.line_starts[line] if line < len(self.line_starts) else None
+        return self.text[start:end].decode(errors="replace").strip()
+
+    def function_at(self, offset):
+        """
+        Returns the qualified name of the innermost function or
+        modifier containing a byte offset, or None if there is none
+        """
+
+        if offset not in self._function_at:
+            innermost = None
+            for start, end, name in self.functions:
+                if start > offset:
+                    break
+                if offset < end:
+                    innermost = name
+            self._function_at[offset] = innermost
+        return self._function_at[offset]
+
+
+def _functions_in(ast):
+    for contract in ast.get("nodes", ()):
+        if contract.get("nodeType") != "ContractDefinition":
+            continue
+        for node in contract.get("nodes", ()):
+            if node.get("nodeType") not in ("FunctionDefinition", "ModifierDefinition"):
+                continue
+            # constructors, receive, and fallback have no name
+            name = node.get("name") or node.get("kind")
+            start, length = (int(part) for part in node["src"].split(":")[:2])
+            yield start, start + length, f"{contract['name']}.{name}"
+
+
+class CodeMap:
+    """Resolves program counters of one bytecode to source map entries."""
+
+    def __init__(self, bytecode, source_map):
+        self.bytecode = bytes.fromhex(bytecode.removeprefix("0x"))
+        self.entries = decode_source_map(source_map)
+        self.indexes = instruction_indexes(self.bytecode)
+
+    def entry(self, pc):
+        """Returns the source map entry of a program counter, if any."""
+
+        index = self.indexes.get(pc)
+        if index is None or index >= len(self.entries):
+            return None
+        return self.entries[index]
+
+
+@dataclass
+class CompiledContract:
+    """The creation and runtime code of a contract, with their source maps."""
+
+    name: str
+    creation: CodeMap
+    runtime: CodeMap
+    # (offset, length) of the immutables written into the runtime code at deployment
+    immutables: list = field(default_factory=list)
+
+    def matches(self, code):
+        """Checks whether deployed runtime code was compiled from this contract."""
+
+        expected = self.runtime.bytecode
+        if len(code) != len(expected):
+            return False
+        code, expected = bytearray(code), bytearray(expected)
+        for offset, length in self.immutables:
+            code[offset : offset + length] = expected[offset : offset + length]
+        return code == expected
+
+
+class Compilation:
+    """
+    The contracts and sources of one solc standard JSON compilation,
+    compiled with at least the `OUTPUT_SELECTION` outputs.
+
+    :param output: The solc standard JSON output.
+    :param read_source: A callable returning the text of a source, given its source unit name.
+    """
+
+    def __init__(self, output, read_source):
+        self.sources = {
+            source["id"]: SourceFile(path, read_source(path), source.get("ast"))
+            for path, source in output["sources"].items()
+        }
+        self.contracts = {}
+        for contracts in output["contracts"].values():
+            for name, contract in contracts.items():
+                evm = contract["evm"]
+                if not evm["deployedBytecode"]["object"]:
+                    # interfaces and abstract contracts have no code
+                    continue
+                self.contracts[name] = CompiledContract(
+                    name=name,
+                    creation=CodeMap(
+                        evm["bytecode"]["object"], evm["bytecode"]["sourceMap"]
+                    ),
+                    runtime=CodeMap(
+                        evm["deployedBytecode"]["object"],
+                        evm["deployedBytecode"]["sourceMap"],
+                    ),
+                    immutables=[
+                        (reference["start"], reference["length"])
+                        for references in evm["deployedBytecode"]
+                        .get("immutableReferences", {})
+                        .values()
+                        for reference in references
+                    ],
+                )
+
+
+def compile_ape_project():
+    """
+    Compiles the Solidity sources of the ape project with the settings
+    ape deploys them with, and returns the `Compilation`.
+    """
+
+    # only the profiling tools need ape and its Solidity plugin
+    from ape import compilers, project  # pylint: disable=import-outside-toplevel
+
+    paths = [path for path in project.source_paths if path.suffix == ".sol"]
+    standard_inputs = compilers.registered_compilers[".sol"].get_standard_input_json(
+        paths, base_path=project.contracts_folder
+    )
+    # every contract pins the same compiler version
+    ((solc_version, standard_input),) = standard_inputs.items()
+    return compile_contracts(standard_input, solc_version, project.contracts_folder)
+
+
+def compile_contracts(standard_input, solc_version, base_path):
+    """
+    Compiles a solc standard JSON input with the outputs a profile
+    needs, and returns the `Compilation`. Needs `py-solc-x`.
+
+    :param standard_input: The standard JSON input the contracts are normally compiled with, so the bytecode matches the deployed code.
+    :param solc_version: The solc version to compile with.
+    :param base_path: The directory source unit names are relative to.
+    """
+
+    # only the profiling tools need the compiler
+    import solcx  # pylint: disable=import-outside-toplevel
+
+    base_path = Path(base_path)
+    settings = {**standard_input.get("settings", {})}
+    settings["outputSelection"] = {"*": OUTPUT_SELECTION}
+    output = solcx.compile_standard(
+        {**standard_input, "settings": settings},
+        solc_version=solc_version,
+        base_path=base_path,
+        allow_paths=[base_path],
+    )
+
+    def read_source(path):
+        source = standard_input["sources"].get(path, {})
+        if "content" in source:
+            return source["content"]
+        return (base_path / path).read_text(encoding="utf-8")
+
+    return Compilation(output, read_source)
+
+
+def fetch_struct_logs(rpc, txn_hash):
+    """
+    Replays a transaction with `debug_traceTransaction` and returns
+    its opcode trace.
+
+    :param rpc: A transport with a `request(method, params)` method, such as `multi_sig_wallet.rpc.HttpRpc`.
+    """
+
+    return rpc.request("debug_traceTransaction", [txn_hash, TRACE_OPTIONS])[
+        "structLogs"
+    ]
+
+
+class ContractResolver:
+    """
+    Finds the compiled contract behind an address by comparing its
+    deployed code with the compilation, so contracts deployed by a
+    factory are recognized too.
+
+    :param compilation: The `Compilation` of the deployed contracts.
+    :param get_code: A callable returning the runtime code at an address, as bytes.
+    """
+
+    def __init__(self, compilation, get_code):
+        self.compilation = compilation
+        self.get_code = get_code
+        self._contracts = {}
+
+    def register(self, address, contract_name):
+        """Pins an address to a compiled contract, skipping the code lookup."""
+
+        self._contracts[address.lower()] = self.compilation.contracts[contract_name]
+
+    def __call__(self, address):
+        address = address.lower()
+        if address not in self._contracts:
+            code = bytes(self.get_code(address))
+            self._contracts[address] = next(
+                (
+                    contract
+                    for contract in self.compilation.contracts.values()
+                    if contract.matches(code)
+                ),
+                None,
+            )
+        return self._contracts[address]
+
+
+@dataclass(frozen=True)
+class _Location:
+    """Where an opcode came from: the line and function to charge, and its jump type."""
+
+    # (source id, line number), or a placeholder pair when there is no source
+    line: tuple
+    function: str
+    jump: str = "-"
+
+
+@dataclass
+class _Context:
+    """An executing call frame: the code it runs, and its function stack."""
+
+    address: str
+    contract: CompiledContract
+    creation: bool
+    functions: list = field(default_factory=list)
+    entering_function: bool = False
+    # the gas used by the frame, including its subcalls
+    gas_used: int = 0
+    # the remaining gas, opcode, and location of the CALL or CREATE that opened the frame
+    gas_at_call: int = 0
+    call_op: str = None
+    call_location: _Location = None
+
+
+class GasProfile:
+    """
+    Gas attributed to source lines, functions, opcodes, and stacks,
+    accumulated over any number of traced transactions.
+
+    :param compilation: The `Compilation` the traced contracts were compiled from.
+    :param resolve: A callable returning the `CompiledContract` at an address, or None, such as a `ContractResolver`.
+    """
+
+    def __init__(self, compilation, resolve):
+        self.compilation = compilation
+        self.resolve = resolve
+        self.lines = Counter()
+        self.functions = Counter()
+        self.opcodes = Counter()
+        self.stacks = Counter()
+        self.execution_gas = 0
+        self.transactions = 0
+
+    def add_trace(self, struct_logs, address, creation=False):
+        """
+        Adds the opcodes of one transaction's trace to the profile.
+
+        :param struct_logs: The `structLogs` of a `debug_traceTransaction` response.
+        :param address: The address the transaction was sent to, or the address of the contract it deployed.
+        :param creation: Whether the transaction deployed a contract.
+        :return: The execution gas of the transaction, which excludes the intrinsic gas and refunds.
+        """
+
+        frames = list(create_trace_frames(struct_logs))
+        contexts = [self._context(address, creation)]
+
+        for index, frame in enumerate(frames):
+            next_frame = frames[index + 1] if index + 1 < len(frames) else None
+            location = self._locate(contexts[-1], frame.pc)
+
+            if next_frame is not None and next_frame.depth > frame.depth:
+                # the CALL or CREATE is charged once the callee returns
+                callee = self._context(
+                    frame.address.hex() if frame.address else None,
+                    frame.op in CREATE_OPCODES,
+                )
+                callee.gas_at_call = frame.gas
+                callee.call_op = frame.op
+                callee.call_location = location
+                contexts.append(callee)
+                continue
+
+            if next_frame is not None and next_frame.depth == frame.depth:
+                cost = frame.gas - next_frame.gas
+            else:
+                # the last opcode of a frame, such as STOP, RETURN, or REVERT
+                cost = frame.gas_cost
+            self._charge(contexts, frame.op, location, cost)
+
+            if next_frame is not None and next_frame.depth < frame.depth:
+                callee = contexts.pop()
+                # what the CALL cost on its own, without the callee's execution
+                call_cost = callee.gas_at_call - next_frame.gas - callee.gas_used
+                self._charge(contexts, callee.call_op, callee.call_location, call_cost)
+                contexts[-1].gas_used += callee.gas_used
+
+        execution_gas = contexts[0].gas_used
+        self.execution_gas += execution_gas
+        self.transactions += 1
+        return execution_gas
+
+    def line_rows(self, top=None):
+        """
+        Returns `(gas, share, location, source)` rows for the most
+        expensive source lines, where `share` is a fraction of the
+        execution gas
+        """
+
+        rows = []
+        for (source_id, line), gas in self.lines.most_common(top):
+            source = self.compilation.sources.get(source_id)
+            if source is None:
+                rows.append((gas, self._share(gas), f"{source_id} {line}", ""))
+            else:
+                rows.append(
+                    (
+                        gas,
+                        self._share(gas),
+                        f"{source.name}:{line}",
+                        source.line_text(line),
+                    )
+                )
+        return rows
+
+    def function_rows(self, top=None):
+        """Returns `(gas, share, function)` rows, most expensive first."""
+
+        return [
+            (gas, self._share(gas), name)
+            for name, gas in self.functions.most_common(top)
+        ]
+
+    def opcode_rows(self, top=None):
+        """Returns `(gas, share, opcode)` rows, most expensive first."""
+
+        return [
+            (gas, self._share(gas), op) for op, gas in self.opcodes.most_common(top)
+        ]
+
+    def folded_stacks(self):
+        """
+        Returns the profile as folded stacks, one `frame;frame;... gas`
+        line per stack, the input format of flamegraph tools
+        """
+
+        return "".join(
+            f"{stack} {gas}\n" for stack, gas in sorted(self.stacks.items()) if gas > 0
+        )
+
+    def _share(self, gas):
+        return gas / self.execution_gas if self.execution_gas else 0.0
+
+    def _context(self, address, creation):
+        # a CREATE that fails has no address
+        contract = self.resolve(address) if address else None
+        return _Context(address=address, contract=contract, creation=creation)
+
+    def _locate(self, context, pc):
+        if context.contract is None:
+            label = context.address or "<failed creation>"
+            return _Location((UNKNOWN_CODE, label), label)
+
+        contract = context.contract
+        code = contract.creation if context.creation else contract.runtime
+        entry = code.entry(pc)
+        source = self.compilation.sources.get(entry.file_index) if entry else None
+        if source is None:
+            return _Location((GENERATED, contract.name), contract.name)
+
+        function = source.function_at(entry.start) or contract.name
+        return _Location(
+            (entry.file_index, source.line_of(entry.start)), function, entry.jump
+        )
+
+    def _charge(self, contexts, op, location, cost):
+        context = contexts[-1]
+        functions = context.functions
+        if context.entering_function or not functions:
+            functions.append(location.function)
+        elif functions[-1] != location.function:
+            # dispatching to an external function, or running inlined modifier code
+            functions[-1] = location.function
+        context.entering_function = False
+
+        context.gas_used += cost
+        self.lines[location.line] += cost
+        self.functions[location.function] += cost
+        self.opcodes[op] += cost
+        stack = ";".join(name for each in contexts for name in each.functions)
+        self.stacks[stack] += cost
+
+        # internal function calls and returns are jumps the source map marks
+        if op == "JUMP" and location.jump == "i":
+            context.entering_function = True
+        elif op == "JUMP" and location.jump == "o" and len(functions) > 1:
+            functions.pop()
@@ -0,0 +1,167 @@
+"""
+Rebuilds wallet transaction queues from event logs alone.
+
+`TxnIssued` carries the whole transaction request and `TxnApproved`
+the running approval tally, so an indexer never has to follow an
+event with an `eth_call`, and history can be replayed from the logs
+of a pruned node. The queues are checked as they are rebuilt: a
+transaction index that skips ahead, or a tally that disagrees with
+the approvals seen, means logs are missing.
+"""
+
+from dataclasses import dataclass, field
+
+from multi_sig_wallet.contracts import WALLET_EVENTS, ContractAbi
+from multi_sig_wallet.model import Txn, TxnAction, TxnType
+
+
+class ReconstructionError(Exception):
+    """Raised when the logs of a wallet are incomplete or out of order."""
+
+
+@dataclass
+class WalletQueue:
+    """The transactions of one wallet, rebuilt from its events."""
+
+    address: str
+    txns: dict = field(default_factory=lambda: {txn_type: [] for txn_type in TxnType})
+    # (txn type, txn index) --> owners who approved
+    approvers: dict = field(default_factory=dict)
+    # not carried by the events, filled in by whoever knows the wallet's setup
+    owners: list = field(default_factory=list)
+    required_approvals: int = 0
+    # (block number, log index) of the last event applied
+    position: tuple = (-1, -1)
+
+    def apply(self, name, args, position=None):
+        """
+        Applies one decoded wallet event. Events must be applied in
+        chain order, and positions at or before the last one applied
+        are ignored, so overlapping log ranges can be replayed.
+
+        :param name: The event name.
+        :param args: The event arguments, as returned by `ContractAbi.decode_log()`.
+        :param position: The (block number, log index) of the event.
+        """
+
+        if position is not None:
+            if position <= self.position:
+                return
+            self.position = position
+
+        txn_type = TxnType(args["txnType"])
+        txn_index = args["txnIndex"]
+        if name == "TxnIssued":
+            self._issue(txn_type, txn_index, args)
+            return
+
+        txn = self._txn(txn_type, txn_index, name)
+        if name == "TxnApproved":
+            approvers = self.approvers.setdefault((txn_type, txn_index), set())
+            approvers.add(args["by"])
+            if args["approvals"] != len(approvers):
+                raise ReconstructionError(
+                    f"{self.address}: {txn_type.name} txn {txn_index} has "
+                    f"{args['approvals']} approvals on chain, {len(approvers)} in the logs"
+                )
+            txn.approvals = args["approvals"]
+        elif name == "TxnExecuted":
+            txn.executed = True
+
+    def get_txn_count(self, txn_type):
+        """Returns the number of transactions of the given type."""
+
+        return len(self.txns[txn_type])
+
+    def get_txn_details(self, txn_type, txn_index):
+        """
+        Returns a transaction in the same layout as the lens's
+        get*TxnDetails() view functions
+        """
+
+        return self.txns[txn_type][txn_index].as_view(txn_type)
+
+    def pending(self):
+        """Returns the (txn type, txn index, txn) of every unexecuted transaction."""
+
+        return [
+            (txn_type, txn_index, txn)
+            for txn_type, txns in self.txns.items()
+            for txn_index, txn in enumerate(txns)
+            if not txn.executed
+        ]
+
+    def _issue(self, txn_type, txn_index, args):
+        txns = self.txns[txn_type]
+        if txn_index != len(txns):
+            raise ReconstructionError(
+                f"{self.address}: {txn_type.name} txn {txn_index} issued, "
+                f"expected txn {len(txns)}"
+            )
+        txns.append(
+            Txn(
+                action=TxnAction(args["action"]),
+                to=args["to"],
+                amount=args["amountOrTokenId"],
+                allowance_provider=args["allowanceProvider"],
+                asset=args["assetAddress"],
+            )
+        )
+
+    def _txn(self, txn_type, txn_index, name):
+        if txn_index >= len(self.txns[txn_type]):
+            raise ReconstructionError(
+                f"{self.address}: {name} for {txn_type.name} txn {txn_index}, "
+                "which was never issued"
+            )
+        return self.txns[txn_type][txn_index]
+
+
+def reconstruct(logs, queues=None):
+    """
+    Rebuilds the queue of every wallet that emitted one of the logs.
+
+    :param logs: JSON-RPC logs, in any order. Logs removed by a reorg, and logs that are not wallet events, are skipped.
+    :param queues: Queues rebuilt earlier, keyed by lowercase wallet address, to extend with newer logs.
+    :return: The queues, keyed by lowercase wallet address.
+    """
+
+    abi = ContractAbi.named("MultiSigWallet")
+    queues = {} if queues is None else queues
+    ordered = sorted(
+        (log for log in logs if not log.get("removed")),
+        key=lambda log: (int(log["blockNumber"], 16), int(log["logIndex"], 16)),
+    )
+    for log in ordered:
+        decoded = abi.decode_log(log)
+        if decoded is None or decoded[0] not in WALLET_EVENTS:
+            continue
+        address = log["address"].lower()
+        queue = queues.setdefault(address, WalletQueue(address))
+        queue.apply(
+            *decoded,
+            position=(int(log["blockNumber"], 16), int(log["logIndex"], 16)),
+        )
+    return queues
+
+
+def fetch_wallet_logs(rpc, wallets, from_block=0, to_block="latest"):
+    """
+    Fetches the wallet events of the given wallets with eth_getLogs.
+
+    :param rpc: A transport with a `request(method, params)` method, such as `multi_sig_wallet.rpc.HttpRpc`.
+    """
+
+    abi = ContractAbi.named("MultiSigWallet")
+    topics = ["0x" + abi.event_topic(name).hex() for name in WALLET_EVENTS]
+    return rpc.request(
+        "eth_getLogs",
+        [
+            {
+                "address": list(wallets),
+                "topics": [topics],
+                "fromBlock": hex(from_block),
+                "toBlock": to_block if isinstance(to_block, str) else hex(to_block),
+            }
+        ],
+    )
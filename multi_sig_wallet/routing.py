@@ -0,0 +1,254 @@
+"""
+JSON-RPC routing over several endpoints of the same chain.
+
+Every endpoint has a health score built from its smoothed latency and
+error rate. Reads go to the healthiest endpoint, and when one takes
+longer than the latency budget a hedged duplicate is sent to the next
+endpoint, and the first answer wins. Endpoints that fail are benched
+for a cooldown that grows with each consecutive failure. Writes, and
+the nonce lookups that precede them, stay pinned to one endpoint per
+account so that nonces reach the mempool in order.
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, replace
+
+from multi_sig_wallet.rpc import HttpRpc, RpcError
+
+WRITE_METHODS = {"eth_sendRawTransaction", "eth_sendTransaction"}
+# answered from state kept by one node, so they must not move between endpoints
+STICKY_METHODS = {
+    "eth_newFilter",
+    "eth_newBlockFilter",
+    "eth_newPendingTransactionFilter",
+    "eth_getFilterChanges",
+    "eth_getFilterLogs",
+    "eth_uninstallFilter",
+}
+# failures of the endpoint itself, as opposed to errors the node answers with
+TRANSPORT_ERRORS = (OSError, ValueError)
+# how much a fully failing endpoint's score is inflated over its latency
+ERROR_PENALTY = 10
+
+
+@dataclass
+class EndpointHealth:
+    """The latency and reliability record of one endpoint."""
+
+    url: str
+    # smoothed seconds per request, None until the first answer
+    latency: float = None
+    # smoothed fraction of requests that failed
+    error_rate: float = 0.0
+    consecutive_failures: int = 0
+    # monotonic time until which the endpoint is benched
+    down_until: float = 0.0
+    requests: int = 0
+    failures: int = 0
+
+    def score(self):
+        """Lower is healthier. Endpoints that were never tried score 0, so they get probed."""
+
+        return (self.latency or 0.0) * (1 + ERROR_PENALTY * self.error_rate)
+
+    def is_down(self, now):
+        """Checks whether the endpoint is benched at the given monotonic time."""
+
+        return now < self.down_until
+
+    def record_success(self, seconds, smoothing):
+        """Folds a successful request into the record."""
+
+        self.requests += 1
+        self.consecutive_failures = 0
+        self.down_until = 0.0
+        self.error_rate *= 1 - smoothing
+        if self.latency is None:
+            self.latency = seconds
+        else:
+            self.latency += smoothing * (seconds - self.latency)
+
+    def record_failure(self, now, smoothing, cooldown, max_cooldown):
+        """Folds a failed request into the record, and benches the endpoint."""
+
+        self.requests += 1
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.error_rate += smoothing * (1 - self.error_rate)
+        self.down_until = now + min(
+            cooldown * 2 ** (self.consecutive_failures - 1), max_cooldown
+        )
+
+
+class RoutingRpc:
+    """
+    Routes JSON-RPC requests across endpoints that serve the same
+    chain. It has the same `request(method, params)` method as
+    `HttpRpc`, so it can be passed to any client in this package.
+
+    :param endpoints: URLs, or transports with a `request(method, params)` method.
+    :param hedge_after: The latency budget of a read, in seconds. Past it, the read is duplicated to the next endpoint.
+    :param max_hedges: The number of duplicates a read can fan out to.
+    :param timeout: Seconds to wait for each response, for endpoints given as URLs.
+    :param smoothing: The weight of the latest request in the latency and error averages.
+    :param cooldown: Seconds an endpoint is benched after a failure. The bench doubles with each consecutive failure.
+    :param max_cooldown: The upper bound of the bench.
+    """
+
+    def __init__(
+        self,
+        endpoints,
+        hedge_after=0.25,
+        max_hedges=1,
+        timeout=10,
+        smoothing=0.2,
+        cooldown=1.0,
+        max_cooldown=30.0,
+    ):
+        if not endpoints:
+            raise ValueError("At least one endpoint is needed")
+
+        self.transports = [
+            HttpRpc(endpoint, timeout) if isinstance(endpoint, str) else endpoint
+            for endpoint in endpoints
+        ]
+        self.health = [
+            EndpointHealth(getattr(transport, "url", repr(transport)))
+            for transport in self.transports
+        ]
+        self.hedge_after = hedge_after
+        self.max_hedges = max_hedges
+        self.smoothing = smoothing
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.hedges = 0
+        # pin key --> endpoint index
+        self._pins = {}
+        self._lock = threading.Lock()
+        # hedged requests that lose keep running, so each endpoint gets its own threads
+        self._pool = ThreadPoolExecutor(max_workers=4 * len(self.transports))
+
+    def request(self, method, params=()):
+        """Sends a request to the endpoint best suited for it, and returns its result."""
+
+        params = list(params)
+        if method in WRITE_METHODS or method == "eth_getTransactionCount":
+            return self._pinned(_account_of(method, params), method, params)
+        if method in STICKY_METHODS:
+            return self._pinned("filters", method, params)
+        return self._hedged(method, params)
+
+    def ranked(self):
+        """Returns the endpoint indexes, healthiest first, with benched endpoints last."""
+
+        now = time.monotonic()
+        with self._lock:
+            return sorted(
+                range(len(self.transports)),
+                key=lambda index: (
+                    self.health[index].is_down(now),
+                    self.health[index].score(),
+                ),
+            )
+
+    def stats(self):
+        """Returns a snapshot of the health of every endpoint."""
+
+        with self._lock:
+            return [replace(health) for health in self.health]
+
+    def close(self):
+        """Stops the threads of requests still in flight."""
+
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _pinned(self, key, method, params):
+        ranked = self.ranked()
+        with self._lock:
+            pinned = self._pins.get(key)
+            if pinned is not None and not self.health[pinned].is_down(time.monotonic()):
+                ranked.remove(pinned)
+                ranked.insert(0, pinned)
+
+        error = None
+        for index in ranked:
+            with self._lock:
+                self._pins[key] = index
+            try:
+                return self._send(index, method, params)
+            except TRANSPORT_ERRORS as transport_error:
+                # a resent raw transaction has the same hash, so it cannot apply twice
+                error = transport_error
+        raise error
+
+    def _hedged(self, method, params):
+        ranked = iter(self.ranked())
+        in_flight = {self._pool.submit(self._send, next(ranked), method, params)}
+        hedges = 0
+        error = None
+
+        while in_flight:
+            can_hedge = hedges < self.max_hedges
+            done, in_flight = wait(
+                in_flight,
+                timeout=self.hedge_after if can_hedge else None,
+                return_when=FIRST_COMPLETED,
+            )
+            if not done:
+                index = next(ranked, None)
+                if index is None:
+                    hedges = self.max_hedges
+                    continue
+                hedges += 1
+                with self._lock:
+                    self.hedges += 1
+                in_flight.add(self._pool.submit(self._send, index, method, params))
+                continue
+
+            for future in done:
+                try:
+                    # errors the node answers with are final, like results
+                    return future.result()
+                except TRANSPORT_ERRORS as transport_error:
+                    error = transport_error
+                # fail over to the next endpoint, without waiting for the budget
+                index = next(ranked, None)
+                if index is not None:
+                    in_flight.add(self._pool.submit(self._send, index, method, params))
+        raise error
+
+    def _send(self, index, method, params):
+        started = time.monotonic()
+        try:
+            result = self.transports[index].request(method, params)
+        except RpcError:
+            self._record_success(index, time.monotonic() - started)
+            raise
+        except TRANSPORT_ERRORS:
+            with self._lock:
+                self.health[index].record_failure(
+                    time.monotonic(), self.smoothing, self.cooldown, self.max_cooldown
+                )
+            raise
+        self._record_success(index, time.monotonic() - started)
+        return result
+
+    def _record_success(self, index, seconds):
+        with self._lock:
+            self.health[index].record_success(seconds, self.smoothing)
+
+
+def _account_of(method, params):
+    """Returns the account a write or nonce lookup is made for, in lowercase."""
+
+    if method == "eth_getTransactionCount":
+        return params[0].lower()
+    if method == "eth_sendTransaction":
+        return params[0]["from"].lower()
+
+    # the sender of a signed transaction is only known from its signature
+    from eth_account import Account  # pylint: disable=import-outside-toplevel
+
+    return Account.recover_transaction(params[0]).lower()
@@ -0,0 +1,92 @@
+"""
+A minimal JSON-RPC transport. It only depends on the standard
+library, so tools that talk to a node through it start up without
+loading web3 or ape.
+"""
+
+import itertools
+import json
+import threading
+import time
+import urllib.request
+
+
+class RpcError(Exception):
+    """
+    Raised when the node answers a request with an error. Reverts
+    carry the revert data in `data`
+    """
+
+    def __init__(self, code, message, data=None):
+        super().__init__(f"{message} (code {code})")
+        self.code = code
+        self.message = message
+        self.data = data
+
+
+class HttpRpc:
+    """
+    Sends JSON-RPC requests to a node over HTTP.
+
+    :param url: The node's HTTP endpoint.
+    :param timeout: Seconds to wait for each response.
+    """
+
+    def __init__(self, url, timeout=10):
+        self.url = url
+        self.timeout = timeout
+        self._ids = itertools.count(1)
+
+    def request(self, method, params=()):
+        """Sends a request and returns its result."""
+
+        body = json.dumps(
+            {
+                "jsonrpc": "2.0",
+                "id": next(self._ids),
+                "method": method,
+                "params": list(params),
+            }
+        ).encode()
+        http_request = urllib.request.Request(
+            self.url, data=body, headers={"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(http_request, timeout=self.timeout) as response:
+            reply = json.loads(response.read())
+
+        if "error" in reply:
+            error = reply["error"]
+            raise RpcError(error.get("code"), error.get("message"), error.get("data"))
+        return reply["result"]
+
+
+class ProviderRpc:
+    """
+    Sends JSON-RPC requests through a web3 provider, such as the one
+    of ape's active network, so that scripts can hand the connection
+    they already have to the client. It counts the requests sent per
+    method, and can add a delay to each one to stand in for a remote
+    node.
+
+    :param web3: A connected web3 instance.
+    :param latency: Seconds to wait before each request.
+    """
+
+    def __init__(self, web3, latency=0.0):
+        self.web3 = web3
+        self.latency = latency
+        self.requests = {}
+        self._lock = threading.Lock()
+
+    def request(self, method, params=()):
+        """Sends a request and returns its result."""
+
+        with self._lock:
+            self.requests[method] = self.requests.get(method, 0) + 1
+        if self.latency:
+            time.sleep(self.latency)
+        reply = self.web3.provider.make_request(method, list(params))
+        if "error" in reply:
+            error = reply["error"]
+            raise RpcError(error.get("code"), error.get("message"), error.get("data"))
+        return reply["result"]
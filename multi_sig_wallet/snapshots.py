@@ -0,0 +1,491 @@
+"""
+Memory-mapped binary snapshots of wallet state.
+
+A snapshot holds the owners, required approvals, and transaction
+queue of a fleet of wallets, tagged with the number and hash of the
+block it was taken at. Every record has a fixed width, so a snapshot
+is opened with `mmap` and read in place: wallets are found by binary
+search over the sorted wallet table, and only the records a lookup
+touches are ever paged in. After opening, the service catches up
+with the wallet events emitted since the snapshot's block, and only
+the wallets those events touch are loaded into memory.
+
+Layout, little-endian, one section after the other:
+
+- header: magic, version, wallet count, block number, block hash, owner count, transaction count, and approver bitset byte count
+- wallets, sorted by address: address, required approvals, first owner, owner count, first transaction, first approver bitset byte, and the ETH, token, and NFT transaction counts
+- owners: address
+- transactions, in ETH, token, NFT order per wallet: type, action, executed, approvals, recipient, allowance provider, asset, and amount or tokenId
+- approvers, one bitset over the wallet's owners per transaction, in transaction order. Each bitset takes a byte per 8 owners, so records stay fixed width within a wallet, for any number of owners
+"""
+
+import mmap
+import os
+import struct
+from pathlib import Path
+
+from multi_sig_wallet.model import Txn, TxnAction, TxnType
+from multi_sig_wallet.reconstruction import WalletQueue, fetch_wallet_logs, reconstruct
+
+MAGIC = b"MSWSNAP\0"
+VERSION = 2
+HEADER = struct.Struct("<8sIIQ32sIII")
+WALLET_RECORD = struct.Struct("<20s8I")
+OWNER_RECORD = struct.Struct("<20s")
+TXN_RECORD = struct.Struct("<BBBxI20s20s20s32s4x")
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot is not a valid snapshot file."""
+
+
+class StaleSnapshotError(SnapshotError):
+    """Raised when the block a snapshot was taken at is no longer on the chain."""
+
+
+def _address_bytes(address):
+    return bytes.fromhex(address.removeprefix("0x").lower())
+
+
+def _address_str(raw):
+    return "0x" + raw.hex()
+
+
+def _bitset_width(owner_count):
+    return (owner_count + 7) // 8
+
+
+def write_snapshot(path, wallets, block_number, block_hash):
+    """
+    Writes the state of the given wallets as a snapshot. The file is
+    replaced atomically, so a reader never sees a partial snapshot.
+
+    :param wallets: `WalletQueue` or `WalletView` objects.
+    :param block_number: The block the state was taken at.
+    :param block_hash: The hash of that block, as a hex string.
+    """
+
+    wallet_records, owner_records, txn_records, approver_bitsets = [], [], [], []
+    approver_bytes = 0
+    for wallet in sorted(wallets, key=lambda wallet: _address_bytes(wallet.address)):
+        queue = wallet.to_queue() if isinstance(wallet, WalletView) else wallet
+        owners = list(dict.fromkeys(owner.lower() for owner in queue.owners))
+        # only owners can approve, so approvers missing from the owners are owners too
+        for approvers in queue.approvers.values():
+            owners.extend(
+                sorted(approver.lower() for approver in approvers - set(owners))
+            )
+        owner_bits = {owner: 1 << position for position, owner in enumerate(owners)}
+        width = _bitset_width(len(owners))
+
+        wallet_records.append(
+            WALLET_RECORD.pack(
+                _address_bytes(queue.address),
+                queue.required_approvals,
+                len(owner_records),
+                len(owners),
+                len(txn_records),
+                approver_bytes,
+                *(len(queue.txns[txn_type]) for txn_type in TxnType),
+            )
+        )
+        owner_records.extend(
+            OWNER_RECORD.pack(_address_bytes(owner)) for owner in owners
+        )
+        for txn_type in TxnType:
+            for txn_index, txn in enumerate(queue.txns[txn_type]):
+                approvers = queue.approvers.get((txn_type, txn_index), ())
+                txn_records.append(
+                    TXN_RECORD.pack(
+                        txn_type,
+                        txn.action,
+                        txn.executed,
+                        txn.approvals,
+                        _address_bytes(txn.to),
+                        _address_bytes(txn.allowance_provider),
+                        _address_bytes(txn.asset),
+                        txn.amount.to_bytes(32, "big"),
+                    )
+                )
+                bits = sum(owner_bits[approver.lower()] for approver in approvers)
+                approver_bitsets.append(bits.to_bytes(width, "little"))
+                approver_bytes += width
+
+    header = HEADER.pack(
+        MAGIC,
+        VERSION,
+        len(wallet_records),
+        block_number,
+        bytes.fromhex(block_hash.removeprefix("0x")),
+        len(owner_records),
+        len(txn_records),
+        approver_bytes,
+    )
+    path = Path(path)
+    partial = path.with_name(path.name + ".partial")
+    with open(partial, "wb") as snapshot:
+        snapshot.write(header)
+        for records in (wallet_records, owner_records, txn_records, approver_bitsets):
+            snapshot.write(b"".join(records))
+        snapshot.flush()
+        os.fsync(snapshot.fileno())
+    os.replace(partial, path)
+
+
+class Snapshot:
+    """
+    A snapshot file, mapped into memory and read in place.
+
+    :param path: The snapshot file.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as snapshot:
+            try:
+                self._map = mmap.mmap(snapshot.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as error:
+                raise SnapshotError(f"{path} is empty") from error
+
+        try:
+            self._read_header(path)
+        except SnapshotError:
+            self._map.close()
+            raise
+
+    def _read_header(self, path):
+        if len(self._map) < HEADER.size:
+            raise SnapshotError(f"{path} is too short for a snapshot")
+        (
+            magic,
+            version,
+            self.wallet_count,
+            self.block_number,
+            block_hash,
+            owner_count,
+            txn_count,
+            approver_bytes,
+        ) = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            raise SnapshotError(f"{path} is not a version {VERSION} snapshot")
+        self.block_hash = "0x" + block_hash.hex()
+
+        self._owners_at = HEADER.size + self.wallet_count * WALLET_RECORD.size
+        self._txns_at = self._owners_at + owner_count * OWNER_RECORD.size
+        self._approvers_at = self._txns_at + txn_count * TXN_RECORD.size
+        if len(self._map) != self._approvers_at + approver_bytes:
+            raise SnapshotError(f"{path} is truncated")
+
+    def __len__(self):
+        return self.wallet_count
+
+    def __contains__(self, address):
+        return self.wallet(address) is not None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Unmaps the snapshot."""
+
+        self._map.close()
+
+    def addresses(self):
+        """Yields the address of every wallet, in address order."""
+
+        for position in range(self.wallet_count):
+            offset = HEADER.size + position * WALLET_RECORD.size
+            yield _address_str(self._map[offset : offset + 20])
+
+    def wallet(self, address):
+        """Returns a view of a wallet's state, or None if the snapshot does not hold it."""
+
+        wanted = _address_bytes(address)
+        low, high = 0, self.wallet_count
+        while low < high:
+            middle = (low + high) // 2
+            offset = HEADER.size + middle * WALLET_RECORD.size
+            found = self._map[offset : offset + 20]
+            if found == wanted:
+                return WalletView(
+                    self._map,
+                    offset,
+                    self._owners_at,
+                    self._txns_at,
+                    self._approvers_at,
+                )
+            if found < wanted:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+
+class WalletView:
+    """
+    The state of one wallet inside a snapshot. Every read goes to the
+    mapped file, and it has the same query methods as `WalletQueue`.
+    """
+
+    def __init__(self, snapshot_map, offset, owners_at, txns_at, approvers_at):
+        self._map = snapshot_map
+        (
+            raw_address,
+            self.required_approvals,
+            self._first_owner,
+            self._owner_count,
+            self._first_txn,
+            first_approver_byte,
+            *counts,
+        ) = WALLET_RECORD.unpack_from(snapshot_map, offset)
+        self.address = _address_str(raw_address)
+        self._counts = dict(zip(TxnType, counts))
+        self._owners_at = owners_at
+        self._txns_at = txns_at
+        self._approvers_at = approvers_at + first_approver_byte
+
+    @property
+    def owners(self):
+        """The wallet's owners, in lowercase."""
+
+        start = self._owners_at + self._first_owner * OWNER_RECORD.size
+        return [
+            _address_str(self._map[offset : offset + 20])
+            for offset in range(
+                start, start + self._owner_count * OWNER_RECORD.size, OWNER_RECORD.size
+            )
+        ]
+
+    def get_txn_count(self, txn_type):
+        """Returns the number of transactions of the given type."""
+
+        return self._counts[TxnType(txn_type)]
+
+    def get_txn(self, txn_type, txn_index):
+        """Returns a transaction and the set of owners who approved it."""
+
+        txn_type = TxnType(txn_type)
+        if not 0 <= txn_index < self._counts[txn_type]:
+            raise IndexError(f"No {txn_type.name} txn {txn_index}")
+        position = txn_index
+        for earlier in TxnType:
+            if earlier == txn_type:
+                break
+            position += self._counts[earlier]
+
+        (
+            _,
+            action,
+            executed,
+            approvals,
+            to,
+            allowance_provider,
+            asset,
+            amount,
+        ) = TXN_RECORD.unpack_from(
+            self._map, self._txns_at + (self._first_txn + position) * TXN_RECORD.size
+        )
+        width = _bitset_width(self._owner_count)
+        start = self._approvers_at + position * width
+        approver_bits = int.from_bytes(self._map[start : start + width], "little")
+        owners = self.owners if approver_bits else []
+        approvers = {
+            owner for bit, owner in enumerate(owners) if approver_bits & (1 << bit)
+        }
+        txn = Txn(
+            action=TxnAction(action),
+            to=_address_str(to),
+            amount=int.from_bytes(amount, "big"),
+            allowance_provider=_address_str(allowance_provider),
+            asset=_address_str(asset),
+            approvals=approvals,
+            executed=bool(executed),
+        )
+        return txn, approvers
+
+    def get_txn_details(self, txn_type, txn_index):
+        """
+        Returns a transaction in the same layout as the lens's
+        get*TxnDetails() view functions
+        """
+
+        return self.get_txn(txn_type, txn_index)[0].as_view(TxnType(txn_type))
+
+    def pending(self):
+        """Returns the (txn type, txn index, txn) of every unexecuted transaction."""
+
+        return [
+            (txn_type, txn_index, txn)
+            for txn_type in TxnType
+            for txn_index in range(self._counts[txn_type])
+            for txn in [self.get_txn(txn_type, txn_index)[0]]
+            if not txn.executed
+        ]
+
+    def to_queue(self):
+        """Loads the wallet into a `WalletQueue`, which new events can be applied to."""
+
+        queue = WalletQueue(
+            self.address,
+            owners=self.owners,
+            required_approvals=self.required_approvals,
+        )
+        for txn_type in TxnType:
+            for txn_index in range(self._counts[txn_type]):
+                txn, approvers = self.get_txn(txn_type, txn_index)
+                queue.txns[txn_type].append(txn)
+                if approvers:
+                    queue.approvers[(txn_type, txn_index)] = approvers
+        return queue
+
+
+class FleetState:
+    """
+    The state of a fleet of wallets: a snapshot, with the wallets
+    changed since it was taken loaded on top.
+
+    :param snapshot: The `Snapshot` to start from.
+    """
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.block_number = snapshot.block_number
+        # wallets changed since the snapshot, keyed by lowercase address
+        self.changed = {}
+
+    def addresses(self):
+        """Returns the addresses of every wallet in the fleet."""
+
+        return sorted(set(self.snapshot.addresses()) | set(self.changed))
+
+    def wallet(self, address):
+        """Returns a wallet's `WalletQueue` or `WalletView`, or None if it is not in the fleet."""
+
+        address = address.lower()
+        return self.changed.get(address) or self.snapshot.wallet(address)
+
+    def catch_up(self, rpc, to_block=None, wallets=None):
+        """
+        Applies the wallet events emitted since the state's block.
+        Wallets that joined the fleet after the snapshot was taken are
+        rebuilt from scratch up to the same block.
+
+        :param rpc: A transport with a `request(method, params)` method, such as `multi_sig_wallet.rpc.HttpRpc`.
+        :param to_block: The block to catch up to. Defaults to the latest block.
+        :param wallets: The owners of every wallet in the fleet, keyed by wallet address. Defaults to the wallets already in the state.
+        :raises StaleSnapshotError: If the snapshot's block was reorganized away.
+        :return: The number of events applied, not counting the events of rebuilt wallets.
+        """
+
+        snapshot_block = rpc.request(
+            "eth_getBlockByNumber", [hex(self.snapshot.block_number), False]
+        )
+        if snapshot_block is None or snapshot_block["hash"] != self.snapshot.block_hash:
+            raise StaleSnapshotError(
+                f"Block {self.snapshot.block_number} is no longer the snapshot's block"
+            )
+        if to_block is None:
+            to_block = int(rpc.request("eth_blockNumber"), 16)
+        to_block = max(to_block, self.block_number)
+        # rebuilt up to the catch-up block, as they may be younger than the state's block
+        joined = {
+            address: owners
+            for address, owners in (wallets or {}).items()
+            if self.wallet(address) is None
+        }
+
+        logs = []
+        if to_block > self.block_number:
+            logs = fetch_wallet_logs(
+                rpc,
+                self.addresses(),
+                from_block=self.block_number + 1,
+                to_block=to_block,
+            )
+        for address in {log["address"].lower() for log in logs}:
+            if address not in self.changed:
+                view = self.snapshot.wallet(address)
+                self.changed[address] = (
+                    view.to_queue() if view is not None else WalletQueue(address)
+                )
+        reconstruct(logs, self.changed)
+        if joined:
+            self.changed.update(rebuild(rpc, joined, to_block=to_block)[0])
+        self.block_number = to_block
+        return len(logs)
+
+    def save(self, path, rpc):
+        """
+        Writes the current state as a new snapshot, tagged with the
+        state's block.
+
+        :param rpc: A transport to look the block's hash up with.
+        """
+
+        block = rpc.request("eth_getBlockByNumber", [hex(self.block_number), False])
+        write_snapshot(
+            path,
+            [self.wallet(address) for address in self.addresses()],
+            self.block_number,
+            block["hash"],
+        )
+
+
+def rebuild(rpc, wallets, to_block=None):
+    """
+    Rebuilds the state of a fleet from scratch, from all of its
+    wallet events and one required approvals call per wallet.
+
+    :param rpc: A transport with a `request(method, params)` method.
+    :param wallets: The wallets' owners, keyed by wallet address.
+    :param to_block: The block to rebuild up to. Defaults to the latest block.
+    :return: The wallet queues keyed by lowercase address, and the block they were rebuilt at.
+    """
+
+    # imported here so that opening a snapshot does not load the client
+    from multi_sig_wallet.client import (  # pylint: disable=import-outside-toplevel
+        wallet_at,
+    )
+
+    if to_block is None:
+        to_block = int(rpc.request("eth_blockNumber"), 16)
+    queues = reconstruct(fetch_wallet_logs(rpc, list(wallets), to_block=to_block))
+    for address, owners in wallets.items():
+        queue = queues.setdefault(address.lower(), WalletQueue(address.lower()))
+        queue.owners = [owner.lower() for owner in owners]
+        queue.required_approvals = wallet_at(rpc, address).call(
+            "getRequiredApprovals", block=hex(to_block)
+        )
+    return queues, to_block
+
+
+def load_fleet(path, rpc, wallets):
+    """
+    Opens the fleet's snapshot and catches up from its block. When
+    there is no usable snapshot, the state is rebuilt from scratch
+    and a new snapshot is written for the next start.
+
+    :param path: The snapshot file.
+    :param rpc: A transport with a `request(method, params)` method.
+    :param wallets: The wallets' owners, keyed by wallet address. Wallets missing from the snapshot are rebuilt.
+    :return: The `FleetState`.
+    """
+
+    try:
+        snapshot = Snapshot(path)
+    except (FileNotFoundError, SnapshotError):
+        snapshot = None
+    if snapshot is not None:
+        state = FleetState(snapshot)
+        try:
+            state.catch_up(rpc, wallets=wallets)
+            return state
+        except StaleSnapshotError:
+            snapshot.close()
+
+    queues, block_number = rebuild(rpc, wallets)
+    block = rpc.request("eth_getBlockByNumber", [hex(block_number), False])
+    write_snapshot(path, queues.values(), block_number, block["hash"])
+    return FleetState(Snapshot(path))
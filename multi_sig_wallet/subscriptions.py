@@ -0,0 +1,292 @@
+"""
+Push-based notifications of wallet events over a WebSocket.
+
+An `EventSubscriber` opens an `eth_subscribe` log subscription
+filtered by wallet address and event topic, decodes every log, and
+fans the events out to callbacks and an asyncio queue. When the
+connection drops it reconnects with backoff, and fills the gap with
+`eth_getLogs` from the last block it has seen, so no event is lost or
+delivered twice. The delay between a block's timestamp and the
+arrival of its events is recorded for latency reports.
+"""
+
+import asyncio
+import inspect
+import itertools
+import json
+import statistics
+import time
+from dataclasses import dataclass
+
+import websockets
+
+from multi_sig_wallet.contracts import WALLET_EVENTS, ContractAbi
+from multi_sig_wallet.rpc import RpcError
+
+# how many block timestamps to keep around for latency measurements
+BLOCK_TIMESTAMP_CACHE_SIZE = 256
+
+
+@dataclass(frozen=True)
+class WalletEvent:
+    """A decoded wallet event, as delivered to consumers."""
+
+    name: str
+    wallet: str
+    args: dict
+    block_number: int
+    log_index: int
+    txn_hash: str
+    # set when a reorg drops a log that was delivered before
+    removed: bool
+    # seconds between the block's timestamp and the event's arrival
+    latency: float
+
+
+class EventSubscriber:
+    """
+    Subscribes to the events of a set of wallets.
+
+    :param url: The node's WebSocket endpoint.
+    :param wallets: The addresses of the wallets to follow.
+    :param event_names: The wallet events to subscribe to.
+    :param from_block: The block to backfill from on the first connection. By default only new events are delivered.
+    :param reconnect_delay: Seconds to wait before the first reconnection attempt. The delay doubles on each failed attempt.
+    :param max_reconnect_delay: The upper bound of the reconnection delay.
+    """
+
+    def __init__(
+        self,
+        url,
+        wallets,
+        event_names=WALLET_EVENTS,
+        from_block=None,
+        reconnect_delay=0.5,
+        max_reconnect_delay=30,
+    ):
+        self.url = url
+        self.wallets = list(wallets)
+        self.abi = ContractAbi.named("MultiSigWallet")
+        self.topics = ["0x" + self.abi.event_topic(name).hex() for name in event_names]
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.queue = asyncio.Queue()
+        self.connected = asyncio.Event()
+        self.latencies = []
+        self.reconnections = 0
+        self._callbacks = []
+        self._sync_block = from_block
+        # (txn hash, log index) of the delivered logs at or after the sync block
+        self._seen = {}
+        self._block_timestamps = {}
+        self._connection = None
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._subscription_id = None
+        self._logs = None
+        self._held_logs = None
+
+    def add_callback(self, callback):
+        """
+        Registers a consumer. Callbacks receive each `WalletEvent` and
+        may be plain functions or coroutines
+        """
+
+        self._callbacks.append(callback)
+
+    async def run(self):
+        """Delivers events until cancelled, reconnecting whenever the connection drops."""
+
+        delay = self.reconnect_delay
+        while True:
+            try:
+                async with websockets.connect(self.url) as connection:
+                    delay = self.reconnect_delay
+                    await self._session(connection)
+            # covers dropped connections, and handshakes refused while a node restarts
+            except (OSError, websockets.WebSocketException, RpcError):
+                pass
+            finally:
+                self.connected.clear()
+                self._connection = None
+
+            self.reconnections += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def latency_report(self):
+        """
+        Returns the number of events delivered and their median, 95th
+        percentile, and worst end-to-end latency in seconds
+        """
+
+        if not self.latencies:
+            return {"events": 0}
+        latencies = sorted(self.latencies)
+        return {
+            "events": len(latencies),
+            "p50": statistics.median(latencies),
+            "p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+            "max": latencies[-1],
+        }
+
+    async def _session(self, connection):
+        self._connection = connection
+        self._logs = asyncio.Queue()
+        reader = asyncio.create_task(self._read(connection))
+        dispatcher = asyncio.create_task(self._dispatch())
+
+        try:
+            # hold live logs back until the gap before them has been filled
+            self._held_logs = []
+            self._subscription_id = await self._request(
+                "eth_subscribe",
+                ["logs", {"address": self.wallets, "topics": [self.topics]}],
+            )
+            if self._sync_block is None:
+                self._sync_block = int(await self._request("eth_blockNumber"), 16)
+            else:
+                missed = await self._request(
+                    "eth_getLogs",
+                    [
+                        {
+                            "address": self.wallets,
+                            "topics": [self.topics],
+                            "fromBlock": hex(self._sync_block),
+                            "toBlock": "latest",
+                        }
+                    ],
+                )
+                for log in missed:
+                    self._logs.put_nowait((log, False))
+            for log in self._held_logs:
+                self._logs.put_nowait((log, True))
+            self._held_logs = None
+            self.connected.set()
+
+            done, _ = await asyncio.wait(
+                {reader, dispatcher}, return_when=asyncio.FIRST_COMPLETED
+            )
+            # surfaces a dropped connection, or an exception raised by a consumer
+            for task in done:
+                task.result()
+        finally:
+            reader.cancel()
+            dispatcher.cancel()
+            for future in self._pending.values():
+                future.cancel()
+            self._pending.clear()
+
+    async def _read(self, connection):
+        try:
+            await self._read_messages(connection)
+        finally:
+            # unblock requests that will never get their reply
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Connection closed"))
+
+    async def _read_messages(self, connection):
+        async for message in connection:
+            reply = json.loads(message)
+            if "id" in reply:
+                future = self._pending.pop(reply["id"], None)
+                if future is None or future.done():
+                    continue
+                if "error" in reply:
+                    error = reply["error"]
+                    future.set_exception(
+                        RpcError(
+                            error.get("code"), error.get("message"), error.get("data")
+                        )
+                    )
+                else:
+                    future.set_result(reply["result"])
+            elif reply.get("method") == "eth_subscription":
+                log = reply["params"]["result"]
+                if self._held_logs is not None:
+                    self._held_logs.append(log)
+                else:
+                    self._logs.put_nowait((log, True))
+
+    async def _request(self, method, params=()):
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        await self._connection.send(
+            json.dumps(
+                {
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "method": method,
+                    "params": list(params),
+                }
+            )
+        )
+        return await future
+
+    async def _dispatch(self):
+        while True:
+            log, live = await self._logs.get()
+            event = await self._decode(log)
+            if event is not None:
+                # backfilled events are late by design, and would skew the latencies
+                if live:
+                    self.latencies.append(event.latency)
+                await self._deliver(event)
+
+    async def _decode(self, log):
+        key = (log["transactionHash"], int(log["logIndex"], 16))
+        removed = bool(log.get("removed"))
+        if not removed and key in self._seen:
+            return None
+
+        decoded = self.abi.decode_log(log)
+        if decoded is None:
+            return None
+
+        block_number = int(log["blockNumber"], 16)
+        timestamp = await self._block_timestamp(block_number)
+        self._mark_seen(key, block_number, removed)
+        return WalletEvent(
+            name=decoded[0],
+            wallet=log["address"],
+            args=decoded[1],
+            block_number=block_number,
+            log_index=key[1],
+            txn_hash=key[0],
+            removed=removed,
+            latency=max(0.0, time.time() - timestamp),
+        )
+
+    def _mark_seen(self, key, block_number, removed):
+        if removed:
+            self._seen.pop(key, None)
+            return
+
+        self._seen[key] = block_number
+        if block_number > self._sync_block:
+            self._sync_block = block_number
+            # logs from before the sync block can never be backfilled again
+            self._seen = {
+                seen_key: seen_block
+                for seen_key, seen_block in self._seen.items()
+                if seen_block >= block_number
+            }
+
+    async def _block_timestamp(self, block_number):
+        if block_number not in self._block_timestamps:
+            block = await self._request(
+                "eth_getBlockByNumber", [hex(block_number), False]
+            )
+            if len(self._block_timestamps) >= BLOCK_TIMESTAMP_CACHE_SIZE:
+                self._block_timestamps.pop(next(iter(self._block_timestamps)))
+            self._block_timestamps[block_number] = int(block["timestamp"], 16)
+        return self._block_timestamps[block_number]
+
+    async def _deliver(self, event):
+        self.queue.put_nowait(event)
+        for callback in self._callbacks:
+            result = callback(event)
+            if inspect.isawaitable(result):
+                await result
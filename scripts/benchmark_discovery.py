@@ -0,0 +1,125 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ape import accounts, networks, project
+
+from multi_sig_wallet.client import wallet_at
+from multi_sig_wallet.contracts import ContractAbi
+from multi_sig_wallet.discovery import discover
+from multi_sig_wallet.rpc import ProviderRpc
+
+NUMBER_OF_WALLETS = 10_000
+# the delay per request, so that sweeps pay the latency of a hosted node
+RPC_LATENCY = 0.02
+CHUNK_SIZE = 500
+WORKERS = 8
+DEPLOY_GAS = 3_000_000
+
+
+def deploy_fleet(rpc, factory, candidates):
+    """
+    Deploys the fleet through the factory from unlocked accounts,
+    without waiting for each receipt, and returns the last block
+    """
+
+    abi = ContractAbi.named("Factory")
+    txn_hash = None
+    for index in range(NUMBER_OF_WALLETS):
+        owners = [
+            candidates[(index + offset) % len(candidates)].address
+            for offset in range(3)
+        ]
+        data = abi.encode_call("deployWallet", owners, 1 + index % 3)
+        txn_hash = rpc.request(
+            "eth_sendTransaction",
+            [
+                {
+                    "from": candidates[index % len(candidates)].address,
+                    "to": factory.address,
+                    "data": "0x" + data.hex(),
+                    "gas": hex(DEPLOY_GAS),
+                }
+            ],
+        )
+        if index % 1000 == 999:
+            print(f"  {index + 1} wallets deployed")
+    return int(rpc.request("eth_getTransactionReceipt", [txn_hash])["blockNumber"], 16)
+
+
+def discover_with_calls(rpc, factory, candidates, to_block):
+    """
+    The discovery the old event allowed: find the wallet addresses in
+    the logs, then ask every wallet for its threshold and whether each
+    candidate account is one of its owners
+    """
+
+    topic = "0x" + ContractAbi.named("Factory").event_topic("WalletDeployed").hex()
+    addresses = []
+    for start in range(0, to_block + 1, CHUNK_SIZE):
+        logs = rpc.request(
+            "eth_getLogs",
+            [
+                {
+                    "address": factory.address,
+                    "topics": [topic],
+                    "fromBlock": hex(start),
+                    "toBlock": hex(min(start + CHUNK_SIZE - 1, to_block)),
+                }
+            ],
+        )
+        addresses += ["0x" + log["topics"][1][-40:] for log in logs]
+
+    def describe(address):
+        wallet = wallet_at(rpc, address)
+        owners = [
+            candidate.address
+            for candidate in candidates
+            if wallet.call("isOwner", candidate.address)
+        ]
+        return address, owners, wallet.call("getRequiredApprovals")
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        return list(pool.map(describe, addresses))
+
+
+def main():
+    """
+    Benchmarks discovering a fleet of 10k factory deployed wallets
+    from the factory's logs alone, against sweeping the logs for
+    addresses and calling every wallet. Run it on a local chain with
+
+    ape run benchmark_discovery --network ::foundry
+    """
+
+    web3 = networks.active_provider.web3
+    candidates = accounts.test_accounts[0:5]
+    factory = project.Factory.deploy(sender=candidates[0])
+
+    print(f"Deploying {NUMBER_OF_WALLETS} wallets...")
+    to_block = deploy_fleet(ProviderRpc(web3), factory, candidates)
+
+    rpc = ProviderRpc(web3, RPC_LATENCY)
+    print(
+        f"\nDiscovering {NUMBER_OF_WALLETS} wallets over {to_block + 1} blocks, "
+        f"{RPC_LATENCY * 1000:.0f}ms per request"
+    )
+    for label, workers in (
+        ("logs only, 1 worker", 1),
+        (f"logs only, {WORKERS} workers", WORKERS),
+    ):
+        started = time.perf_counter()
+        registry = discover(
+            rpc,
+            factory.address,
+            to_block=to_block,
+            chunk_size=CHUNK_SIZE,
+            workers=workers,
+        )
+        seconds = time.perf_counter() - started
+        print(f"  {label:<36}{seconds:>8.2f}s  {len(registry):>6} wallets")
+
+    started = time.perf_counter()
+    described = discover_with_calls(rpc, factory, candidates, to_block)
+    seconds = time.perf_counter() - started
+    label = f"logs + calls, {WORKERS} workers"
+    print(f"  {label:<36}{seconds:>8.2f}s  {len(described):>6} wallets")
@@ -0,0 +1,226 @@
+from ape import accounts, networks, project
+
+from multi_sig_wallet.model import Txn, TxnAction, TxnType
+from multi_sig_wallet.packing import asset_indexes, encode_txns
+from multi_sig_wallet.permits import PermitDomain, sign_permit
+
+# EIP-170 runtime bytecode size limit
+MAX_CODE_SIZE = 24_576
+# the gas every transaction pays before its calldata and execution
+INTRINSIC_TXN_GAS = 21_000
+NUMBER_OF_WALLETS = 10
+NUMBER_OF_PACKED_TXNS = 20
+
+
+def print_table(title, rows):
+    """
+    Prints a titled two column table of labels and gas (or byte)
+    figures
+    """
+
+    print(f"\n{title}")
+    width = max(len(label) for label, _ in rows)
+    for label, value in rows:
+        print(f"  {label.ljust(width)}  {value:>12,}")
+
+
+def calldata_gas(data):
+    """Returns the intrinsic gas of calldata: 4 per zero byte and 16 per other byte."""
+
+    data = bytes(data)
+    zero_bytes = data.count(0)
+    return 4 * zero_bytes + 16 * (len(data) - zero_bytes)
+
+
+def estimate_call_gas(web3, contract, method, *args):
+    """
+    Returns the execution gas of a call to the contract method: its
+    gas estimate without the intrinsic transaction and calldata gas,
+    which a batched call only pays once
+    """
+
+    data = getattr(contract, method).encode_input(*args)
+    estimate = web3.eth.estimate_gas({"to": contract.address, "data": data})
+    return estimate - INTRINSIC_TXN_GAS - calldata_gas(data)
+
+
+def packable_txns(recipient, allowance_provider, token, nft):
+    """Returns alternating NFT transfer from and token transfer transactions."""
+
+    txns = []
+    for count in range(NUMBER_OF_PACKED_TXNS):
+        if count % 2:
+            txn = Txn(
+                TxnAction.TRANSFER, recipient, 10**18 + count, asset=token.address
+            )
+            txns.append((TxnType.TOKEN, txn))
+        else:
+            txn = Txn(
+                TxnAction.TRANSFER_FROM,
+                recipient,
+                count,
+                allowance_provider,
+                nft.address,
+            )
+            txns.append((TxnType.NFT, txn))
+    return txns
+
+
+def main():
+    """
+    Gas benchmarks for the wallet contracts. Run it on a local
+    chain with
+
+    ape run benchmark_gas --network ::foundry
+    """
+
+    web3 = networks.active_provider.web3
+    owners = accounts.test_accounts[0:3]
+    deployer = owners[0]
+
+    token = project.TestToken.deploy(10**24, sender=deployer)
+    nft = project.TestNFT.deploy("ipfs://benchmark", sender=deployer)
+    lens = project.WalletLens.deploy(sender=deployer)
+    factory = project.Factory.deploy(sender=deployer)
+
+    wallets = [
+        project.MultiSigWallet.deploy(owners, 2, sender=deployer)
+        for _ in range(NUMBER_OF_WALLETS)
+    ]
+    wallet = wallets[0]
+    factory_receipt = factory.deployWallet(owners, 2, sender=deployer)
+
+    pre_lens = project.PreLensMultiSigWallet.deploy(owners, 2, sender=deployer)
+
+    wallet_deploy_gas = wallet.receipt.gas_used
+    pre_lens_deploy_gas = pre_lens.receipt.gas_used
+    lens_deploy_gas = lens.receipt.gas_used
+    wallet_size = len(web3.eth.get_code(wallet.address))
+    pre_lens_size = len(web3.eth.get_code(pre_lens.address))
+    print_table(
+        "Deployment",
+        [
+            ("Pre-lens MultiSigWallet deploy gas", pre_lens_deploy_gas),
+            ("MultiSigWallet deploy gas", wallet_deploy_gas),
+            ("Deploy gas saved per wallet", pre_lens_deploy_gas - wallet_deploy_gas),
+            ("Factory.deployWallet gas", factory_receipt.gas_used),
+            ("WalletLens deploy gas (once)", lens_deploy_gas),
+            (
+                f"WalletLens gas per wallet over {NUMBER_OF_WALLETS} wallets",
+                lens_deploy_gas // NUMBER_OF_WALLETS,
+            ),
+            ("Pre-lens MultiSigWallet runtime bytes", pre_lens_size),
+            ("MultiSigWallet runtime bytes", wallet_size),
+            ("Runtime bytes saved per wallet", pre_lens_size - wallet_size),
+            ("WalletLens runtime bytes", len(web3.eth.get_code(lens.address))),
+            ("EIP-170 size limit bytes", MAX_CODE_SIZE),
+        ],
+    )
+
+    for each_wallet in wallets:
+        token.transfer(each_wallet, 10**18, sender=deployer)
+        nft.mintNFT(each_wallet, sender=deployer)
+    wallet.issueTokenTransferTxn(owners[1], 1, token, sender=deployer)
+
+    assets = [token.address, nft.address]
+    individual_balance_calls = sum(
+        estimate_call_gas(web3, lens, "getWalletTokenBalance", each_wallet, asset)
+        for each_wallet in wallets
+        for asset in assets
+    )
+    print_table(
+        "View calls (execution gas)",
+        [
+            (
+                "MultiSigWallet.getTxn (raw)",
+                estimate_call_gas(web3, wallet, "getTxn", 1, 0),
+            ),
+            (
+                "WalletLens.getTokenTxnDetails",
+                estimate_call_gas(web3, lens, "getTokenTxnDetails", wallet, 0),
+            ),
+            (
+                "MultiSigWallet.getTxnCounts (raw)",
+                estimate_call_gas(web3, wallet, "getTxnCounts"),
+            ),
+            (
+                "WalletLens.getTokenTxnCount",
+                estimate_call_gas(web3, lens, "getTokenTxnCount", wallet),
+            ),
+            (
+                f"WalletLens.getBalances ({len(wallets)} wallets x {len(assets)} assets)",
+                estimate_call_gas(web3, lens, "getBalances", wallets, assets),
+            ),
+            (
+                f"{len(wallets) * len(assets)} separate balance calls",
+                individual_balance_calls,
+            ),
+        ],
+    )
+
+    # the deployer provides the allowance of two identical transfer from transactions
+    approve_txn_index = wallet.getTxnCounts()[1]
+    permit_txn_index = approve_txn_index + 1
+    for txn_index in (approve_txn_index, permit_txn_index):
+        wallet.issueTokenTransferFromTxn(
+            owners[1], 10**18, deployer, token, sender=deployer
+        )
+        wallet.approveTxn(1, txn_index, sender=owners[0])
+        wallet.approveTxn(1, txn_index, sender=owners[1])
+
+    approve_receipt = token.approve(wallet, 10**18, sender=deployer)
+    execute_receipt = wallet.executeTxn(1, approve_txn_index, sender=owners[1])
+    domain = PermitDomain(token.name(), "1", web3.eth.chain_id, token.address)
+    permit = sign_permit(
+        deployer.private_key,
+        domain,
+        wallet.address,
+        10**18,
+        token.nonces(deployer),
+        2**64,
+    )
+    permit_receipt = wallet.executeTokenTransferFromWithPermit(
+        *permit.execution_args(permit_txn_index), sender=owners[1]
+    )
+    print_table(
+        "Token transfer from",
+        [
+            ("Allowance provider's approve gas", approve_receipt.gas_used),
+            ("executeTxn gas", execute_receipt.gas_used),
+            (
+                "approve + executeTxn gas",
+                approve_receipt.gas_used + execute_receipt.gas_used,
+            ),
+            ("executeTokenTransferFromWithPermit gas", permit_receipt.gas_used),
+        ],
+    )
+
+    # the same token and NFT transfers, issued one ABI call each and in one packed call
+    wallet.registerAssets([token, nft], sender=deployer)
+    txns = packable_txns(owners[1].address, owners[2].address, token, nft)
+    abi_calldata, abi_calldata_gas, abi_gas = 0, 0, 0
+    for txn_type, txn in txns:
+        if txn_type == TxnType.TOKEN:
+            method, args = "issueTokenTransferTxn", (txn.to, txn.amount, txn.asset)
+        else:
+            method = "issueNftTransferFromTxn"
+            args = (txn.to, txn.allowance_provider, txn.amount, txn.asset)
+        data = getattr(wallet, method).encode_input(*args)
+        abi_calldata += len(data)
+        abi_calldata_gas += calldata_gas(data)
+        abi_gas += getattr(wallet, method)(*args, sender=deployer).gas_used
+
+    records = encode_txns(txns, asset_indexes(wallet.getAssets()))
+    packed_data = wallet.issuePackedTxns.encode_input(records)
+    packed_receipt = wallet.issuePackedTxns(records, sender=deployer)
+    print_table(
+        f"Issuing {NUMBER_OF_PACKED_TXNS} token and NFT transactions",
+        [
+            ("ABI calldata bytes", abi_calldata),
+            ("Packed calldata bytes", len(packed_data)),
+            ("ABI calldata gas", abi_calldata_gas),
+            ("Packed calldata gas", calldata_gas(packed_data)),
+            ("ABI issue calls gas", abi_gas),
+            ("issuePackedTxns gas", packed_receipt.gas_used),
+        ],
+    )
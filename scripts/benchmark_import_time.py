@@ -0,0 +1,50 @@
+import statistics
+import subprocess
+import sys
+
+RUNS = 5
+IMPORTS = {
+    "client (read)": "import multi_sig_wallet.client",
+    "client (read and sign)": "import multi_sig_wallet.client, eth_account",
+    "web3": "import web3",
+    "ape": "import ape; ape.project",
+}
+
+
+def cold_start(statement):
+    """
+    Returns the median wall clock seconds a fresh interpreter takes
+    to run the statement, or None if it fails
+    """
+
+    timer = (
+        "import time; started = time.perf_counter(); "
+        f"{statement}; print(time.perf_counter() - started)"
+    )
+    timings = []
+    for _ in range(RUNS):
+        result = subprocess.run(
+            [sys.executable, "-c", timer], capture_output=True, text=True, check=False
+        )
+        if result.returncode != 0:
+            return None
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return statistics.median(timings)
+
+
+def main():
+    """
+    Compares the cold start import time of the lightweight client
+    with web3 and ape. Run it from the project root with
+
+    python scripts/benchmark_import_time.py
+    """
+
+    for label, statement in IMPORTS.items():
+        seconds = cold_start(statement)
+        timing = "not installed" if seconds is None else f"{seconds:.3f}s"
+        print(f"{label.ljust(24)} {timing}")
+
+
+if __name__ == "__main__":
+    main()
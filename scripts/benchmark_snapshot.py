@@ -0,0 +1,107 @@
+import gc
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from ape import accounts, networks, project
+
+from multi_sig_wallet.rpc import ProviderRpc
+from multi_sig_wallet.snapshots import FleetState, Snapshot, rebuild, write_snapshot
+
+NUMBER_OF_WALLETS = 50
+TXNS_PER_WALLET = 4
+# wallets that get new transactions between the snapshot and the restart
+NUMBER_OF_CHANGED_WALLETS = 5
+
+
+def resident_memory():
+    """Returns the resident set size of the process in bytes, from /proc."""
+
+    with open("/proc/self/status", encoding="utf-8") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def measure(start):
+    """
+    Runs a restart and returns its wall time in seconds, its peak
+    traced allocations, and the growth of resident memory in bytes
+    """
+
+    gc.collect()
+    rss_before = resident_memory()
+    tracemalloc.start()
+    started = time.perf_counter()
+    state = start()
+    seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_growth = resident_memory() - rss_before
+    return state, seconds, peak, rss_growth
+
+
+def issue_txns(wallet, owners, count):
+    """Issues and approves `count` ETH transactions in the wallet."""
+
+    for _ in range(count):
+        receipt = wallet.issueEthTxn(owners[2], 1, sender=owners[0])
+        wallet.approveTxn(0, receipt.events[0].txnIndex, sender=owners[1])
+
+
+def main():
+    """
+    Compares restarting a fleet indexer with a full rebuild from the
+    logs against opening a snapshot and catching up from its block.
+    Run it on a local chain with
+
+    ape run benchmark_snapshot --network ::foundry
+    """
+
+    rpc = ProviderRpc(networks.active_provider.web3)
+    owners = accounts.test_accounts[0:3]
+
+    wallets = [
+        project.MultiSigWallet.deploy(owners, 2, sender=owners[0])
+        for _ in range(NUMBER_OF_WALLETS)
+    ]
+    for wallet in wallets:
+        issue_txns(wallet, owners, TXNS_PER_WALLET)
+    fleet = {wallet.address: [owner.address for owner in owners] for wallet in wallets}
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "fleet.snapshot"
+        queues, block_number = rebuild(rpc, fleet)
+        block = rpc.request("eth_getBlockByNumber", [hex(block_number), False])
+        write_snapshot(path, queues.values(), block_number, block["hash"])
+        del queues
+
+        for wallet in wallets[:NUMBER_OF_CHANGED_WALLETS]:
+            issue_txns(wallet, owners, 1)
+
+        _, rebuild_seconds, rebuild_peak, rebuild_rss = measure(
+            lambda: rebuild(rpc, fleet)
+        )
+
+        def open_and_catch_up():
+            state = FleetState(Snapshot(path))
+            state.catch_up(rpc)
+            return state
+
+        state, snapshot_seconds, snapshot_peak, snapshot_rss = measure(
+            open_and_catch_up
+        )
+        state.snapshot.close()
+
+    print(
+        f"\nRestart of {NUMBER_OF_WALLETS} wallets, "
+        f"{NUMBER_OF_CHANGED_WALLETS} changed since the snapshot"
+    )
+    print(f"  {'':<24}{'seconds':>10}{'peak alloc':>14}{'RSS growth':>14}")
+    for label, seconds, peak, rss in (
+        ("full rebuild", rebuild_seconds, rebuild_peak, rebuild_rss),
+        ("snapshot + catch-up", snapshot_seconds, snapshot_peak, snapshot_rss),
+    ):
+        print(f"  {label:<24}{seconds:>10.3f}{peak:>14,}{rss:>14,}")
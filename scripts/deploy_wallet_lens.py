@@ -0,0 +1,32 @@
+from ape import accounts, networks, project
+
+
+def main():
+    """
+    The wallet lens is deployed once and serves the
+    balance, transaction count, and transaction detail
+    views of every multi-sig wallet, so that wallets
+    themselves stay small
+    """
+
+    account_1 = None
+    publish_source_code = True
+
+    # use test accounts if we are on a local chain such
+    # as hardhat
+    print("Getting accounts")
+    if networks.active_provider.chain_id in (1337, 31337):
+        account_1 = accounts.test_accounts[0]
+        publish_source_code = False
+    else:
+        # here, use the alias of the account that you have
+        # imported with ape
+        account_1 = accounts.load("Crosstalk")
+
+    print("Deploying wallet lens contract..")
+    lens = project.WalletLens.deploy(sender=account_1, publish=publish_source_code)
+
+    # print the receipt after deployment
+    print("Here's the receipt:")
+    for key, value in lens.receipt:
+        print(key, value)
@@ -0,0 +1,24 @@
+import json
+from pathlib import Path
+
+from ape import project
+
+from multi_sig_wallet.contracts import ARTIFACTS_DIR, CONTRACT_NAMES
+
+
+def main():
+    """
+    Writes the ABIs of the compiled contracts to the artifacts
+    shipped with the multi_sig_wallet client package. Run it after
+    changing a contract's interface
+    """
+
+    for contract_name in CONTRACT_NAMES:
+        contract_type = getattr(project, contract_name).contract_type
+        abi = [
+            entry.model_dump(mode="json", by_alias=True, exclude_none=True)
+            for entry in contract_type.abi
+        ]
+        artifact = Path(ARTIFACTS_DIR) / f"{contract_name}.json"
+        artifact.write_text(json.dumps(abi, indent=2, sort_keys=True) + "\n")
+        print(f"Wrote {artifact}")
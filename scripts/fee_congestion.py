@@ -0,0 +1,106 @@
+import random
+
+from ape import accounts, networks, project
+
+from multi_sig_wallet.fees import (
+    FeeEngine,
+    Fees,
+    signed_sender,
+    summarize,
+    urgency_for,
+)
+
+# small blocks that fit only a handful of wallet calls, mined every few seconds
+BLOCK_GAS_LIMIT = 400_000
+BLOCK_TIME = 3
+FILLER_TXNS_PER_ROUND = 10
+ROUNDS = 5
+
+
+def main():
+    """
+    Runs the wallet's issue, approve, and execute flow through the
+    fee engine on a local node under synthetic congestion, then
+    prints the time to inclusion against the spend for each urgency
+    class. Run it with
+
+    ape run fee_congestion --network ::foundry
+    """
+
+    provider = networks.active_provider
+    if provider.chain_id not in (1337, 31337):
+        raise RuntimeError("The congestion run only works on a local chain")
+
+    web3 = provider.web3
+    owners = accounts.test_accounts[0:3]
+    fillers = accounts.test_accounts[3:8]
+    receiver = accounts.test_accounts[8]
+    wallet = project.MultiSigWallet.deploy(owners, 2, sender=owners[0])
+    owners[0].transfer(wallet, "1 ether")
+
+    # anvil takes the mining interval in seconds, hardhat in milliseconds
+    interval = (
+        BLOCK_TIME if "anvil" in web3.client_version.lower() else BLOCK_TIME * 1000
+    )
+    web3.provider.make_request("evm_setBlockGasLimit", [hex(BLOCK_GAS_LIMIT)])
+    web3.provider.make_request("evm_setAutomine", [False])
+    web3.provider.make_request("evm_setIntervalMining", [interval])
+
+    engine = FeeEngine(web3, blocks=10)
+    rng = random.Random(0)
+    reports = []
+
+    def submit(account, function_name, args, approvals=0):
+        data = getattr(wallet, function_name).encode_input(*args)
+        send = signed_sender(
+            web3,
+            account.private_key,
+            {
+                "chainId": provider.chain_id,
+                "to": wallet.address,
+                "data": data,
+                "gas": 150_000,
+                "value": 0,
+            },
+        )
+        nonce = web3.eth.get_transaction_count(account.address, "pending")
+        urgency = urgency_for(function_name, approvals, 2)
+        report = engine.submit(send, urgency, nonce, stuck_after=2 * BLOCK_TIME)
+        reports.append(report)
+        print(
+            f"{function_name}: {urgency.name} included after {report.seconds:.1f}s "
+            f"and {report.bumps} bumps, spent {report.spend} wei"
+        )
+
+    try:
+        for txn_index in range(ROUNDS):
+            print("Congesting the mempool...")
+            base_fee = web3.eth.get_block("pending")["baseFeePerGas"]
+            for filler in fillers:
+                nonce = web3.eth.get_transaction_count(filler.address, "pending")
+                for offset in range(FILLER_TXNS_PER_ROUND):
+                    # competing traffic tips anywhere between 1 and 5 gwei
+                    priority_fee = rng.randint(1, 5) * 10**9
+                    fees = Fees(base_fee * 2 + priority_fee, priority_fee)
+                    send = signed_sender(
+                        web3,
+                        filler.private_key,
+                        {
+                            "chainId": provider.chain_id,
+                            "to": receiver.address,
+                            "gas": 21_000,
+                            "value": 1,
+                        },
+                    )
+                    send(fees, nonce + offset)
+
+            submit(owners[0], "issueEthTxn", [receiver.address, 1])
+            submit(owners[0], "approveTxn", [0, txn_index], approvals=0)
+            submit(owners[1], "approveTxn", [0, txn_index], approvals=1)
+            submit(owners[2], "executeTxn", [0, txn_index])
+    finally:
+        web3.provider.make_request("evm_setAutomine", [True])
+
+    print("Urgency | txns | mean seconds to inclusion | mean spend (wei)")
+    for urgency, (count, seconds, spend) in summarize(reports).items():
+        print(f"{urgency.name} | {count} | {seconds:.2f} | {spend:.0f}")
@@ -0,0 +1,98 @@
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from ape import accounts, networks, project
+
+from multi_sig_wallet.client import wallet_at
+from multi_sig_wallet.fees import Fees
+from multi_sig_wallet.gas_limits import GasLimitModel, call_shape
+from multi_sig_wallet.rpc import ProviderRpc
+
+ROUNDS = 20
+# seconds added to every request, for the round trip to a remote node
+RPC_LATENCY = 0.05
+
+
+def run_flow(wallet, owners, recipient, fees):
+    """
+    Issues, approves, and executes ETH transactions through the
+    client, and returns the seconds each submission took to send
+    """
+
+    seconds = []
+
+    def submit(owner, function_name, *args, warm=False):
+        shape = call_shape(function_name, args, action=0, warm=warm)
+        started = time.perf_counter()
+        txn_hash = wallet.transact(
+            function_name, *args, private_key=owner.private_key, fees=fees, shape=shape
+        )
+        seconds.append(time.perf_counter() - started)
+        receipt = wallet.wait_for_receipt(txn_hash, poll_interval=0.01)
+        if int(receipt["status"], 16) != 1:
+            raise RuntimeError(f"{function_name}{args} reverted")
+
+    first_txn_index = wallet.call("getTxnCounts")[0]
+    for txn_index in range(first_txn_index, first_txn_index + ROUNDS):
+        submit(owners[0], "issueEthTxn", recipient, 1, warm=txn_index > 0)
+        submit(owners[0], "approveTxn", 0, txn_index)
+        submit(owners[1], "approveTxn", 0, txn_index, warm=True)
+        submit(owners[2], "executeTxn", 0, txn_index)
+    return seconds
+
+
+def main():
+    """
+    Load harness for the learned gas limits. Sends the same issue,
+    approve, and execute flow through the lightweight client with
+    live gas estimates and with a `GasLimitModel`, over a transport
+    with a simulated round trip, and prints the latency saved per
+    submission. Run it with
+
+    ape run gas_limit_load --network ::foundry
+    """
+
+    provider = networks.active_provider
+    owners = accounts.test_accounts[0:3]
+    recipient = accounts.test_accounts[3].address
+    wallet_contract = project.MultiSigWallet.deploy(owners, 2, sender=owners[0])
+    owners[0].transfer(wallet_contract, 10**18)
+
+    base_fee = provider.web3.eth.get_block("latest")["baseFeePerGas"]
+    fees = Fees(2 * base_fee + 10**9, 10**9)
+
+    estimating_rpc = ProviderRpc(provider.web3, RPC_LATENCY)
+    estimated = run_flow(
+        wallet_at(estimating_rpc, wallet_contract.address), owners, recipient, fees
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        model = GasLimitModel(Path(directory) / "gas-limits.json")
+        modelled_rpc = ProviderRpc(provider.web3, RPC_LATENCY)
+        wallet = wallet_at(modelled_rpc, wallet_contract.address, gas_model=model)
+        modelled = run_flow(wallet, owners, recipient, fees)
+
+        print(f"\n{len(estimated)} submissions, {RPC_LATENCY * 1000:.0f}ms per request")
+        print(f"  {'':<28}{'estimates':>10}{'mean ms':>10}{'p95 ms':>10}")
+        for label, rpc, seconds in (
+            ("live eth_estimateGas", estimating_rpc, estimated),
+            ("learned gas limits", modelled_rpc, modelled),
+        ):
+            p95 = sorted(seconds)[int(len(seconds) * 0.95) - 1]
+            print(
+                f"  {label:<28}{rpc.requests.get('eth_estimateGas', 0):>10}"
+                f"{statistics.mean(seconds) * 1000:>10.1f}{p95 * 1000:>10.1f}"
+            )
+        saved = statistics.mean(estimated) - statistics.mean(modelled)
+        print(f"  saved per submission: {saved * 1000:.1f}ms")
+
+        print("\n  Learned limits")
+        for shape, (samples, largest) in sorted(
+            model.shapes.items(), key=lambda item: item[0].key()
+        ):
+            print(
+                f"    {shape.key():<40}{samples:>4} receipts  {largest:>8,} used  "
+                f"{model.limit(shape):>8,} limit"
+            )
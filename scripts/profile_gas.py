@@ -0,0 +1,97 @@
+from pathlib import Path
+
+from ape import accounts, networks, project
+from web3 import Web3
+
+from multi_sig_wallet.profiler import (
+    ContractResolver,
+    GasProfile,
+    compile_ape_project,
+    fetch_struct_logs,
+)
+from multi_sig_wallet.rpc import ProviderRpc
+
+# where the folded stacks are written, one file per profiled call
+OUTPUT_DIR = Path("gas-profiles")
+TOP_ROWS = 15
+
+
+def print_rows(title, rows):
+    """Prints a titled table of gas rows, with their share of the execution gas."""
+
+    print(f"\n  {title}")
+    for gas, share, *labels in rows:
+        print(f"    {gas:>9,}  {share:>6.1%}  {'  '.join(labels)}")
+
+
+def profile_call(name, receipt, address, compilation, resolver, rpc):
+    """Profiles one transaction, prints its tables, and saves its folded stacks."""
+
+    profile = GasProfile(compilation, resolver)
+    execution_gas = profile.add_trace(fetch_struct_logs(rpc, receipt.txn_hash), address)
+
+    print(f"\n{name}: {receipt.gas_used:,} gas, {execution_gas:,} in execution")
+    print_rows("Functions", profile.function_rows(TOP_ROWS))
+    print_rows("Source lines", profile.line_rows(TOP_ROWS))
+    print_rows("Opcodes", profile.opcode_rows(TOP_ROWS))
+
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    (OUTPUT_DIR / f"{name}.folded").write_text(
+        profile.folded_stacks(), encoding="utf-8"
+    )
+
+
+def main():
+    """
+    Profiles the gas of the wallet's hot paths line by line. Needs a
+    node that supports debug_traceTransaction, such as a local
+    foundry or hardhat chain
+
+    ape run profile_gas --network ::foundry
+
+    Render a call's folded stacks with, for example,
+    flamegraph.pl gas-profiles/executeTokenTxn.folded > executeTokenTxn.svg
+    """
+
+    web3 = networks.active_provider.web3
+    rpc = ProviderRpc(web3)
+    compilation = compile_ape_project()
+    resolver = ContractResolver(
+        compilation,
+        lambda address: web3.eth.get_code(Web3.to_checksum_address(address)),
+    )
+
+    owners = accounts.test_accounts[0:3]
+    recipient = accounts.test_accounts[3]
+    deployer = owners[0]
+    token = project.TestToken.deploy(10**24, sender=deployer)
+    nft = project.TestNFT.deploy("ipfs://profile", sender=deployer)
+    factory = project.Factory.deploy(sender=deployer)
+    wallet = project.MultiSigWallet.deploy(owners, 2, sender=deployer)
+
+    deployer.transfer(wallet, 10**18)
+    token.transfer(wallet, 10**18, sender=deployer)
+    nft.mintNFT(wallet, sender=deployer)
+    wallet.issueEthTxn(recipient, 10**17, sender=deployer)
+    wallet.issueTokenTransferTxn(recipient, 10**17, token, sender=deployer)
+    wallet.issueNftTransferTxn(recipient, 1, nft, sender=deployer)
+
+    calls = {}
+    for txn_type, label in enumerate(["Eth", "Token", "Nft"]):
+        calls[f"approve{label}Txn"] = wallet.approveTxn(txn_type, 0, sender=owners[0])
+        wallet.approveTxn(txn_type, 0, sender=owners[1])
+    calls["executeEthTxn"] = wallet.executeTxn(0, 0, sender=deployer)
+    calls["executeTokenTxn"] = wallet.executeTxn(1, 0, sender=deployer)
+    calls["executeNftTxn"] = wallet.executeTxn(2, 0, sender=deployer)
+
+    for name, receipt in calls.items():
+        profile_call(name, receipt, wallet.address, compilation, resolver, rpc)
+    profile_call(
+        "deployWallet",
+        factory.deployWallet(owners, 2, sender=deployer),
+        factory.address,
+        compilation,
+        resolver,
+        rpc,
+    )
+    print(f"\nFolded stacks written to {OUTPUT_DIR}/")
@@ -0,0 +1,60 @@
+import pytest
+from ape import project
+
+from multi_sig_wallet.client import ContractRevert, connect, lens_at, wallet_at
+from multi_sig_wallet.contracts import CONTRACT_NAMES, ContractAbi, signature
+
+
+@pytest.fixture(scope="session")
+def rpc(rpc_url):
+    return connect(rpc_url)
+
+
+@pytest.mark.client
+@pytest.mark.parametrize("contract_name", CONTRACT_NAMES)
+def test_shipped_abis_match_the_compiled_contracts(contract_name):
+    compiled = [
+        entry.model_dump(mode="json", by_alias=True, exclude_none=True)
+        for entry in getattr(project, contract_name).contract_type.abi
+    ]
+    shipped = ContractAbi.named(contract_name).abi
+
+    def signatures(abi):
+        return {
+            (entry["type"], signature(entry))
+            for entry in abi
+            if entry["type"] in ("function", "event", "error")
+        }
+
+    assert signatures(shipped) == signatures(compiled)
+
+
+@pytest.mark.client
+def test_client_reads_wallet_state(rpc, owners, wallet):
+    client = wallet_at(rpc, wallet.address)
+
+    assert client.call("isOwner", owners[0].address) is True
+    assert client.call("getRequiredApprovals") == 2
+    assert client.call("getTxnCounts") == (0, 0, 0)
+
+
+@pytest.mark.client
+def test_client_decodes_custom_error_reverts(rpc, wallet):
+    client = wallet_at(rpc, wallet.address)
+
+    with pytest.raises(ContractRevert) as revert:
+        client.call("getTxn", 0, 0)
+
+    assert revert.value.error == "MultiSigWallet__InvalidIndex"
+
+
+@pytest.mark.client
+def test_client_signs_and_sends_wallet_txns(rpc, owners, not_owner, wallet, lens):
+    client = wallet_at(rpc, wallet.address)
+    txn_hash = client.transact(
+        "issueEthTxn", not_owner.address, 1, private_key=owners[0].private_key
+    )
+    receipt = client.wait_for_receipt(txn_hash)
+
+    assert int(receipt["status"], 16) == 1
+    assert lens_at(rpc, lens.address).call("getEthTxnCount", wallet.address) == 1
@@ -1,10 +1,23 @@
+import os
+
 import pytest
 from web3 import Web3
 
 
 @pytest.fixture(scope="session")
-def web3():
-    return Web3(Web3.HTTPProvider("http://localhost:8545"))
+def rpc_urls():
+    # extra endpoints must serve the same chain, such as a second node following the first
+    return os.environ.get("RPC_URLS", "http://localhost:8545").split(",")
+
+
+@pytest.fixture(scope="session")
+def rpc_url(rpc_urls):
+    return rpc_urls[0]
+
+
+@pytest.fixture(scope="session")
+def web3(rpc_url):
+    return Web3(Web3.HTTPProvider(rpc_url))
 
 
 @pytest.fixture(scope="session")
@@ -23,6 +36,11 @@ def wallet(owners, project):
     return project.MultiSigWallet.deploy(*constructor_args, sender=owners[0])
 
 
+@pytest.fixture(scope="session")
+def lens(owners, project):
+    return project.WalletLens.deploy(sender=owners[0])
+
+
 @pytest.fixture(scope="session")
 def token_contract(owners, project, web3):
     constructor_args = [web3.to_wei(10, "ether")]
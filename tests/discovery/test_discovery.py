@@ -0,0 +1,164 @@
+import threading
+
+import pytest
+
+from multi_sig_wallet.contracts import ContractAbi
+from multi_sig_wallet.discovery import DiscoveryError, discover
+from multi_sig_wallet.rpc import HttpRpc, RpcError
+
+FACTORY = "0x" + "fa" * 20
+OWNERS = ["0x" + "%02x" % number * 20 for number in range(1, 6)]
+
+
+def deployment_log(index, block_number):
+    owners = [OWNERS[index % 5], OWNERS[(index + 1) % 5]]
+    topics, data = ContractAbi.named("Factory").encode_log(
+        "WalletDeployed",
+        {
+            "walletAddress": "0x" + (index + 1).to_bytes(20, "big").hex(),
+            "walletIndex": index,
+            "requiredApprovals": 1 + index % 2,
+            "owners": owners,
+        },
+    )
+    return {
+        "address": FACTORY,
+        "topics": topics,
+        "data": data,
+        "blockNumber": hex(block_number),
+        "logIndex": "0x0",
+    }
+
+
+class FakeNode:
+    """Serves factory logs, and refuses queries over a log or block range cap like hosted nodes do."""
+
+    def __init__(self, logs, latest_block, max_logs=10, max_blocks=100, error=None):
+        self.logs = logs
+        self.latest_block = latest_block
+        self.max_logs = max_logs
+        self.max_blocks = max_blocks
+        self.error = error
+        self.queries = []
+        self._lock = threading.Lock()
+
+    def request(self, method, params=()):
+        if method == "eth_blockNumber":
+            return hex(self.latest_block)
+        (log_filter,) = params
+        from_block = int(log_filter["fromBlock"], 16)
+        to_block = int(log_filter["toBlock"], 16)
+        with self._lock:
+            self.queries.append((from_block, to_block))
+        if self.error is not None:
+            raise self.error
+        if to_block - from_block + 1 > self.max_blocks:
+            raise RpcError(-32602, "block range too large")
+        logs = [
+            log
+            for log in self.logs
+            if from_block <= int(log["blockNumber"], 16) <= to_block
+        ]
+        if len(logs) > self.max_logs:
+            raise RpcError(-32005, "query returned more than 10 results")
+        return logs
+
+
+@pytest.mark.discovery
+def test_fleet_is_discovered_from_factory_logs_alone():
+    # a burst of 25 deployments in blocks 40-44 overflows the log cap of a query
+    logs = [deployment_log(index, 40 + index // 5) for index in range(25)]
+    logs += [deployment_log(index, 10 * index) for index in range(25, 60)]
+    node = FakeNode(logs, latest_block=700)
+
+    registry = discover(node, FACTORY, chunk_size=100, workers=4)
+
+    assert len(registry) == 60
+    assert registry.synced_block == 700
+    assert all(to_block - from_block < 100 for from_block, to_block in node.queries)
+    record = registry.wallet("0x" + (8).to_bytes(20, "big").hex())
+    assert record.index == 7
+    assert record.owners == (OWNERS[2], OWNERS[3])
+    assert record.required_approvals == 2
+    assert record.block_number == 41
+    assert [record.index for record in registry.wallets_of(OWNERS[0])] == [
+        index for index in range(60) if index % 5 in (0, 4)
+    ]
+    assert registry.owners_by_wallet()[record.address] == [OWNERS[2], OWNERS[3]]
+
+
+@pytest.mark.discovery
+def test_registry_extends_from_its_last_block():
+    logs = [deployment_log(index, 5 * index) for index in range(20)]
+    node = FakeNode(logs[:10], latest_block=49)
+    registry = discover(node, FACTORY, chunk_size=20)
+
+    node.logs, node.latest_block, node.queries = logs, 99, []
+    discover(node, FACTORY, registry=registry, chunk_size=20)
+
+    assert len(registry) == 20
+    assert min(from_block for from_block, _ in node.queries) == 50
+
+
+@pytest.mark.discovery
+def test_gaps_in_wallet_indexes_are_reported():
+    logs = [deployment_log(index, index) for index in range(10) if index != 4]
+
+    with pytest.raises(DiscoveryError):
+        discover(FakeNode(logs, latest_block=20), FACTORY)
+
+    # a sweep from a later block only needs the indexes it saw to be contiguous
+    assert len(discover(FakeNode(logs, latest_block=20), FACTORY, from_block=5)) == 5
+
+    node = FakeNode([deployment_log(index, 3) for index in range(3)], 3, max_logs=2)
+    with pytest.raises(DiscoveryError):
+        discover(node, FACTORY)
+
+
+@pytest.mark.discovery
+def test_sweeps_with_gaps_are_swept_again_when_resumed():
+    logs = [deployment_log(index, 5 * index) for index in range(20)]
+    node = FakeNode(logs[:10], latest_block=49)
+    registry = discover(node, FACTORY, chunk_size=20)
+
+    # the node has not indexed the log of wallet 12 yet
+    node.logs, node.latest_block = logs[:12] + logs[13:], 99
+    with pytest.raises(DiscoveryError):
+        discover(node, FACTORY, registry=registry, chunk_size=20)
+    assert registry.synced_block == 49
+
+    node.logs, node.queries = logs, []
+    discover(node, FACTORY, registry=registry, chunk_size=20)
+
+    assert len(registry) == 20
+    assert registry.synced_block == 99
+    assert min(from_block for from_block, _ in node.queries) == 50
+
+
+@pytest.mark.discovery
+def test_errors_other_than_the_range_cap_are_not_split():
+    node = FakeNode([], latest_block=99, error=RpcError(-32000, "unauthorized"))
+
+    with pytest.raises(DiscoveryError):
+        discover(node, FACTORY, chunk_size=100)
+    assert len(node.queries) == 1
+
+
+@pytest.mark.discovery
+def test_discovered_fleet_matches_the_deployed_wallets(rpc_url, owners, factory):
+    deployed = []
+    for count in range(1, 4):
+        receipt = factory.deployWallet(owners[:count], count, sender=owners[0])
+        deployed.append(receipt.decode_logs(factory.WalletDeployed)[0].walletAddress)
+
+    registry = discover(HttpRpc(rpc_url), factory.address, chunk_size=2)
+
+    assert len(registry) == 3
+    for index, address in enumerate(deployed):
+        record = registry.wallet(address)
+        assert record.index == index
+        assert record.required_approvals == index + 1
+        assert record.owners == tuple(
+            owner.address.lower() for owner in owners[: index + 1]
+        )
+    assert len(registry.wallets_of(owners[0].address)) == 3
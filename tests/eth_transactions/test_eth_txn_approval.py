@@ -3,13 +3,15 @@ import ape
 
 
 @pytest.mark.txn_approval
-def test_eth_txn_approval_increases_txn_approval_count(owners, wallet, issue_eth_txn):
+def test_eth_txn_approval_increases_txn_approval_count(
+    owners, wallet, lens, issue_eth_txn
+):
     issue_eth_txn(owners[0])
     wallet.approveTxn(0, 0, sender=owners[0])
     wallet.approveTxn(0, 0, sender=owners[1])
     wallet.approveTxn(0, 0, sender=owners[2])
 
-    assert list(wallet.getEthTxnDetails(0)[2])[0] == 3
+    assert list(lens.getEthTxnDetails(wallet, 0)[2])[0] == 3
 
 
 @pytest.mark.txn_approval
@@ -22,6 +24,7 @@ def test_eth_txn_approval_emits_txn_approved_event(owners, wallet, issue_eth_txn
     assert logs[0].txnType == 0
     assert logs[0].txnIndex == 0
     assert logs[0].by == owners[1]
+    assert logs[0].approvals == 1
 
 
 @pytest.mark.txn_approval
@@ -67,3 +70,13 @@ def test_eth_txns_approval_reverts_if_the_txn_has_already_been_executed(
 
     with ape.reverts(wallet.MultiSigWallet__TxnAlreadyExecuted):
         wallet.approveTxn(0, 0, sender=owners[2])
+
+
+@pytest.mark.txn_approval
+def test_eth_txn_approval_reverts_if_index_equals_txn_count(
+    owners, wallet, issue_eth_txn
+):
+    issue_eth_txn(owners[0])
+
+    with ape.reverts(wallet.MultiSigWallet__InvalidIndex):
+        wallet.approveTxn(0, 1, sender=owners[0])
@@ -3,9 +3,9 @@ import ape
 
 
 @pytest.mark.txn_issual
-def test_eth_txn_issual(owners, not_owner, wallet, issue_eth_txn, web3):
+def test_eth_txn_issual(owners, not_owner, wallet, lens, issue_eth_txn, web3):
     issue_eth_txn(owners[0])
-    txn_details = wallet.getEthTxnDetails(0)
+    txn_details = lens.getEthTxnDetails(wallet, 0)
 
     assert txn_details[0] == not_owner
     assert txn_details[1] == web3.to_wei(1, "ether")
@@ -13,14 +13,16 @@ def test_eth_txn_issual(owners, not_owner, wallet, issue_eth_txn, web3):
 
 
 @pytest.mark.txn_issual
-def test_eth_txn_issual_increments_eth_txn_count(owners, wallet, issue_eth_txn):
+def test_eth_txn_issual_increments_eth_txn_count(owners, wallet, lens, issue_eth_txn):
     issue_eth_txn(owners[0])
 
-    assert wallet.getEthTxnCount() == 1
+    assert lens.getEthTxnCount(wallet) == 1
 
 
 @pytest.mark.txn_issual
-def test_eth_txn_issual_emits_txn_issued_event(owners, wallet, issue_eth_txn):
+def test_eth_txn_issual_emits_txn_issued_event(
+    owners, not_owner, wallet, issue_eth_txn, web3
+):
     txn_receipt = issue_eth_txn(owners[0])
 
     logs = txn_receipt.decode_logs(wallet.TxnIssued)
@@ -28,6 +30,11 @@ def test_eth_txn_issual_emits_txn_issued_event(owners, wallet, issue_eth_txn):
     assert logs[0].txnType == 0
     assert logs[0].txnIndex == 0
     assert logs[0].by == owners[0]
+    assert logs[0].action == 0
+    assert logs[0].to == not_owner
+    assert logs[0].amountOrTokenId == web3.to_wei(1, "ether")
+    assert logs[0].allowanceProvider == "0x0000000000000000000000000000000000000000"
+    assert logs[0].assetAddress == "0x0000000000000000000000000000000000000000"
 
 
 @pytest.mark.txn_issual
@@ -25,3 +25,17 @@ def test_wallet_deployment_using_factory_emits_wallet_deployed_event(owners, fac
 
     assert len(logs) == 1
     assert logs[0].walletAddress > "0x0000000000000000000000000000000000000000"
+    assert logs[0].walletIndex == 0
+    assert logs[0].requiredApprovals == 2
+    assert logs[0].owners == [owners[0].address, owners[1].address]
+
+
+@pytest.mark.test_factory
+def test_wallet_deployed_events_count_the_wallets(owners, factory):
+    for expected_index in range(3):
+        txn_receipt = factory.deployWallet([owners[2]], 1, sender=owners[1])
+        logs = txn_receipt.decode_logs(factory.WalletDeployed)
+
+        assert logs[0].walletIndex == expected_index
+        assert logs[0].owners == [owners[2].address]
+    assert factory.getTotalNumberOfWalletsDeployed() == 3
@@ -0,0 +1,82 @@
+import pytest
+
+from multi_sig_wallet.fees import FeeEngine, Fees, Urgency, bump, urgency_for
+
+
+@pytest.mark.fees
+def test_wallet_calls_are_classified_by_urgency():
+    assert urgency_for("issueEthTxn") == Urgency.ECONOMY
+    assert urgency_for("approveTxn", approvals=0, required_approvals=2) == (
+        Urgency.NORMAL
+    )
+    assert urgency_for("approveTxn", approvals=1, required_approvals=2) == (
+        Urgency.URGENT
+    )
+    assert urgency_for("executeTxn") == Urgency.URGENT
+
+
+@pytest.mark.fees
+def test_permit_executions_are_urgent():
+    assert urgency_for("executeTokenTransferFromWithPermit") == Urgency.URGENT
+
+
+@pytest.mark.fees
+def test_bumped_fees_are_accepted_as_replacements():
+    fees = Fees(max_fee_per_gas=100, max_priority_fee_per_gas=10)
+    bumped = bump(fees)
+
+    assert bumped.max_fee_per_gas >= 110
+    assert bumped.max_priority_fee_per_gas >= 11
+
+
+@pytest.mark.fees
+def test_bumped_fees_never_fall_below_a_fresh_suggestion():
+    fees = Fees(max_fee_per_gas=100, max_priority_fee_per_gas=10)
+    bumped = bump(fees, Fees(max_fee_per_gas=500, max_priority_fee_per_gas=50))
+
+    assert bumped == Fees(max_fee_per_gas=500, max_priority_fee_per_gas=50)
+
+
+@pytest.mark.fees
+def test_bumps_below_the_replacement_threshold_are_rejected():
+    with pytest.raises(ValueError):
+        bump(Fees(100, 10), factor=1.05)
+
+
+@pytest.mark.fees
+def test_suggested_fees_grow_with_urgency(owners, not_owner, web3):
+    for count in range(5):
+        owners[0].transfer(
+            not_owner, 1, max_priority_fee=f"{count + 1} gwei", max_fee="100 gwei"
+        )
+    suggestions = FeeEngine(web3).suggest_all()
+
+    assert (
+        suggestions[Urgency.ECONOMY].max_priority_fee_per_gas
+        <= suggestions[Urgency.NORMAL].max_priority_fee_per_gas
+        <= suggestions[Urgency.URGENT].max_priority_fee_per_gas
+    )
+    assert (
+        suggestions[Urgency.ECONOMY].max_fee_per_gas
+        < suggestions[Urgency.URGENT].max_fee_per_gas
+    )
+
+
+@pytest.mark.fees
+def test_submission_reports_inclusion_and_spend(owners, not_owner, web3):
+    def send(fees, nonce):
+        receipt = owners[0].transfer(
+            not_owner,
+            1,
+            nonce=nonce,
+            max_fee=fees.max_fee_per_gas,
+            max_priority_fee=fees.max_priority_fee_per_gas,
+        )
+        return receipt.txn_hash
+
+    nonce = web3.eth.get_transaction_count(owners[0].address)
+    report = FeeEngine(web3).submit(send, Urgency.URGENT, nonce, poll_interval=0)
+
+    assert report.bumps == 0
+    assert report.gas_used == 21_000
+    assert report.spend == 21_000 * report.effective_gas_price
@@ -0,0 +1,175 @@
+import pytest
+import rlp
+
+from multi_sig_wallet.client import wallet_at
+from multi_sig_wallet.fees import Fees
+from multi_sig_wallet.gas_limits import (
+    COLD_WRITE_SURCHARGE,
+    CallShape,
+    GasLimitModel,
+    call_shape,
+)
+from multi_sig_wallet.model import TxnAction, TxnType
+from multi_sig_wallet.rpc import HttpRpc
+
+PRIVATE_KEY = "0x" + "42" * 32
+WALLET = "0x" + "11" * 20
+RECIPIENT = "0x" + "22" * 20
+FEES = Fees(max_fee_per_gas=10**10, max_priority_fee_per_gas=10**9)
+
+
+class FakeNode:
+    """Counts gas estimates, and mines every transaction with the given receipt fields."""
+
+    def __init__(self, estimate=100_000, gas_used=60_000):
+        self.estimate = estimate
+        self.gas_used = gas_used
+        self.estimates = 0
+        self.gas_limits = []
+        self.receipts = {}
+
+    def request(self, method, params=()):
+        if method == "eth_estimateGas":
+            self.estimates += 1
+            return hex(self.estimate)
+        if method == "eth_chainId":
+            return "0x1"
+        if method == "eth_getTransactionCount":
+            return hex(len(self.receipts))
+        if method == "eth_sendRawTransaction":
+            # a type 2 transaction is 0x02 followed by the RLP list of its fields
+            fields = rlp.decode(bytes.fromhex(params[0][4:]))
+            gas_limit = int.from_bytes(fields[4], "big")
+            txn_hash = "0x%064x" % len(self.receipts)
+            gas_used = min(self.gas_used, gas_limit)
+            self.gas_limits.append(gas_limit)
+            self.receipts[txn_hash] = {
+                "status": "0x1" if gas_used < gas_limit else "0x0",
+                "gasUsed": hex(gas_used),
+            }
+            return txn_hash
+        if method == "eth_getTransactionReceipt":
+            return self.receipts[params[0]]
+        raise NotImplementedError(method)
+
+
+def send(wallet, function_name, *args):
+    txn_hash = wallet.transact(function_name, *args, private_key=PRIVATE_KEY, fees=FEES)
+    return wallet.wait_for_receipt(txn_hash)
+
+
+@pytest.mark.gas_limits
+def test_call_shapes_follow_the_transaction_type_and_action():
+    assert call_shape("issueTokenTransferFromTxn", warm=True) == CallShape(
+        "issueTokenTransferFromTxn", TxnType.TOKEN, TxnAction.TRANSFER_FROM, True
+    )
+    assert call_shape("approveTxn", (2, 7), action=1) == CallShape(
+        "approveTxn", TxnType.NFT
+    )
+    assert call_shape("executeTxn", (1, 0), action=1).action == TxnAction.TRANSFER_FROM
+    assert call_shape("executeTxn", (1, 0)) is None
+    assert call_shape("issuePackedTxns", (b"",)) is None
+
+    for shape in (
+        call_shape("approveTxn", (0, 1), warm=True),
+        call_shape("approveTxn", (0, 1), warm=False),
+        call_shape("isOwner"),
+    ):
+        assert CallShape.from_key(shape.key()) == shape
+
+
+@pytest.mark.gas_limits
+def test_limits_are_learned_with_a_margin_and_persisted(tmp_path):
+    path = tmp_path / "gas-limits.json"
+    shape = call_shape("issueEthTxn", warm=True)
+    model = GasLimitModel(path, margin=0.25, min_samples=2)
+
+    assert model.limit(shape) is None
+    model.observe(shape, 80_000)
+    assert model.limit(shape) is None
+    model.observe(shape, 60_000)
+    assert model.limit(shape) == 100_000
+
+    reloaded = GasLimitModel(path, margin=0.25, min_samples=2)
+    assert reloaded.limit(shape) == 100_000
+    assert reloaded.limit(call_shape("issueNftTransferTxn", warm=True)) is None
+    assert (reloaded.hits, reloaded.misses) == (1, 1)
+
+
+@pytest.mark.gas_limits
+def test_client_skips_estimates_for_learned_shapes():
+    node = FakeNode()
+    wallet = wallet_at(node, WALLET, gas_model=GasLimitModel(margin=0.2))
+
+    for _ in range(3):
+        send(wallet, "issueEthTxn", RECIPIENT, 1)
+    send(wallet, "approveTxn", 0, 0)
+
+    # the client does not know the warmth of its calls, so it allows for a cold write
+    learned = (60_000 + COLD_WRITE_SURCHARGE) * 1.2
+    assert node.estimates == 2
+    assert node.gas_limits == [100_000, learned, learned, 100_000]
+
+
+@pytest.mark.gas_limits
+def test_client_estimates_again_after_running_out_of_gas():
+    node = FakeNode()
+    model = GasLimitModel(margin=0.2)
+    wallet = wallet_at(node, WALLET, gas_model=model)
+    send(wallet, "approveTxn", 0, 0)
+
+    # a call that needs more than even a cold write adds
+    node.gas_used = 95_000
+    receipt = send(wallet, "approveTxn", 0, 1)
+    send(wallet, "approveTxn", 0, 1)
+
+    assert receipt["status"] == "0x0"
+    assert node.estimates == 2
+    assert node.gas_limits == [100_000, (60_000 + COLD_WRITE_SURCHARGE) * 1.2, 100_000]
+    assert model.limit(call_shape("approveTxn", (0, 1))) == (
+        (95_000 + COLD_WRITE_SURCHARGE) * 1.2
+    )
+
+
+@pytest.mark.gas_limits
+def test_warm_receipts_do_not_set_the_limit_of_cold_calls():
+    model = GasLimitModel(margin=0.2)
+    warm = call_shape("approveTxn", (0, 1), warm=True)
+    cold = call_shape("approveTxn", (0, 1), warm=False)
+    unknown = call_shape("approveTxn", (0, 1))
+
+    model.observe(warm, 45_000)
+    assert model.limit(warm) == 54_000
+    assert model.limit(cold) is None
+    # a call of unknown warmth may be the first approval, which writes a cold slot
+    assert model.limit(unknown) == (45_000 + COLD_WRITE_SURCHARGE) * 1.2
+
+    model.observe(cold, 65_000)
+    assert model.limit(cold) == 78_000
+    assert model.limit(unknown) == 78_000
+
+
+@pytest.mark.gas_limits
+def test_learned_limits_carry_wallet_calls_on_a_node(
+    rpc_url, owners, not_owner, wallet
+):
+    model = GasLimitModel()
+    client = wallet_at(HttpRpc(rpc_url), wallet.address, gas_model=model)
+
+    def send_as(owner, function_name, *args, warm=False):
+        shape = call_shape(function_name, args, action=0, warm=warm)
+        txn_hash = client.transact(
+            function_name, *args, private_key=owner.private_key, shape=shape
+        )
+        return client.wait_for_receipt(txn_hash, poll_interval=0.05)
+
+    for txn_index in range(2):
+        send_as(owners[0], "issueEthTxn", not_owner.address, 0, warm=txn_index > 0)
+        send_as(owners[0], "approveTxn", 0, txn_index)
+        send_as(owners[1], "approveTxn", 0, txn_index, warm=True)
+        receipt = send_as(owners[2], "executeTxn", 0, txn_index)
+
+    assert receipt["status"] == "0x1"
+    assert wallet.getTxn(0, 1).txnDetails.executed is True
+    # the warm issual is a new shape in the second round, the rest are learned
+    assert (model.hits, model.misses) == (3, 5)
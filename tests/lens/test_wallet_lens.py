@@ -0,0 +1,64 @@
+import pytest
+import ape
+
+
+@pytest.mark.wallet_lens
+def test_lens_returns_wallet_balances(owners, wallet, lens, token_contract, web3):
+    owners[0].transfer(wallet, "1 ether")
+    token_contract.transfer(wallet, "2 ether", sender=owners[0])
+
+    assert lens.getWalletEthBalance(wallet) == web3.to_wei(1, "ether")
+    assert lens.getWalletTokenBalance(wallet, token_contract) == web3.to_wei(2, "ether")
+
+
+@pytest.mark.wallet_lens
+def test_lens_checks_nft_ownership(owners, wallet, lens, test_nft):
+    test_nft.mintNFT(wallet, sender=owners[0])
+
+    assert lens.getWalletNftBalance(wallet, test_nft) == 1
+    assert lens.isOwnerOfNft(wallet, 1, test_nft) is True
+    assert lens.isOwnerOfNft(owners[0], 1, test_nft) is False
+
+
+@pytest.mark.wallet_lens
+def test_lens_returns_balances_of_many_wallets_and_assets_in_one_call(
+    owners, not_owner, wallet, lens, token_contract, test_nft, web3
+):
+    owners[0].transfer(wallet, "1 ether")
+    token_contract.transfer(wallet, "2 ether", sender=owners[0])
+    test_nft.mintNFT(wallet, sender=owners[0])
+
+    eth_balances, asset_balances = lens.getBalances(
+        [wallet, not_owner], [token_contract, test_nft]
+    )
+
+    assert eth_balances[0] == web3.to_wei(1, "ether")
+    assert eth_balances[1] == not_owner.balance
+    assert list(asset_balances[0]) == [web3.to_wei(2, "ether"), 1]
+    assert list(asset_balances[1]) == [0, 0]
+
+
+@pytest.mark.wallet_lens
+def test_lens_returns_txn_counts_of_many_wallets_in_one_call(
+    owners, wallet, lens, factory, issue_eth_txn, issue_nft_transfer_txn
+):
+    issue_eth_txn(owners[0])
+    issue_nft_transfer_txn(owners[0])
+    issue_nft_transfer_txn(owners[0])
+    receipt = factory.deployWallet([owners[0], owners[1]], 2, sender=owners[0])
+    other_wallet = receipt.decode_logs(factory.WalletDeployed)[0].walletAddress
+
+    txn_counts = lens.getTxnCounts([wallet, other_wallet])
+
+    assert list(txn_counts[0]) == [1, 0, 2]
+    assert list(txn_counts[1]) == [0, 0, 0]
+
+
+@pytest.mark.wallet_lens
+def test_lens_txn_details_revert_if_invalid_index_is_passed(
+    owners, wallet, lens, issue_eth_txn
+):
+    issue_eth_txn(owners[0])
+
+    with ape.reverts(lens.MultiSigWallet__InvalidIndex):
+        lens.getEthTxnDetails(wallet, 1)
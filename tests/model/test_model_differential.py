@@ -0,0 +1,104 @@
+import random
+
+import pytest
+from ape.exceptions import ContractLogicError
+
+from multi_sig_wallet.model import (
+    Ledger,
+    TxnAction,
+    TxnType,
+    WalletModel,
+    random_operations,
+)
+
+
+def revert_name(error):
+    # custom errors are raised as classes named after the error,
+    # everything else carries its revert string
+    if type(error).__name__.startswith("MultiSigWallet__"):
+        return type(error).__name__
+    return error.revert_message
+
+
+def replay(operation, accounts_by_address, wallet, token_contract):
+    sender = accounts_by_address[operation.sender]
+    args = operation.args
+
+    if operation.name == "issue_eth_txn":
+        wallet.issueEthTxn(*args, sender=sender)
+    elif operation.name == "issue_token_txn":
+        action, to, amount, allowance_provider, token = args
+        if action == TxnAction.TRANSFER:
+            wallet.issueTokenTransferTxn(to, amount, token, sender=sender)
+        elif action == TxnAction.TRANSFER_FROM:
+            wallet.issueTokenTransferFromTxn(
+                to, amount, allowance_provider, token, sender=sender
+            )
+        else:
+            wallet.issueTokenApprovalTxn(to, amount, token, sender=sender)
+    elif operation.name == "approve_txn":
+        wallet.approveTxn(*args, sender=sender)
+    elif operation.name == "execute_txn":
+        wallet.executeTxn(*args, sender=sender)
+    elif operation.name == "deposit_eth":
+        sender.transfer(wallet, args[0])
+    elif operation.name == "deposit_tokens":
+        token_contract.transfer(wallet, args[1], sender=sender)
+
+
+@pytest.mark.model
+@pytest.mark.parametrize("seed", range(5))
+def test_model_and_contract_agree_on_sampled_sequences(
+    seed, owners, not_owner, wallet, lens, token_contract
+):
+    addresses = [owner.address for owner in owners]
+    accounts_by_address = {account.address: account for account in owners}
+    accounts_by_address[not_owner.address] = not_owner
+
+    ledger = Ledger(
+        token_balances={
+            (token_contract.address, address): token_contract.balanceOf(address)
+            for address in addresses
+        }
+    )
+    model = WalletModel(
+        addresses, wallet.getRequiredApprovals(), wallet.address, ledger
+    )
+    operations = random_operations(
+        random.Random(seed),
+        addresses,
+        [not_owner.address],
+        length=30,
+        tokens=[token_contract.address],
+        txn_types=(TxnType.ETH, TxnType.TOKEN),
+    )
+
+    for operation in operations:
+        expected = model.apply(operation)
+        try:
+            replay(operation, accounts_by_address, wallet, token_contract)
+            actual = None
+        except ContractLogicError as error:
+            actual = revert_name(error)
+
+        assert actual == expected, operation
+
+    assert lens.getEthTxnCount(wallet) == model.get_txn_count(TxnType.ETH)
+    assert lens.getTokenTxnCount(wallet) == model.get_txn_count(TxnType.TOKEN)
+    for txn_index in range(model.get_txn_count(TxnType.ETH)):
+        expected = model.get_txn_details(TxnType.ETH, txn_index)
+        txn_details = lens.getEthTxnDetails(wallet, txn_index)
+
+        assert txn_details[1] == expected[1]
+        assert list(txn_details[2]) == list(expected[2])
+    for txn_index in range(model.get_txn_count(TxnType.TOKEN)):
+        expected = model.get_txn_details(TxnType.TOKEN, txn_index)
+        txn_details = lens.getTokenTxnDetails(wallet, txn_index)
+
+        assert txn_details[0] == expected[0]
+        assert txn_details[2] == expected[2]
+        assert list(txn_details[5]) == list(expected[5])
+    assert lens.getWalletEthBalance(wallet) == model.ledger.eth_balance
+    assert lens.getWalletTokenBalance(wallet, token_contract) == ledger.token_balance(
+        token_contract.address, wallet.address
+    )
@@ -0,0 +1,125 @@
+import pytest
+from hypothesis import given, settings, strategies as st
+
+from multi_sig_wallet.model import (
+    Operation,
+    TxnType,
+    WalletModel,
+    WalletRevert,
+    fuzz,
+    run_sequence,
+)
+
+OWNERS = ("0xOwner0", "0xOwner1", "0xOwner2")
+OUTSIDERS = ("0xOutsider",)
+TOKENS = ("0xToken",)
+NFTS = ("0xNft",)
+
+
+def check_invariants(model, operations, outcomes):
+    for txn_type in TxnType:
+        for txn_index, txn in enumerate(model.txns[txn_type]):
+            approvers = model.approvers.get((txn_type, txn_index), set())
+
+            assert txn.approvals == len(approvers)
+            assert approvers <= model.owners
+            assert not txn.executed or txn.approvals >= model.required_approvals
+
+    executions = {}
+    for operation, outcome in zip(operations, outcomes):
+        if operation.name.endswith("_txn") and operation.sender not in model.owners:
+            assert outcome == "MultiSigWallet__NotOneOfTheOwners"
+        if operation.name == "execute_txn" and outcome is None:
+            executions[operation.args] = executions.get(operation.args, 0) + 1
+
+    assert all(count == 1 for count in executions.values())
+
+
+operations = st.lists(
+    st.one_of(
+        st.builds(
+            Operation,
+            st.just("issue_eth_txn"),
+            st.sampled_from(OWNERS + OUTSIDERS),
+            st.tuples(st.sampled_from(OUTSIDERS), st.integers(0, 5)),
+        ),
+        st.builds(
+            Operation,
+            st.sampled_from(["approve_txn", "execute_txn"]),
+            st.sampled_from(OWNERS + OUTSIDERS),
+            st.tuples(st.just(TxnType.ETH), st.integers(0, 4)),
+        ),
+        st.builds(
+            Operation,
+            st.just("deposit_eth"),
+            st.sampled_from(OWNERS),
+            st.tuples(st.integers(1, 5)),
+        ),
+    ),
+    max_size=40,
+)
+
+
+@pytest.mark.model
+@settings(max_examples=500, deadline=None)
+@given(operations)
+def test_model_invariants_hold_for_any_eth_txn_sequence(eth_operations):
+    model = WalletModel(OWNERS, 2)
+    outcomes = run_sequence(model, eth_operations)
+
+    check_invariants(model, eth_operations, outcomes)
+
+
+@pytest.mark.model
+def test_model_invariants_hold_across_txn_types():
+    applied = fuzz(
+        OWNERS,
+        2,
+        OUTSIDERS,
+        sequences=20_000,
+        length=20,
+        tokens=TOKENS,
+        nfts=NFTS,
+        check=check_invariants,
+    )
+
+    assert applied == 400_000
+
+
+@pytest.mark.model
+def test_model_rejects_double_approval():
+    model = WalletModel(OWNERS, 2)
+    model.issue_eth_txn(OWNERS[0], OUTSIDERS[0], 1)
+    model.approve_txn(OWNERS[0], TxnType.ETH, 0)
+
+    with pytest.raises(WalletRevert) as revert:
+        model.approve_txn(OWNERS[0], TxnType.ETH, 0)
+
+    assert revert.value.error == "MultiSigWallet__TxnAlreadyApproved"
+
+
+@pytest.mark.model
+def test_model_rejects_index_equal_to_txn_count():
+    model = WalletModel(OWNERS, 2)
+    model.issue_eth_txn(OWNERS[0], OUTSIDERS[0], 1)
+
+    with pytest.raises(WalletRevert) as revert:
+        model.approve_txn(OWNERS[0], TxnType.ETH, 1)
+
+    assert revert.value.error == "MultiSigWallet__InvalidIndex"
+
+
+@pytest.mark.model
+def test_model_executes_txns_only_once():
+    model = WalletModel(OWNERS, 2)
+    model.deposit_eth(OWNERS[0], 2)
+    model.issue_eth_txn(OWNERS[0], OUTSIDERS[0], 1)
+    model.approve_txn(OWNERS[0], TxnType.ETH, 0)
+    model.approve_txn(OWNERS[1], TxnType.ETH, 0)
+    model.execute_txn(OWNERS[0], TxnType.ETH, 0)
+
+    with pytest.raises(WalletRevert) as revert:
+        model.execute_txn(OWNERS[1], TxnType.ETH, 0)
+
+    assert revert.value.error == "MultiSigWallet__TxnAlreadyExecuted"
+    assert model.ledger.eth_balance == 1
@@ -4,10 +4,10 @@ import ape
 
 @pytest.mark.txn_issual
 def test_nft_transfer_txn_issual(
-    owners, not_owner, wallet, test_nft, issue_nft_transfer_txn
+    owners, not_owner, wallet, lens, test_nft, issue_nft_transfer_txn
 ):
     issue_nft_transfer_txn(owners[0])
-    txn_details = wallet.getNftTxnDetails(0)
+    txn_details = lens.getNftTxnDetails(wallet, 0)
 
     assert txn_details[0] == 0
     assert txn_details[1] == not_owner
@@ -19,10 +19,10 @@ def test_nft_transfer_txn_issual(
 
 @pytest.mark.txn_issual
 def test_nft_transfer_from_txn_issual(
-    owners, not_owner, wallet, test_nft, issue_nft_transfer_from_txn
+    owners, not_owner, wallet, lens, test_nft, issue_nft_transfer_from_txn
 ):
     issue_nft_transfer_from_txn(owners[0])
-    txn_details = wallet.getNftTxnDetails(0)
+    txn_details = lens.getNftTxnDetails(wallet, 0)
 
     assert txn_details[0] == 1
     assert txn_details[1] == not_owner
@@ -34,10 +34,10 @@ def test_nft_transfer_from_txn_issual(
 
 @pytest.mark.txn_issual
 def test_nft_approval_txn_issual(
-    owners, not_owner, wallet, test_nft, issue_nft_approval_txn
+    owners, not_owner, wallet, lens, test_nft, issue_nft_approval_txn
 ):
     issue_nft_approval_txn(owners[0])
-    txn_details = wallet.getNftTxnDetails(0)
+    txn_details = lens.getNftTxnDetails(wallet, 0)
 
     assert txn_details[0] == 2
     assert txn_details[1] == not_owner
@@ -50,7 +50,9 @@ def test_nft_approval_txn_issual(
 @pytest.mark.txn_issual
 def test_any_nft_txn_emits_txn_issued_event(
     owners,
+    not_owner,
     wallet,
+    test_nft,
     issue_nft_transfer_txn,
     issue_nft_transfer_from_txn,
     issue_nft_approval_txn,
@@ -68,6 +70,10 @@ def test_any_nft_txn_emits_txn_issued_event(
         assert logs[0].txnType == 2
         assert logs[0].txnIndex == count
         assert logs[0].by == owners[0]
+        assert logs[0].action == count
+        assert logs[0].to == not_owner
+        assert logs[0].amountOrTokenId == 1
+        assert logs[0].assetAddress == test_nft
 
         count += 1
 
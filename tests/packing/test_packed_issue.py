@@ -0,0 +1,76 @@
+import pytest
+import ape
+
+from multi_sig_wallet.model import Txn, TxnAction, TxnType
+from multi_sig_wallet.packing import asset_indexes, encode_txn, encode_txns
+
+
+@pytest.mark.packing
+def test_packed_issue_matches_the_abi_issue_functions(
+    owners, not_owner, wallet, token_contract, test_nft
+):
+    wallet.registerAssets([token_contract, test_nft, token_contract], sender=owners[0])
+    assets = wallet.getAssets()
+    txns = [
+        (TxnType.ETH, Txn(TxnAction.TRANSFER, not_owner.address, 10**18)),
+        (
+            TxnType.TOKEN,
+            Txn(
+                TxnAction.TRANSFER_FROM,
+                not_owner.address,
+                5,
+                owners[1].address,
+                token_contract.address,
+            ),
+        ),
+        (
+            TxnType.TOKEN,
+            Txn(TxnAction.APPROVE, not_owner.address, 0, asset=token_contract.address),
+        ),
+        (
+            TxnType.NFT,
+            Txn(TxnAction.TRANSFER, not_owner.address, 1, asset=test_nft.address),
+        ),
+    ]
+
+    receipt = wallet.issuePackedTxns(
+        encode_txns(txns, asset_indexes(assets)), sender=owners[1]
+    )
+
+    assert assets == [token_contract.address, test_nft.address]
+    assert wallet.getTxnCounts() == (1, 2, 1)
+    assert [log.by for log in receipt.events] == [owners[1].address] * 4
+    for txn_type, txn_index, (_, txn) in zip(
+        (TxnType.ETH, TxnType.TOKEN, TxnType.TOKEN, TxnType.NFT), (0, 0, 1, 0), txns
+    ):
+        action, to, amount, provider, asset, details = wallet.getTxn(
+            txn_type, txn_index
+        )
+        assert (action, to, amount, provider, asset) == (
+            txn.action,
+            txn.to,
+            txn.amount,
+            txn.allowance_provider,
+            txn.asset,
+        )
+        assert details.approvals == 0
+
+
+@pytest.mark.packing
+def test_packed_issue_reverts_on_malformed_records(
+    owners, not_owner, wallet, token_contract
+):
+    wallet.registerAssets([token_contract], sender=owners[0])
+    txn = Txn(
+        TxnAction.TRANSFER, not_owner.address, 10**18, asset=token_contract.address
+    )
+    record = encode_txn(TxnType.TOKEN, txn, {token_contract.address.lower(): 0})
+
+    with ape.reverts(wallet.MultiSigWallet__NotOneOfTheOwners):
+        wallet.issuePackedTxns(record, sender=not_owner)
+    with ape.reverts(wallet.MultiSigWallet__InvalidPackedTxn):
+        wallet.issuePackedTxns(record[:-1], sender=owners[0])
+    with ape.reverts(wallet.MultiSigWallet__UnknownAssetIndex):
+        wallet.issuePackedTxns(record[:-2] + b"\x00\x01", sender=owners[0])
+    with ape.reverts(wallet.MultiSigWallet__InvalidPackedTxn):
+        wallet.issuePackedTxns(bytes([0x02]) + record[1:], sender=owners[0])
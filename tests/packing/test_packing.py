@@ -0,0 +1,93 @@
+import pytest
+from hypothesis import given, strategies as st
+
+from multi_sig_wallet.contracts import ContractAbi
+from multi_sig_wallet.model import ZERO_ADDRESS, Txn, TxnAction, TxnType
+from multi_sig_wallet.packing import (
+    PackingError,
+    asset_indexes,
+    decode_txns,
+    encode_txn,
+    encode_txns,
+    unregistered_assets,
+)
+
+ASSETS = ["0x" + "aa" * 20, "0x" + "bb" * 20]
+RECIPIENT = "0x" + "11" * 20
+PROVIDER = "0x" + "22" * 20
+
+addresses = st.binary(min_size=20, max_size=20).map(lambda raw: "0x" + raw.hex())
+amounts = st.one_of(st.integers(0, 2**64), st.integers(0, 2**256 - 1))
+
+
+@st.composite
+def packable_txns(draw):
+    txn_type = draw(st.sampled_from(TxnType))
+    if txn_type == TxnType.ETH:
+        return txn_type, Txn(TxnAction.TRANSFER, draw(addresses), draw(amounts))
+
+    action = draw(st.sampled_from(TxnAction))
+    provider = draw(addresses) if action == TxnAction.TRANSFER_FROM else ZERO_ADDRESS
+    txn = Txn(
+        action, draw(addresses), draw(amounts), provider, draw(st.sampled_from(ASSETS))
+    )
+    return txn_type, txn
+
+
+@pytest.mark.packing
+@given(st.lists(packable_txns(), max_size=20))
+def test_packed_txns_round_trip(txns):
+    records = encode_txns(txns, asset_indexes(ASSETS))
+
+    assert decode_txns(records, ASSETS) == txns
+
+
+@pytest.mark.packing
+def test_packed_records_are_a_fraction_of_the_abi_encoding():
+    abi = ContractAbi.named("MultiSigWallet")
+    txn = Txn(TxnAction.TRANSFER_FROM, RECIPIENT, 10**18, PROVIDER, ASSETS[1])
+
+    record = encode_txn(TxnType.TOKEN, txn, asset_indexes(ASSETS))
+    abi_call = abi.encode_call(
+        "issueTokenTransferFromTxn", RECIPIENT, 10**18, PROVIDER, ASSETS[1]
+    )
+
+    # kind, recipient, amount length, 8 amount bytes, asset index, provider
+    assert len(record) == 1 + 20 + 1 + 8 + 2 + 20
+    assert len(abi_call) == 4 + 4 * 32
+
+
+@pytest.mark.packing
+def test_malformed_txns_are_not_packed_or_unpacked():
+    indexes = asset_indexes(ASSETS)
+    token_txn = Txn(TxnAction.TRANSFER, RECIPIENT, 1, asset=ASSETS[0])
+
+    with pytest.raises(PackingError):
+        encode_txn(TxnType.ETH, Txn(TxnAction.APPROVE, RECIPIENT, 1), indexes)
+    with pytest.raises(PackingError):
+        encode_txn(
+            TxnType.TOKEN,
+            Txn(TxnAction.TRANSFER, RECIPIENT, 1, asset=PROVIDER),
+            indexes,
+        )
+
+    record = encode_txn(TxnType.TOKEN, token_txn, indexes)
+    with pytest.raises(PackingError):
+        decode_txns(record[:-1], ASSETS)
+    with pytest.raises(PackingError):
+        decode_txns(record, ASSETS[:0])
+    with pytest.raises(PackingError):
+        decode_txns(bytes([0x33]) + record[1:], ASSETS)
+
+
+@pytest.mark.packing
+def test_unregistered_assets_are_listed_once_in_first_use_order():
+    txns = [
+        (TxnType.NFT, Txn(TxnAction.TRANSFER, RECIPIENT, 1, asset=PROVIDER)),
+        (TxnType.TOKEN, Txn(TxnAction.TRANSFER, RECIPIENT, 1, asset=ASSETS[0])),
+        (TxnType.TOKEN, Txn(TxnAction.APPROVE, RECIPIENT, 1, asset=RECIPIENT)),
+        (TxnType.NFT, Txn(TxnAction.APPROVE, RECIPIENT, 2, asset=PROVIDER)),
+        (TxnType.ETH, Txn(TxnAction.TRANSFER, RECIPIENT, 1)),
+    ]
+
+    assert unregistered_assets(txns, ASSETS) == [PROVIDER, RECIPIENT]
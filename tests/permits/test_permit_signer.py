@@ -0,0 +1,120 @@
+import pytest
+from eth_abi import encode
+from eth_account import Account
+from eth_hash.auto import keccak
+from eth_keys import keys
+
+from multi_sig_wallet.contracts import ContractAbi
+from multi_sig_wallet.permits import PermitDomain, sign_permit
+from multi_sig_wallet.rpc import RpcError
+
+PRIVATE_KEY = "0x" + "42" * 32
+WALLET = "0x" + "11" * 20
+DOMAIN = PermitDomain("TestToken", "1", 31337, "0x" + "22" * 20)
+
+
+def domain_separator(domain):
+    """The DOMAIN_SEPARATOR() of a token with the domain, computed by hand."""
+
+    return keccak(
+        encode(
+            ["bytes32", "bytes32", "bytes32", "uint256", "address"],
+            [
+                keccak(
+                    b"EIP712Domain(string name,string version,uint256 chainId,"
+                    b"address verifyingContract)"
+                ),
+                keccak(domain.name.encode()),
+                keccak(domain.version.encode()),
+                domain.chain_id,
+                domain.verifying_contract,
+            ],
+        )
+    )
+
+
+def permit_digest(owner, spender, value, nonce, deadline, domain=DOMAIN):
+    """The digest ERC20Permit.permit() recovers the signer from, computed by hand."""
+
+    struct_hash = keccak(
+        encode(
+            ["bytes32", "address", "address", "uint256", "uint256", "uint256"],
+            [
+                keccak(
+                    b"Permit(address owner,address spender,uint256 value,"
+                    b"uint256 nonce,uint256 deadline)"
+                ),
+                owner,
+                spender,
+                value,
+                nonce,
+                deadline,
+            ],
+        )
+    )
+    return keccak(b"\x19\x01" + domain_separator(domain) + struct_hash)
+
+
+def recover(digest, permit):
+    signature = keys.Signature(
+        vrs=(
+            permit.v - 27,
+            int.from_bytes(permit.r, "big"),
+            int.from_bytes(permit.s, "big"),
+        )
+    )
+    return signature.recover_public_key_from_msg_hash(digest).to_checksum_address()
+
+
+@pytest.mark.permits
+def test_permit_is_signed_by_the_allowance_provider():
+    permit = sign_permit(PRIVATE_KEY, DOMAIN, WALLET, 10**18, 3, 2**40)
+    digest = permit_digest(permit.owner, WALLET, 10**18, 3, 2**40)
+
+    signer = recover(digest, permit)
+
+    assert permit.owner == Account.from_key(PRIVATE_KEY).address
+    assert signer == permit.owner
+    assert permit.v in (27, 28)
+    assert len(permit.r) == len(permit.s) == 32
+    assert permit.execution_args(5) == (5, 2**40, permit.v, permit.r, permit.s)
+
+
+@pytest.mark.permits
+def test_permit_signature_is_bound_to_its_domain_and_nonce():
+    permit = sign_permit(PRIVATE_KEY, DOMAIN, WALLET, 10**18, 3, 2**40)
+    other_chain = PermitDomain("TestToken", "1", 1, DOMAIN.verifying_contract)
+
+    for digest in (
+        permit_digest(permit.owner, WALLET, 10**18, 4, 2**40),
+        permit_digest(permit.owner, WALLET, 10**18, 3, 2**40, other_chain),
+    ):
+        assert recover(digest, permit) != permit.owner
+
+
+class PreErc5267Token:
+    """Answers like an EIP-2612 token without eip712Domain(), such as OpenZeppelin's before 4.9."""
+
+    def __init__(self, domain):
+        self.domain = domain
+        self.abi = ContractAbi.named("TestToken")
+
+    def request(self, method, params=()):
+        if method == "eth_chainId":
+            return hex(self.domain.chain_id)
+        selector = bytes.fromhex(params[0]["data"][2:10])
+        if selector == self.abi.selector("name"):
+            return "0x" + encode(["string"], [self.domain.name]).hex()
+        if selector == self.abi.selector("DOMAIN_SEPARATOR"):
+            return "0x" + domain_separator(self.domain).hex()
+        raise RpcError(3, "execution reverted", "0x")
+
+
+@pytest.mark.permits
+def test_domains_of_tokens_without_eip712_domain_are_checked_against_their_separator():
+    token = PreErc5267Token(DOMAIN)
+
+    assert DOMAIN.separator() == domain_separator(DOMAIN)
+    assert PermitDomain.fetch(token, DOMAIN.verifying_contract) == DOMAIN
+    with pytest.raises(ValueError):
+        PermitDomain.fetch(token, DOMAIN.verifying_contract, version="2")
@@ -0,0 +1,194 @@
+import pytest
+
+from multi_sig_wallet.profiler import (
+    Compilation,
+    GasProfile,
+    SourceMapEntry,
+    decode_source_map,
+    instruction_indexes,
+)
+
+WALLET = "0x" + "aa" * 20
+TOKEN = "0x" + "bb" * 20
+SOURCE = """contract Wallet {
+    function pay() external {
+        token.balanceOf();
+        helper();
+    }
+    function helper() internal {
+        count += 1;
+    }
+}
+contract Token {
+    function balanceOf() external {
+        return;
+    }
+}
+"""
+
+
+def src(snippet, end_snippet=None):
+    start = SOURCE.index(snippet)
+    end = SOURCE.index(end_snippet, start) + len(end_snippet) if end_snippet else None
+    return f"{start}:{(end or start + len(snippet)) - start}:0"
+
+
+def function_node(name, snippet, end_snippet):
+    return {
+        "nodeType": "FunctionDefinition",
+        "name": name,
+        "src": src(snippet, end_snippet),
+    }
+
+
+def contract_output(code, source_map):
+    return {
+        "evm": {
+            "bytecode": {"object": code, "sourceMap": source_map},
+            "deployedBytecode": {"object": code, "sourceMap": source_map},
+        }
+    }
+
+
+def compilation():
+    ast = {
+        "nodes": [
+            {
+                "nodeType": "ContractDefinition",
+                "name": "Wallet",
+                "nodes": [
+                    function_node("pay", "function pay", "();\n    }"),
+                    function_node("helper", "function helper", "+= 1;\n    }"),
+                ],
+            },
+            {
+                "nodeType": "ContractDefinition",
+                "name": "Token",
+                "nodes": [
+                    function_node("balanceOf", "function balanceOf", "return;\n    }")
+                ],
+            },
+        ]
+    }
+    # PUSH1 0 PUSH1 0 CALL JUMP JUMPDEST SSTORE JUMP JUMPDEST STOP
+    wallet_code = "6000" "6000" "f1" "56" "5b" "55" "56" "5b" "00"
+    wallet_map = ";".join(
+        [
+            src("token.balanceOf()") + ":-",
+            "",
+            "",
+            src("helper();") + ":i",
+            src("count += 1") + ":-",
+            "",
+            src("count += 1") + ":o",
+            src("helper();") + ":-",
+            "",
+        ]
+    )
+    token_code = "6000" "00"
+    token_map = src("return;") + ":-;"
+    output = {
+        "sources": {"Wallet.sol": {"id": 0, "ast": ast}},
+        "contracts": {
+            "Wallet.sol": {
+                "Wallet": contract_output(wallet_code, wallet_map),
+                "Token": contract_output(token_code, token_map),
+            }
+        },
+    }
+    return Compilation(output, lambda path: SOURCE)
+
+
+def frame(pc, op, gas, gas_cost, depth, stack=()):
+    return {
+        "pc": pc,
+        "op": op,
+        "gas": gas,
+        "gasCost": gas_cost,
+        "depth": depth,
+        "stack": list(stack),
+    }
+
+
+STRUCT_LOGS = [
+    frame(0, "PUSH1", 1000, 3, 1),
+    frame(2, "PUSH1", 997, 3, 1),
+    # forwards 500 gas to the token, which uses 5 of it
+    frame(4, "CALL", 994, 600, 1, ["0x0", TOKEN, "0x1f4"]),
+    frame(0, "PUSH1", 500, 3, 2),
+    frame(2, "STOP", 497, 0, 2),
+    frame(5, "JUMP", 380, 8, 1),
+    frame(6, "JUMPDEST", 372, 1, 1),
+    frame(7, "SSTORE", 371, 100, 1),
+    frame(8, "JUMP", 271, 8, 1),
+    frame(9, "JUMPDEST", 263, 1, 1),
+    frame(10, "STOP", 262, 0, 1),
+]
+
+
+def profile_of_struct_logs():
+    contracts = compilation().contracts
+    addresses = {WALLET: contracts["Wallet"], TOKEN: contracts["Token"]}
+    profile = GasProfile(compilation(), addresses.get)
+    execution_gas = profile.add_trace(STRUCT_LOGS, WALLET)
+    return profile, execution_gas
+
+
+@pytest.mark.profiler
+def test_source_maps_are_decompressed_per_instruction():
+    entries = decode_source_map("1:2:0:-;:3;;5:1:-1:i")
+
+    assert entries == [
+        SourceMapEntry(1, 2, 0, "-"),
+        SourceMapEntry(1, 3, 0, "-"),
+        SourceMapEntry(1, 3, 0, "-"),
+        SourceMapEntry(5, 1, -1, "i"),
+    ]
+
+
+@pytest.mark.profiler
+def test_instruction_indexes_skip_push_data():
+    # PUSH1 01 PUSH2 0203 STOP
+    assert instruction_indexes(bytes.fromhex("600161020300")) == {0: 0, 2: 1, 5: 2}
+
+
+@pytest.mark.profiler
+def test_trace_gas_adds_up_to_the_execution_gas():
+    profile, execution_gas = profile_of_struct_logs()
+
+    assert execution_gas == 1000 - 262
+    assert sum(profile.lines.values()) == execution_gas
+    assert sum(profile.functions.values()) == execution_gas
+    assert sum(profile.opcodes.values()) == execution_gas
+
+
+@pytest.mark.profiler
+def test_gas_forwarded_by_a_call_is_charged_to_the_callee():
+    profile, _ = profile_of_struct_logs()
+
+    assert profile.functions["Token.balanceOf"] == 3
+    # the CALL keeps what it cost on its own, without the callee's execution
+    assert profile.opcodes["CALL"] == 994 - 380 - 3
+    balance_of_line = SOURCE[: SOURCE.index("token.balanceOf()")].count("\n") + 1
+    assert profile.lines[(0, balance_of_line)] == 3 + 3 + 994 - 380 - 3
+
+
+@pytest.mark.profiler
+def test_internal_calls_and_external_calls_fold_into_stacks():
+    profile, _ = profile_of_struct_logs()
+    stacks = dict(line.rsplit(" ", 1) for line in profile.folded_stacks().splitlines())
+
+    assert stacks["Wallet.pay;Token.balanceOf"] == "3"
+    assert stacks["Wallet.pay;Wallet.helper"] == str(1 + 100 + 8)
+    assert int(stacks["Wallet.pay"]) == (1000 - 262) - 3 - 109
+
+
+@pytest.mark.profiler
+def test_line_rows_show_the_source_of_the_most_expensive_lines():
+    profile, execution_gas = profile_of_struct_logs()
+
+    gas, share, location, text = profile.line_rows(top=1)[0]
+
+    assert location == "Wallet.sol:3"
+    assert text == "token.balanceOf();"
+    assert share == pytest.approx(gas / execution_gas)
@@ -0,0 +1,62 @@
+import pytest
+
+from multi_sig_wallet.profiler import (
+    ContractResolver,
+    GasProfile,
+    compile_ape_project,
+    fetch_struct_logs,
+)
+from multi_sig_wallet.rpc import HttpRpc
+
+
+@pytest.fixture(scope="module")
+def compilation():
+    return compile_ape_project()
+
+
+@pytest.fixture
+def profile(compilation, web3):
+    resolver = ContractResolver(
+        compilation,
+        lambda address: web3.eth.get_code(web3.to_checksum_address(address)),
+    )
+    return GasProfile(compilation, resolver)
+
+
+@pytest.mark.profiler
+def test_token_execution_profile_separates_the_balance_check_from_the_transfer(
+    owners, wallet, token_contract, issue_token_transfer_txn, profile, rpc_url
+):
+    issue_token_transfer_txn(owners[0])
+    wallet.approveTxn(1, 0, sender=owners[0])
+    wallet.approveTxn(1, 0, sender=owners[1])
+    token_contract.transfer(wallet, "1 ether", sender=owners[0])
+    receipt = wallet.executeTxn(1, 0, sender=owners[0])
+
+    struct_logs = fetch_struct_logs(HttpRpc(rpc_url), receipt.txn_hash)
+    execution_gas = profile.add_trace(struct_logs, wallet.address)
+
+    assert 0 < execution_gas < receipt.gas_used
+    assert sum(profile.lines.values()) == execution_gas
+    assert (
+        0 < profile.functions["ERC20.balanceOf"] < profile.functions["ERC20.transfer"]
+    )
+    assert profile.functions["MultiSigWallet.executeTokenTxn"] > 0
+    assert any(
+        stack.startswith("MultiSigWallet.executeTxn;MultiSigWallet.executeTokenTxn;")
+        and "ERC20.transfer" in stack
+        for stack in profile.stacks
+    )
+
+
+@pytest.mark.profiler
+def test_factory_profile_attributes_the_wallet_constructor(
+    owners, factory, profile, rpc_url
+):
+    receipt = factory.deployWallet(owners, 2, sender=owners[0])
+
+    struct_logs = fetch_struct_logs(HttpRpc(rpc_url), receipt.txn_hash)
+    profile.add_trace(struct_logs, factory.address)
+
+    assert profile.functions["Factory.deployWallet"] > 0
+    assert profile.functions["MultiSigWallet.constructor"] > 0
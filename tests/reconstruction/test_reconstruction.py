@@ -0,0 +1,159 @@
+import pytest
+
+from multi_sig_wallet.contracts import ContractAbi
+from multi_sig_wallet.model import TxnType
+from multi_sig_wallet.reconstruction import (
+    ReconstructionError,
+    fetch_wallet_logs,
+    reconstruct,
+)
+from multi_sig_wallet.rpc import HttpRpc
+
+WALLET = "0x" + "aa" * 20
+OWNER = "0x" + "11" * 20
+OTHER_OWNER = "0x" + "22" * 20
+RECIPIENT = "0x" + "33" * 20
+TOKEN = "0x" + "44" * 20
+ZERO = "0x" + "00" * 20
+
+
+def wallet_log(name, block_number, log_index, **args):
+    """Encodes a wallet event the way eth_getLogs returns it."""
+
+    topics, data = ContractAbi.named("MultiSigWallet").encode_log(name, args)
+    return {
+        "address": WALLET,
+        "topics": topics,
+        "data": data,
+        "blockNumber": hex(block_number),
+        "logIndex": hex(log_index),
+    }
+
+
+def issued(block_number, txn_type, txn_index, **payload):
+    return wallet_log(
+        "TxnIssued",
+        block_number,
+        0,
+        txnType=txn_type,
+        txnIndex=txn_index,
+        by=OWNER,
+        **{
+            "action": 0,
+            "to": RECIPIENT,
+            "amountOrTokenId": 5,
+            "allowanceProvider": ZERO,
+            "assetAddress": ZERO,
+            **payload,
+        },
+    )
+
+
+def approved(block_number, txn_type, txn_index, by, approvals):
+    return wallet_log(
+        "TxnApproved",
+        block_number,
+        0,
+        txnType=txn_type,
+        txnIndex=txn_index,
+        by=by,
+        approvals=approvals,
+    )
+
+
+@pytest.mark.reconstruction
+def test_queue_is_rebuilt_from_logs_in_any_order():
+    logs = [
+        approved(4, 1, 0, OTHER_OWNER, 2),
+        issued(1, 0, 0),
+        issued(2, 1, 0, action=2, assetAddress=TOKEN, amountOrTokenId=7),
+        approved(3, 1, 0, OWNER, 1),
+        wallet_log("TxnExecuted", 5, 0, txnType=1, txnIndex=0, by=OWNER),
+    ]
+
+    queue = reconstruct(logs)[WALLET]
+
+    assert queue.get_txn_count(TxnType.ETH) == 1
+    assert queue.get_txn_details(TxnType.ETH, 0) == (RECIPIENT, 5, (0, False))
+    assert queue.get_txn_details(TxnType.TOKEN, 0) == (
+        2,
+        RECIPIENT,
+        7,
+        ZERO,
+        TOKEN,
+        (2, True),
+    )
+    assert [(txn_type, txn_index) for txn_type, txn_index, _ in queue.pending()] == [
+        (TxnType.ETH, 0)
+    ]
+
+
+@pytest.mark.reconstruction
+def test_replaying_overlapping_logs_does_not_double_count():
+    first_range = [issued(1, 0, 0), approved(2, 0, 0, OWNER, 1)]
+    queues = reconstruct(first_range)
+
+    reconstruct(first_range + [approved(3, 0, 0, OTHER_OWNER, 2)], queues)
+
+    assert queues[WALLET].get_txn_details(TxnType.ETH, 0) == (RECIPIENT, 5, (2, False))
+
+
+@pytest.mark.reconstruction
+def test_missing_logs_are_detected():
+    with pytest.raises(ReconstructionError):
+        reconstruct([issued(1, 0, 0), issued(2, 0, 2)])
+
+    with pytest.raises(ReconstructionError):
+        reconstruct([issued(1, 0, 0), approved(2, 0, 0, OTHER_OWNER, 2)])
+
+
+def normalized(value):
+    if isinstance(value, str):
+        return value.lower()
+    if isinstance(value, (bool, int)):
+        return value
+    return tuple(normalized(item) for item in value)
+
+
+@pytest.mark.reconstruction
+def test_queue_rebuilt_from_logs_matches_the_on_chain_views(
+    owners,
+    not_owner,
+    wallet,
+    lens,
+    token_contract,
+    issue_eth_txn,
+    issue_token_transfer_txn,
+    issue_token_approval_txn,
+    issue_nft_transfer_txn,
+    web3,
+    rpc_url,
+):
+    from_block = web3.eth.block_number
+    owners[0].transfer(wallet, "1 ether")
+    token_contract.transfer(wallet, "1 ether", sender=owners[0])
+    issue_eth_txn(owners[0])
+    issue_token_transfer_txn(owners[1])
+    issue_token_approval_txn(owners[2])
+    issue_nft_transfer_txn(owners[0])
+    for txn_type, txn_index, approvers in [(0, 0, 2), (1, 0, 3), (1, 1, 1), (2, 0, 1)]:
+        for owner in owners[:approvers]:
+            wallet.approveTxn(txn_type, txn_index, sender=owner)
+    wallet.executeTxn(0, 0, sender=owners[1])
+    wallet.executeTxn(1, 0, sender=owners[2])
+
+    logs = fetch_wallet_logs(HttpRpc(rpc_url), [wallet.address], from_block)
+    queue = reconstruct(logs)[wallet.address.lower()]
+
+    views = [lens.getEthTxnDetails, lens.getTokenTxnDetails, lens.getNftTxnDetails]
+    assert tuple(wallet.getTxnCounts()) == tuple(
+        queue.get_txn_count(txn_type) for txn_type in TxnType
+    )
+    for txn_type, view in zip(TxnType, views):
+        for txn_index in range(queue.get_txn_count(txn_type)):
+            assert normalized(view(wallet, txn_index)) == normalized(
+                queue.get_txn_details(txn_type, txn_index)
+            )
+    assert normalized(queue.get_txn_details(TxnType.ETH, 0)) == normalized(
+        (not_owner.address, 10**18, (2, True))
+    )
@@ -0,0 +1,194 @@
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from multi_sig_wallet.client import lens_at, wallet_at
+from multi_sig_wallet.routing import RoutingRpc
+from multi_sig_wallet.rpc import RpcError
+
+ACCOUNT = "0x" + "11" * 20
+
+
+class FakeEndpoint:
+    """An in-process endpoint that answers with its own name, slowly or not at all."""
+
+    def __init__(self, url, delay=0.0, fail=False):
+        self.url = url
+        self.delay = delay
+        self.fail = fail
+        self.calls = []
+
+    def request(self, method, params=()):
+        self.calls.append(method)
+        time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionRefusedError(self.url)
+        return self.url
+
+
+class RevertingEndpoint(FakeEndpoint):
+    def request(self, method, params=()):
+        self.calls.append(method)
+        raise RpcError(3, "execution reverted", "0x")
+
+
+@pytest.mark.routing
+def test_reads_move_to_the_fastest_endpoint():
+    slow, fast = FakeEndpoint("slow", delay=0.02), FakeEndpoint("fast")
+    rpc = RoutingRpc([slow, fast], hedge_after=1)
+
+    answers = [rpc.request("eth_blockNumber") for _ in range(10)]
+
+    assert answers[-5:] == ["fast"] * 5
+    assert len(slow.calls) == 1
+
+
+@pytest.mark.routing
+def test_slow_reads_are_hedged_to_the_next_endpoint():
+    stuck, healthy = FakeEndpoint("stuck", delay=1), FakeEndpoint("healthy")
+    rpc = RoutingRpc([stuck, healthy], hedge_after=0.05)
+
+    started = time.monotonic()
+    answer = rpc.request("eth_call", [{}, "latest"])
+
+    assert answer == "healthy"
+    assert time.monotonic() - started < 0.5
+    assert rpc.hedges == 1
+
+
+@pytest.mark.routing
+def test_a_failed_hedge_fails_over_without_waiting_for_the_slow_endpoint():
+    stuck, down, up = (
+        FakeEndpoint("stuck", delay=1),
+        FakeEndpoint("down", fail=True),
+        FakeEndpoint("up"),
+    )
+    rpc = RoutingRpc([stuck, down, up], hedge_after=0.05)
+
+    started = time.monotonic()
+
+    assert rpc.request("eth_getBalance", [ACCOUNT, "latest"]) == "up"
+    assert time.monotonic() - started < 0.5
+
+
+@pytest.mark.routing
+def test_failing_endpoints_are_benched():
+    down, up = FakeEndpoint("down", fail=True), FakeEndpoint("up")
+    rpc = RoutingRpc([down, up], cooldown=60)
+
+    assert [rpc.request("eth_chainId") for _ in range(3)] == ["up"] * 3
+    assert len(down.calls) == 1
+    assert rpc.stats()[0].consecutive_failures == 1
+    assert rpc.ranked() == [1, 0]
+
+
+@pytest.mark.routing
+def test_node_errors_are_not_retried_elsewhere():
+    reverting, other = RevertingEndpoint("reverting"), FakeEndpoint("other")
+    rpc = RoutingRpc([reverting, other])
+
+    with pytest.raises(RpcError):
+        rpc.request("eth_call", [{}, "latest"])
+
+    assert other.calls == []
+    assert rpc.stats()[0].failures == 0
+
+
+@pytest.mark.routing
+def test_writes_stay_pinned_per_account_until_the_endpoint_fails():
+    first, second = FakeEndpoint("first", delay=0.02), FakeEndpoint("second")
+    rpc = RoutingRpc([first, second])
+    txn = {"from": ACCOUNT, "to": ACCOUNT}
+
+    assert rpc.request("eth_getTransactionCount", [ACCOUNT, "pending"]) == "first"
+    # the other endpoint is the faster one for reads
+    assert rpc.request("eth_blockNumber") == "second"
+    assert rpc.ranked()[0] == 1
+    assert rpc.request("eth_sendTransaction", [txn]) == "first"
+
+    first.fail = True
+    assert rpc.request("eth_sendTransaction", [txn]) == "second"
+    first.fail = False
+    assert rpc.request("eth_sendTransaction", [txn]) == "second"
+
+
+class FaultInjectingProxy:
+    """
+    Forwards JSON-RPC requests to a node over HTTP, after a delay, or
+    drops the connection, standing in for a degraded endpoint
+    """
+
+    def __init__(self, target, delay=0.0, fail=False):
+        self.delay = delay
+        self.fail = fail
+        proxy = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):  # pylint: disable=invalid-name
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                time.sleep(proxy.delay)
+                if proxy.fail:
+                    self.close_connection = True
+                    return
+                forwarded = urllib.request.Request(
+                    target, data=body, headers={"Content-Type": "application/json"}
+                )
+                with urllib.request.urlopen(forwarded) as response:
+                    reply = response.read()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(reply)))
+                self.end_headers()
+                self.wfile.write(reply)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def proxies(rpc_url):
+    slow = FaultInjectingProxy(rpc_url, delay=0.5)
+    broken = FaultInjectingProxy(rpc_url, fail=True)
+    yield slow, broken
+    slow.close()
+    broken.close()
+
+
+@pytest.mark.routing
+def test_routing_over_degraded_endpoints(
+    rpc_urls, proxies, owners, not_owner, wallet, lens
+):
+    slow, broken = proxies
+    rpc = RoutingRpc([slow.url, broken.url, *rpc_urls], hedge_after=0.1)
+    client = wallet_at(rpc, wallet.address)
+
+    started = time.monotonic()
+    for _ in range(5):
+        assert client.call("getRequiredApprovals") == 2
+    assert time.monotonic() - started < 2.5
+
+    txn_hashes = [
+        client.transact(
+            "issueEthTxn", not_owner.address, 1, private_key=owners[0].private_key
+        )
+        for _ in range(3)
+    ]
+    for txn_hash in txn_hashes:
+        assert int(client.wait_for_receipt(txn_hash)["status"], 16) == 1
+
+    assert lens_at(rpc, lens.address).call("getEthTxnCount", wallet.address) == 3
+    health = {endpoint.url: endpoint for endpoint in rpc.stats()}
+    assert health[broken.url].failures >= 1
+    assert health[slow.url].latency > health[rpc_urls[0]].latency
+    rpc.close()
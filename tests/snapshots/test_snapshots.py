@@ -0,0 +1,259 @@
+import pytest
+from eth_abi import encode
+
+from multi_sig_wallet.contracts import ContractAbi
+from multi_sig_wallet.model import Txn, TxnAction, TxnType
+from multi_sig_wallet.reconstruction import WalletQueue, fetch_wallet_logs, reconstruct
+from multi_sig_wallet.rpc import HttpRpc
+from multi_sig_wallet.snapshots import (
+    FleetState,
+    Snapshot,
+    SnapshotError,
+    StaleSnapshotError,
+    load_fleet,
+    rebuild,
+    write_snapshot,
+)
+
+OWNERS = ["0x" + "11" * 20, "0x" + "22" * 20, "0x" + "33" * 20]
+RECIPIENT = "0x" + "44" * 20
+TOKEN = "0x" + "55" * 20
+ZERO = "0x" + "00" * 20
+BLOCK_HASH = "0x" + "ab" * 32
+
+
+def wallet_address(number):
+    return "0x" + number.to_bytes(20, "big").hex()
+
+
+def wallet_queue(number):
+    queue = WalletQueue(wallet_address(number), owners=OWNERS, required_approvals=2)
+    queue.txns[TxnType.ETH].append(Txn(TxnAction.TRANSFER, RECIPIENT, number))
+    queue.txns[TxnType.TOKEN].append(
+        Txn(TxnAction.APPROVE, RECIPIENT, 2**255 + number, asset=TOKEN, approvals=2)
+    )
+    queue.approvers[(TxnType.TOKEN, 0)] = {OWNERS[0], OWNERS[2]}
+    queue.txns[TxnType.NFT].append(
+        Txn(TxnAction.TRANSFER_FROM, RECIPIENT, 7, OWNERS[1], TOKEN, 1, True)
+    )
+    queue.approvers[(TxnType.NFT, 0)] = {OWNERS[1]}
+    return queue
+
+
+class FakeNode:
+    """Answers the requests a fleet catch-up and rebuild make, from a list of logs."""
+
+    def __init__(self, logs, block_number, block_hash=BLOCK_HASH):
+        self.logs = logs
+        self.block_number = block_number
+        self.block_hash = block_hash
+
+    def request(self, method, params=()):
+        if method == "eth_blockNumber":
+            return hex(self.block_number)
+        if method == "eth_getBlockByNumber":
+            return {"hash": self.block_hash}
+        if method == "eth_call":
+            return "0x" + encode(["uint256"], [2]).hex()
+        if method == "eth_getLogs":
+            (log_filter,) = params
+            addresses = {address.lower() for address in log_filter["address"]}
+            return [
+                log
+                for log in self.logs
+                if log["address"] in addresses
+                and int(log_filter["fromBlock"], 16)
+                <= int(log["blockNumber"], 16)
+                <= int(log_filter["toBlock"], 16)
+            ]
+        raise NotImplementedError(method)
+
+
+def issued_log(wallet, block_number, txn_index):
+    topics, data = ContractAbi.named("MultiSigWallet").encode_log(
+        "TxnIssued",
+        {
+            "txnType": 0,
+            "txnIndex": txn_index,
+            "by": OWNERS[0],
+            "action": 0,
+            "to": RECIPIENT,
+            "amountOrTokenId": 100 + txn_index,
+            "allowanceProvider": ZERO,
+            "assetAddress": ZERO,
+        },
+    )
+    return {
+        "address": wallet,
+        "topics": topics,
+        "data": data,
+        "blockNumber": hex(block_number),
+        "logIndex": "0x0",
+    }
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    path = tmp_path / "fleet.snapshot"
+    write_snapshot(
+        path, [wallet_queue(number) for number in range(1, 301)], 10, BLOCK_HASH
+    )
+    return path
+
+
+@pytest.mark.snapshots
+def test_snapshot_round_trips_wallet_state(snapshot_path):
+    with Snapshot(snapshot_path) as snapshot:
+        assert len(snapshot) == 300
+        assert snapshot.block_number == 10
+        assert snapshot.block_hash == BLOCK_HASH
+
+        for number in (1, 150, 300):
+            expected, view = wallet_queue(number), snapshot.wallet(
+                wallet_address(number)
+            )
+            assert view.required_approvals == 2
+            assert view.owners == OWNERS
+            for txn_type in TxnType:
+                assert view.get_txn_count(txn_type) == 1
+                assert view.get_txn_details(txn_type, 0) == expected.get_txn_details(
+                    txn_type, 0
+                )
+            assert view.to_queue() == expected
+
+
+@pytest.mark.snapshots
+def test_wallets_missing_from_a_snapshot_are_not_found(snapshot_path):
+    with Snapshot(snapshot_path) as snapshot:
+        assert snapshot.wallet(wallet_address(301)) is None
+        assert wallet_address(0) not in snapshot
+        assert wallet_address(42) in snapshot
+
+
+@pytest.mark.snapshots
+def test_damaged_snapshots_are_rejected(snapshot_path):
+    data = snapshot_path.read_bytes()
+
+    snapshot_path.write_bytes(data[:-1])
+    with pytest.raises(SnapshotError):
+        Snapshot(snapshot_path)
+
+    snapshot_path.write_bytes(b"not a snapshot" + data[14:])
+    with pytest.raises(SnapshotError):
+        Snapshot(snapshot_path)
+
+
+@pytest.mark.snapshots
+def test_catch_up_only_loads_the_wallets_with_new_events(snapshot_path):
+    changed = wallet_address(7)
+    node = FakeNode(
+        [issued_log(changed, 9, 0), issued_log(changed, 11, 1)], block_number=12
+    )
+
+    state = FleetState(Snapshot(snapshot_path))
+    applied = state.catch_up(node)
+
+    assert applied == 1
+    assert state.block_number == 12
+    assert list(state.changed) == [changed]
+    assert state.wallet(changed).get_txn_details(TxnType.ETH, 1) == (
+        RECIPIENT,
+        101,
+        (0, False),
+    )
+
+
+@pytest.mark.snapshots
+def test_wallets_that_join_after_the_snapshot_are_rebuilt(snapshot_path):
+    changed, joined = wallet_address(7), wallet_address(400)
+    node = FakeNode(
+        [issued_log(changed, 11, 1), issued_log(joined, 11, 0)], block_number=12
+    )
+    fleet = {wallet_address(number): OWNERS for number in range(1, 301)}
+
+    state = load_fleet(snapshot_path, node, {**fleet, joined: OWNERS})
+
+    assert state.snapshot.block_number == 10
+    assert state.block_number == 12
+    assert state.wallet(changed).get_txn_count(TxnType.ETH) == 2
+    assert state.wallet(joined).owners == OWNERS
+    assert state.wallet(joined).required_approvals == 2
+    assert state.wallet(joined).get_txn_count(TxnType.ETH) == 1
+    assert joined in state.addresses()
+
+
+@pytest.mark.snapshots
+def test_catch_up_refuses_a_reorganized_snapshot(snapshot_path):
+    state = FleetState(Snapshot(snapshot_path))
+
+    with pytest.raises(StaleSnapshotError):
+        state.catch_up(FakeNode([], 12, block_hash="0x" + "cd" * 32))
+
+
+@pytest.mark.snapshots
+def test_fleet_is_rebuilt_when_the_snapshot_is_unusable(tmp_path):
+    path = tmp_path / "fleet.snapshot"
+    wallet = wallet_address(5)
+    node = FakeNode([issued_log(wallet, 3, 0)], block_number=4)
+
+    state = load_fleet(path, node, {wallet: OWNERS})
+
+    assert state.snapshot.block_number == 4
+    assert state.wallet(wallet).owners == OWNERS
+    assert state.wallet(wallet).required_approvals == 2
+    assert state.wallet(wallet).get_txn_count(TxnType.ETH) == 1
+
+
+@pytest.mark.snapshots
+def test_snapshots_hold_wallets_with_more_than_64_owners(tmp_path):
+    path = tmp_path / "fleet.snapshot"
+    many_owners = [wallet_address(1000 + number) for number in range(65)]
+    large = WalletQueue(wallet_address(2), owners=many_owners, required_approvals=40)
+    large.txns[TxnType.ETH].append(Txn(TxnAction.TRANSFER, RECIPIENT, 1, approvals=2))
+    large.approvers[(TxnType.ETH, 0)] = {many_owners[0], many_owners[64]}
+    wallets = [wallet_queue(1), large, wallet_queue(3)]
+    write_snapshot(path, wallets, 10, BLOCK_HASH)
+
+    with Snapshot(path) as snapshot:
+        for wallet in wallets:
+            assert snapshot.wallet(wallet.address).to_queue() == wallet
+
+    node = FakeNode([issued_log(large.address, 3, 0)], block_number=4)
+    state = load_fleet(
+        tmp_path / "rebuilt.snapshot", node, {large.address: many_owners}
+    )
+    assert state.wallet(large.address).owners == many_owners
+
+
+@pytest.mark.snapshots
+def test_snapshot_and_catch_up_match_a_full_rebuild(
+    owners, wallet, issue_eth_txn, issue_token_transfer_txn, rpc_url, tmp_path
+):
+    rpc = HttpRpc(rpc_url)
+    fleet = {wallet.address: [owner.address for owner in owners]}
+    issue_eth_txn(owners[0])
+    wallet.approveTxn(0, 0, sender=owners[1])
+
+    queues, block_number = rebuild(rpc, fleet)
+    block = rpc.request("eth_getBlockByNumber", [hex(block_number), False])
+    write_snapshot(
+        tmp_path / "fleet.snapshot", queues.values(), block_number, block["hash"]
+    )
+
+    issue_token_transfer_txn(owners[1])
+    wallet.approveTxn(1, 0, sender=owners[0])
+    wallet.approveTxn(0, 0, sender=owners[2])
+
+    state = load_fleet(tmp_path / "fleet.snapshot", rpc, fleet)
+    rebuilt = reconstruct(fetch_wallet_logs(rpc, list(fleet)))[wallet.address.lower()]
+    caught_up = state.wallet(wallet.address)
+
+    assert state.snapshot.block_number == block_number
+    assert caught_up.required_approvals == 2
+    for txn_type in TxnType:
+        assert caught_up.get_txn_count(txn_type) == rebuilt.get_txn_count(txn_type)
+        for txn_index in range(rebuilt.get_txn_count(txn_type)):
+            assert caught_up.get_txn_details(
+                txn_type, txn_index
+            ) == rebuilt.get_txn_details(txn_type, txn_index)
+    assert caught_up.approvers == rebuilt.approvers
@@ -0,0 +1,123 @@
+import asyncio
+import http
+import json
+
+import pytest
+import websockets
+
+from multi_sig_wallet.subscriptions import EventSubscriber
+
+TIMEOUT = 10
+
+
+@pytest.fixture(scope="session")
+def ws_url(rpc_url):
+    # local nodes serve WebSockets on their HTTP port
+    return rpc_url.replace("http", "ws", 1)
+
+
+def collect_events(subscriber, action, count, disconnect=False):
+    async def scenario():
+        task = asyncio.create_task(subscriber.run())
+        try:
+            await asyncio.wait_for(subscriber.connected.wait(), TIMEOUT)
+            if disconnect:
+                await subscriber._connection.close()
+            await asyncio.get_running_loop().run_in_executor(None, action)
+            return [
+                await asyncio.wait_for(subscriber.queue.get(), TIMEOUT)
+                for _ in range(count)
+            ]
+        finally:
+            task.cancel()
+
+    return asyncio.run(scenario())
+
+
+@pytest.mark.subscriptions
+def test_subscriber_pushes_decoded_wallet_events(owners, wallet, issue_eth_txn, ws_url):
+    subscriber = EventSubscriber(ws_url, [wallet.address])
+    received = []
+    subscriber.add_callback(received.append)
+
+    def issue_and_approve():
+        issue_eth_txn(owners[0])
+        wallet.approveTxn(0, 0, sender=owners[1])
+
+    events = collect_events(subscriber, issue_and_approve, 2)
+
+    assert [event.name for event in events] == ["TxnIssued", "TxnApproved"]
+    assert events[1].args == {
+        "txnType": 0,
+        "txnIndex": 0,
+        "by": owners[1].address.lower(),
+        "approvals": 1,
+    }
+    assert received == events
+    assert subscriber.latency_report()["events"] == 2
+
+
+@pytest.mark.subscriptions
+def test_subscriber_backfills_events_from_a_past_block(
+    owners, wallet, issue_eth_txn, web3, ws_url
+):
+    from_block = web3.eth.block_number
+    issue_eth_txn(owners[0])
+    subscriber = EventSubscriber(ws_url, [wallet.address], from_block=from_block)
+
+    events = collect_events(subscriber, lambda: None, 1)
+
+    assert events[0].name == "TxnIssued"
+    assert subscriber.latency_report() == {"events": 0}
+
+
+@pytest.mark.subscriptions
+def test_subscriber_fills_the_gap_after_a_disconnect(
+    owners, wallet, issue_eth_txn, ws_url
+):
+    subscriber = EventSubscriber(ws_url, [wallet.address], reconnect_delay=0.5)
+
+    events = collect_events(
+        subscriber, lambda: issue_eth_txn(owners[0]), 1, disconnect=True
+    )
+
+    assert events[0].name == "TxnIssued"
+    assert subscriber.reconnections >= 1
+
+
+@pytest.mark.subscriptions
+def test_subscriber_backs_off_when_a_handshake_is_refused():
+    handshakes = []
+
+    async def refuse_first(path, request_headers):
+        handshakes.append(path)
+        # a node that is still restarting answers the upgrade with a 503
+        if len(handshakes) == 1:
+            return http.HTTPStatus.SERVICE_UNAVAILABLE, [], b"restarting"
+        return None
+
+    async def serve_node(connection):
+        async for message in connection:
+            request = json.loads(message)
+            result = "0x1" if request["method"] == "eth_subscribe" else "0x10"
+            await connection.send(json.dumps({"id": request["id"], "result": result}))
+
+    async def scenario():
+        async with websockets.serve(
+            serve_node, "127.0.0.1", 0, process_request=refuse_first
+        ) as server:
+            port = server.sockets[0].getsockname()[1]
+            subscriber = EventSubscriber(
+                f"ws://127.0.0.1:{port}", ["0x" + "11" * 20], reconnect_delay=0.05
+            )
+            task = asyncio.create_task(subscriber.run())
+            try:
+                await asyncio.wait_for(subscriber.connected.wait(), TIMEOUT)
+            finally:
+                task.cancel()
+            return subscriber
+
+    subscriber = asyncio.run(scenario())
+
+    assert len(handshakes) == 2
+    assert subscriber.reconnections == 1
@@ -13,7 +13,7 @@ def test_required_approvals_set_to_two(wallet):
 
 
 @pytest.mark.wallet_initialization
-def test_txn_counts_set_to_zero(wallet):
-    assert wallet.getEthTxnCount() == 0
-    assert wallet.getTokenTxnCount() == 0
-    assert wallet.getNftTxnCount() == 0
+def test_txn_counts_set_to_zero(wallet, lens):
+    assert lens.getEthTxnCount(wallet) == 0
+    assert lens.getTokenTxnCount(wallet) == 0
+    assert lens.getNftTxnCount(wallet) == 0
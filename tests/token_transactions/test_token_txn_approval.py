@@ -7,11 +7,11 @@ import ape
 
 @pytest.mark.txn_approval
 def test_any_token_txn_approval_increases_approval_count(
-    owners, wallet, issue_token_transfer_txn
+    owners, wallet, lens, issue_token_transfer_txn
 ):
     issue_token_transfer_txn(owners[0])
     wallet.approveTxn(1, 0, sender=owners[0])
-    txn_details = wallet.getTokenTxnDetails(0)
+    txn_details = lens.getTokenTxnDetails(wallet, 0)
 
     assert list(txn_details[5])[0] == 1
 
@@ -28,6 +28,7 @@ def test_any_token_txn_approval_emits_approval_event(
     assert logs[0].txnType == 1
     assert logs[0].txnIndex == 0
     assert logs[0].by == owners[0]
+    assert logs[0].approvals == 1
 
 
 @pytest.mark.txn_approval
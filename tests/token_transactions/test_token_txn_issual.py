@@ -4,10 +4,10 @@ import ape
 
 @pytest.mark.txn_issual
 def test_token_transfer_txn_issual(
-    owners, not_owner, wallet, token_contract, issue_token_transfer_txn, web3
+    owners, not_owner, wallet, lens, token_contract, issue_token_transfer_txn, web3
 ):
     issue_token_transfer_txn(owners[0])
-    txn_details = wallet.getTokenTxnDetails(0)
+    txn_details = lens.getTokenTxnDetails(wallet, 0)
 
     assert txn_details[0] == 0
     assert txn_details[1] == not_owner
@@ -19,10 +19,10 @@ def test_token_transfer_txn_issual(
 
 @pytest.mark.txn_issual
 def test_token_transfer_from_txn_issual(
-    owners, not_owner, wallet, token_contract, issue_token_transfer_from_txn, web3
+    owners, not_owner, wallet, lens, token_contract, issue_token_transfer_from_txn, web3
 ):
     issue_token_transfer_from_txn(owners[0])
-    txn_details = wallet.getTokenTxnDetails(0)
+    txn_details = lens.getTokenTxnDetails(wallet, 0)
 
     assert txn_details[0] == 1
     assert txn_details[1] == not_owner
@@ -33,10 +33,10 @@ def test_token_transfer_from_txn_issual(
 
 @pytest.mark.txn_issual
 def test_token_approval_txn_issual(
-    owners, not_owner, wallet, token_contract, issue_token_approval_txn, web3
+    owners, not_owner, wallet, lens, token_contract, issue_token_approval_txn, web3
 ):
     issue_token_approval_txn(owners[0])
-    txn_details = wallet.getTokenTxnDetails(0)
+    txn_details = lens.getTokenTxnDetails(wallet, 0)
 
     assert txn_details[0] == 2
     assert txn_details[1] == not_owner
@@ -47,7 +47,10 @@ def test_token_approval_txn_issual(
 @pytest.mark.txn_issual
 def test_any_token_txn_issual_emits_event(
     owners,
+    not_owner,
     wallet,
+    token_contract,
+    web3,
     issue_token_transfer_txn,
     issue_token_transfer_from_txn,
     issue_token_approval_txn,
@@ -65,6 +68,10 @@ def test_any_token_txn_issual_emits_event(
         assert logs[0].txnType == 1
         assert logs[0].txnIndex == count
         assert logs[0].by == owners[0]
+        assert logs[0].action == count
+        assert logs[0].to == not_owner
+        assert logs[0].amountOrTokenId == web3.to_wei(1, "ether")
+        assert logs[0].assetAddress == token_contract
 
         count += 1
 
@@ -0,0 +1,150 @@
+import pytest
+import ape
+
+from multi_sig_wallet.permits import PermitDomain, permit_for_txn, sign_permit
+from multi_sig_wallet.rpc import HttpRpc
+
+DEADLINE = 2**64
+
+
+@pytest.fixture(scope="session")
+def rpc(rpc_url):
+    return HttpRpc(rpc_url)
+
+
+def approve_token_txn(wallet, owners, txn_index=0):
+    wallet.approveTxn(1, txn_index, sender=owners[0])
+    wallet.approveTxn(1, txn_index, sender=owners[1])
+
+
+@pytest.mark.txn_execution
+def test_token_transfer_from_execution_with_permit(
+    rpc, owners, not_owner, wallet, token_contract, issue_token_transfer_from_txn, web3
+):
+    issue_token_transfer_from_txn(owners[1])
+    approve_token_txn(wallet, owners)
+    permit = permit_for_txn(rpc, owners[0].private_key, wallet.address, 0, DEADLINE)
+
+    wallet.executeTokenTransferFromWithPermit(
+        *permit.execution_args(0), sender=owners[1]
+    )
+
+    assert token_contract.balanceOf(not_owner) == web3.to_wei(1, "ether")
+    assert token_contract.allowance(owners[0], wallet) == 0
+    assert token_contract.nonces(owners[0]) == 1
+    assert wallet.getTxn(1, 0).txnDetails.executed is True
+
+
+@pytest.mark.txn_execution
+def test_token_transfer_from_with_permit_uses_less_gas_than_approve_and_execute(
+    rpc, owners, wallet, token_contract, issue_token_transfer_from_txn, web3
+):
+    issue_token_transfer_from_txn(owners[1])
+    issue_token_transfer_from_txn(owners[1])
+    approve_token_txn(wallet, owners, 0)
+    approve_token_txn(wallet, owners, 1)
+
+    approve_receipt = token_contract.approve(
+        wallet, web3.to_wei(1, "ether"), sender=owners[0]
+    )
+    execute_receipt = wallet.executeTxn(1, 0, sender=owners[1])
+    permit = permit_for_txn(rpc, owners[0].private_key, wallet.address, 1, DEADLINE)
+    permit_receipt = wallet.executeTokenTransferFromWithPermit(
+        *permit.execution_args(1), sender=owners[1]
+    )
+
+    assert permit_receipt.gas_used < approve_receipt.gas_used + execute_receipt.gas_used
+
+
+@pytest.mark.txn_execution
+def test_token_transfer_from_with_permit_survives_a_front_run_permit(
+    rpc, owners, not_owner, wallet, token_contract, issue_token_transfer_from_txn, web3
+):
+    issue_token_transfer_from_txn(owners[1])
+    approve_token_txn(wallet, owners)
+    permit = permit_for_txn(rpc, owners[0].private_key, wallet.address, 0, DEADLINE)
+
+    # anyone who saw the permit can submit it before the wallet does
+    token_contract.permit(
+        permit.owner,
+        permit.spender,
+        permit.value,
+        permit.deadline,
+        permit.v,
+        permit.r,
+        permit.s,
+        sender=not_owner,
+    )
+    wallet.executeTokenTransferFromWithPermit(
+        *permit.execution_args(0), sender=owners[1]
+    )
+
+    assert token_contract.balanceOf(not_owner) == web3.to_wei(1, "ether")
+
+
+@pytest.mark.txn_execution
+def test_token_transfer_from_with_permit_reverts_if_permit_is_not_the_providers(
+    rpc, owners, wallet, token_contract, issue_token_transfer_from_txn, web3
+):
+    issue_token_transfer_from_txn(owners[1])
+    approve_token_txn(wallet, owners)
+    # signed by an owner who is not the transaction's allowance provider
+    permit = sign_permit(
+        owners[2].private_key,
+        PermitDomain.fetch(rpc, token_contract.address),
+        wallet.address,
+        web3.to_wei(1, "ether"),
+        0,
+        DEADLINE,
+    )
+
+    with ape.reverts("ERC20: insufficient allowance"):
+        wallet.executeTokenTransferFromWithPermit(
+            *permit.execution_args(0), sender=owners[1]
+        )
+    with pytest.raises(ValueError):
+        permit_for_txn(rpc, owners[2].private_key, wallet.address, 0, DEADLINE)
+
+
+@pytest.mark.txn_execution
+def test_token_txn_execution_with_permit_reverts_if_txn_is_not_a_transfer_from(
+    owners, wallet, issue_token_transfer_txn
+):
+    issue_token_transfer_txn(owners[0])
+    approve_token_txn(wallet, owners)
+
+    with ape.reverts(wallet.MultiSigWallet__NotATransferFromTxn):
+        wallet.executeTokenTransferFromWithPermit(
+            0, DEADLINE, 27, b"\0" * 32, b"\0" * 32, sender=owners[0]
+        )
+
+
+@pytest.mark.txn_execution
+def test_token_txn_execution_with_permit_reverts_if_not_enough_approvals_have_been_given(
+    rpc, owners, wallet, issue_token_transfer_from_txn
+):
+    issue_token_transfer_from_txn(owners[1])
+    permit = permit_for_txn(rpc, owners[0].private_key, wallet.address, 0, DEADLINE)
+
+    with ape.reverts(wallet.MultiSigWallet__NotEnoughApprovalsGiven):
+        wallet.executeTokenTransferFromWithPermit(
+            *permit.execution_args(0), sender=owners[1]
+        )
+
+
+@pytest.mark.txn_execution
+def test_token_txn_execution_with_permit_reverts_if_sent_by_not_owner_or_invalid_index(
+    rpc, owners, not_owner, wallet, issue_token_transfer_from_txn
+):
+    issue_token_transfer_from_txn(owners[1])
+    approve_token_txn(wallet, owners)
+    permit = permit_for_txn(rpc, owners[0].private_key, wallet.address, 0, DEADLINE)
+
+    with ape.reverts(wallet.MultiSigWallet__NotOneOfTheOwners):
+        wallet.executeTokenTransferFromWithPermit(
+            *permit.execution_args(0), sender=not_owner
+        )
+    with ape.reverts(wallet.MultiSigWallet__InvalidIndex):
+        wallet.executeTokenTransferFromWithPermit(
+            *permit.execution_args(10), sender=owners[1]
+        )